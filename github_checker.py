@@ -13,11 +13,47 @@ Author: GitHub Checker Project
 
 import sys  # System-related parameters and functions, such as exit codes
 import time  # Time-related operations, such as timing and delays
+_MODULE_START = time.perf_counter()  # Import start of this module, for --profile
 import json  # JSON encoding and decoding
+import math  # NaN markers for missing latencies in sample files
+import mmap  # Zero-copy reads of sample files
+import os  # Unix socket helpers and API token environment variables
+import random  # Random jitter for backoff delays
+import socket  # Name resolution and raw sockets
+import selectors  # Readiness polling for concurrent TCP handshakes
+import errno  # Non-blocking connect status codes
+import ipaddress  # Loopback checks of listen addresses
+from stat import S_ISSOCK  # Socket file checks of Unix listen paths
+import ssl  # TLS handshakes for handshake-cost probing
+import struct  # Binary packing for DNS wire format
+import threading  # Thread synchronisation primitives
+import queue  # Hand-off of concurrent probe results
+import shlex  # Splitting of notification commands
+import subprocess  # Notification commands
+from collections import deque  # Bounded latency histories
+_REQUESTS_IMPORT_START = time.perf_counter()
 import requests  # Used to send HTTP requests
+from urllib3.connection import HTTPConnection, HTTPSConnection  # Connect hooks for reuse tracking
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+_REQUESTS_IMPORT_END = time.perf_counter()
 import argparse  # Used to parse command-line arguments
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor  # Concurrent probing
+from http.server import BaseHTTPRequestHandler, HTTPServer  # Status endpoint
+import socketserver  # Unix socket variant of the status endpoint
+from urllib.parse import urlsplit  # URL parsing for proxy labels
+from contextlib import contextmanager  # Scoped installation helpers
+from collections.abc import Mapping  # Header container type checks
 from typing import List, Dict, Tuple, Any, Iterator
 
+try:  # Optional HTTP/2 support for the multiplexed probe backend
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    h2 = None
+_IMPORTS_END = time.perf_counter()
+
 
 # Enable ANSI colors on Windows
 if sys.platform == 'win32':
@@ -95,647 +131,5449 @@ MIN_REMAIN_TIMEOUT = 1.0  # Minimum remaining timeout for subsequent requests
 RESPONSE_TIME_THRESHOLD_MS = 3000  # Response time threshold in milliseconds
 RESPONSE_TIME_THRESHOLD_SEC = 3.0  # Response time threshold in seconds
 
-# Spinner animation constants
-SPINNER_PADDING = 50  # Number of spaces to clear spinner animation
-SPINNER_JOIN_TIMEOUT = 0.2  # Timeout for joining spinner thread (seconds)
-SPINNER_DELAY = 0.1  # Delay between spinner frames (seconds)
-SPINNER_CHARS = '|/\\-'  # Spinner character sequence
+# Progress display constants
+SPINNER_PADDING = 50  # Minimum width cleared when the progress line is removed
+SPINNER_CHARS = '|/\\-'  # Spinner character sequence, advanced once per probe event
 
+# Circuit breaker constants
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures before a circuit opens
+BREAKER_COOLDOWN_SEC = 5.0  # Initial cool-down before a half-open retry
+BREAKER_MAX_COOLDOWN_SEC = 300.0  # Upper bound for the exponential backoff
+BREAKER_JITTER = 0.2  # Random jitter applied to cool-downs (+/- fraction)
 
-class Checker:
-    """GitHub accessibility checker
+# Proxy constants
+DIRECT_ROUTE = "direct"  # Proxy value that bypasses environment proxies
 
-    This class is responsible for performing accessibility checks on GitHub
-    website and API, and collecting statistics such as response time and
-    success rate
-    """
+# DNS constants
+DNS_CACHE_TTL_SEC = 60.0  # TTL for system resolver answers, which carry none
+DNS_MAX_TTL_SEC = 3600.0  # Upper bound for TTLs taken from DNS answers
+DNS_QUERY_TIMEOUT = 2.0  # Timeout for a single UDP DNS query (seconds)
+DNS_BENCHMARK_ROUNDS = 3  # Queries per host and resolver in benchmark mode
+SYSTEM_RESOLVER = "system"  # Resolver name for the operating system resolver
 
-    # Target URLs - includes GitHub homepage and API endpoints
-    TARGETS = [
-        ("homepage", "https://github.com"),  # GitHub homepage
-        ("api", "https://api.github.com"),  # GitHub API
-    ]
+# TLS probe constants
+TLS_PROBE_READ_BYTES = 1024  # Response bytes read so session tickets arrive
 
-    def test(self, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-        """
-        Perform full test with multiple checks and calculate average
+# TCP connect probe constants
+TCP_PROBE_COUNT = 5  # Handshakes per endpoint in a TCP connect probe
+TCP_PROBE_TIMEOUT = 2.0  # Seconds before an unanswered handshake counts as lost
 
-        Args:
-            timeout (float): Request timeout in seconds
+# Hedged request constants
+HEDGE_HISTORY_SIZE = 50  # Recent latencies kept per target for the hedge delay
+HEDGE_MIN_SAMPLES = 5  # Latencies needed before the delay follows the p95
+HEDGE_PERCENTILE = 95  # Percentile of recent latency used as the hedge delay
+HEDGE_DEFAULT_DELAY_MS = 500.0  # Hedge delay until enough latencies are known
+HEDGE_MIN_DELAY_MS = 50.0  # Lower bound of the hedge delay
 
-        Returns:
-            Dict[str, Any]: Dictionary containing test results including:
-                - status (str): Overall status ("good", "warn", "bad")
-                - msg (str): Status message
-                - iterations (int): Number of iterations performed
-                - avg_total_time (float): Average total time in milliseconds
-                - successful_checks (int): Number of successful checks
-                - target_stats (dict): Statistics for each target
-                - all_results (list): All test results
-        """
-        results: List[Dict[str, Any]] = []
-        all_results: List[Tuple[str, Dict[str, Any]]] = []
+# SSH probe constants
+SSH_BANNER_MAX_BYTES = 255  # RFC 4253 limit of the identification line
 
-        print(f"Running full test ({FULL_TEST_ITERATIONS} iterations)...")
-        for i in range(FULL_TEST_ITERATIONS):
-            progress = (i + 1) / FULL_TEST_ITERATIONS * 100
-            print(f"  Iteration {i + 1}/{FULL_TEST_ITERATIONS} ({progress:.0f}%)...", end="\r")
-            result = self.check(timeout=timeout)
-            results.append(result)
-            all_results.extend(result["results"])
+# Probe backend constants
+BACKEND_REQUESTS = "requests"  # One HTTP/1.1 request per target via requests
+BACKEND_H2 = "h2"  # One multiplexed HTTP/2 connection per origin
+H2_READ_SIZE = 65536  # Bytes read from an HTTP/2 connection per recv
 
-        # Calculate overall statistics
-        successful_checks = sum(1 for r in results if r["status"] != "bad")
-        total_time = sum(r["ms"] for r in results)
-        avg_time = total_time / len(results) if results else 0
+# Batch mode constants
+BATCH_DEFAULT_WORKERS = 8  # Default size of the shared batch worker pool
+PROCESS_SHARDS_PER_WORKER = 4  # Target chunks per worker process, for load balancing
 
-        # Calculate average response times for each target
-        target_stats: Dict[str, Dict[str, float]] = {}
-        for name, url in self.TARGETS:
-            target_results = [r for _, r in all_results if _ == name]
-            if target_results:
-                avg_response = sum(r.get("ms", 0) for r in target_results
-                                   if "ms" in r) / len(target_results)
-                successful_responses = sum(1 for r in target_results
-                                           if r.get("ok", False))
-                target_stats[name] = {
-                    "avg_response": avg_response,
-                    "success_rate": (successful_responses /
-                                     len(target_results) * 100)
-                }
-
-        overall_status = self._judge(all_results)
+# Time-series export constants
+SERIES_MAGIC = b"GHCS"  # Signature at the start of a sample file
+SERIES_VERSION = 1  # Format version of sample files
+SERIES_HEADER_SIZE = 4096  # Header bytes (signature, target table) before the first record
+SERIES_HEADER = struct.Struct("<4sHH")  # Signature, version, length of the JSON target table
+# Record: timestamp, target id, status code, latency ms (NaN if none), error type id, flags
+SERIES_RECORD = struct.Struct("<dHHfBB2x")
+SERIES_FLAG_OK = 0x01  # Record flag of a successful probe
+SERIES_ERROR_TYPES = (  # Error type ids; index 0 means no error
+    None, "timeout", "connection", "http", "redirect", "request", "unknown",
+    "dns", "protocol", "rate_limited", "circuit_open",
+)
 
-        return {
-            "status": overall_status,
-            "msg": self._msg(overall_status, all_results),
-            "iterations": FULL_TEST_ITERATIONS,
-            "avg_total_time": avg_time,
-            "successful_checks": successful_checks,
-            "target_stats": target_stats,
-            "results": all_results,
-            "all_results": all_results
-        }
+# Merged report constants
+REPORT_HISTOGRAM_GROWTH = 1.02  # Width ratio of latency histogram buckets (about 1% error)
+REPORT_HISTOGRAM_MIN_MS = 0.1  # Latencies below this share the lowest histogram bucket
+REPORT_PERCENTILES = (50, 90, 95, 99)  # Latency percentiles reported per group
 
-    def check(self, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-        """
-        Execute single detection
+# Rendering constants
+RENDER_BENCH_ITERATIONS = 2000  # Renders per renderer in --bench-render
 
-        Args:
-            timeout (float): Request timeout in seconds, default is 8 seconds
+# Status server constants
+STATUS_DEFAULT_ADDRESS = "127.0.0.1:8765"  # Default listen address, or unix:/path
+STATUS_DEFAULT_INTERVAL = 30.0  # Default delay between background checks (seconds)
+STATUS_QUERY_TIMEOUT = 1.0  # Timeout of a status client query (seconds)
+STATUS_UNREACHABLE_EXIT_CODE = 4  # Exit code when the status server cannot be reached
 
-        Returns:
-            Dict[str, Any]: Dictionary containing detection status, total time,
-                  results and message
-        """
-        start = time.time()  # Record start time
-        results: List[Tuple[str, Dict[str, Any]]] = []  # Store detection results
+# Rate limit constants
+RATE_LIMIT_TARGETS = ("api",)  # Targets that are subject to API rate limits
+TOKEN_ENV_VARS = ("GITHUB_TOKEN", "GH_TOKEN")  # Environment variables holding an API token
+RATE_LIMIT_STATUS_CODES = (403, 429)  # Status codes GitHub uses for rate limiting
 
-        # Iterate through all targets for detection
-        for name, url in self.TARGETS:
-            elapsed = time.time() - start  # Calculate elapsed time
-            remain = max(MIN_REMAIN_TIMEOUT, timeout - elapsed)  # Remaining time
+# Conditional request constants
+SUCCESS_STATUS_CODES = (200, 304)  # 304 Not Modified answers a conditional request
+VALIDATOR_HEADERS = {  # Response validator header -> conditional request header
+    "ETag": "If-None-Match",
+    "Last-Modified": "If-Modified-Since",
+}
 
-            r = self._test(url, remain)  # Execute single URL test
-            results.append((name, r))  # Add result to list
+# Optional per-probe fields copied into JSON output when present
+RESULT_DETAIL_FIELDS = (
+    "proxy", "circuit", "dns_ms", "dns_cached", "connection",
+    "tls_connect_ms", "tls_handshake_ms", "tls_resumed", "tls_version",
+    "tls_cipher", "tls_cert_ms", "tls_cert_bytes", "tls_error",
+    "h2_stream", "h2_connect_ms", "rate_limit", "deferred", "not_modified",
+    "baseline_ms", "deviation", "anomaly",
+    "tcp_port", "tcp_sent", "tcp_received", "loss_pct", "connect_ms",
+    "ssh_connect_ms", "ssh_banner_ms", "ssh_banner", "hedge", "queue_ms",
+)
 
-            # If homepage detection fails, stop subsequent detection
-            if name == "homepage" and not r["ok"]:
-                break
+# Record/replay constants
+REPLAY_FAULTS = {  # Synthetic fault -> default duration in milliseconds
+    "ok": 100.0,  # 200 OK
+    "slow": 5000.0,  # 200 OK after a slow time to first byte
+    "timeout": DEFAULT_TIMEOUT * 1000,  # Read timeout
+    "reset": 50.0,  # Connection reset by peer
+    "refused": 1.0,  # Connection refused
+    "5xx": 100.0,  # Server error, 503 unless "status" is given
+    "rate_limited": 100.0,  # 403 with an exhausted rate-limit budget
+}
 
-        total_ms = (time.time() - start) * 1000  # Total time in ms
-        status = self._judge(results)  # Judge detection status
+# Judgement policy constants
+POLICY_DEFAULT_METRIC = "avg"  # Latency metric of a policy: "avg" or a percentile such as "p95"
+POLICY_KEYS = ("good_score", "bad_score", "warn_on_flags", "latency", "default", "targets")
+POLICY_TARGET_KEYS = ("weight", "optional", "required", "latency")
+POLICY_LATENCY_KEYS = ("metric", "warn_ms", "bad_ms", "min_samples")
+
+# Watch mode constants
+WATCH_DEFAULT_INTERVAL = 10.0  # Default delay between watch rounds (seconds)
+
+# Notification constants
+NOTIFY_BATCH_SEC = 2.0  # Transitions collected into one delivery after the first
+NOTIFY_DEDUP_SEC = 300.0  # Repeats of the same transition suppressed for this long
+NOTIFY_RETRIES = 3  # Retries of a failed delivery per sink
+NOTIFY_BACKOFF_SEC = 1.0  # Delay before the first retry, doubled per retry
+NOTIFY_MAX_BACKOFF_SEC = 30.0  # Upper bound of the retry delay
+NOTIFY_TIMEOUT = 5.0  # Timeout of one webhook request or command (seconds)
+NOTIFY_QUEUE_SIZE = 1000  # Pending transitions kept while sinks are slow
+
+# Latency baseline constants
+BASELINE_ALPHA = 0.125  # EWMA gain of the mean latency
+BASELINE_BETA = 0.25  # EWMA gain of the mean absolute deviation
+BASELINE_BAND = 4.0  # Deviations above the mean that count as an anomaly
+BASELINE_MIN_SAMPLES = 5  # Samples learned before anomalies are reported
+BASELINE_MIN_DEVIATION_MS = 10.0  # Deviation floor for very steady targets
+BASELINE_MIN_DEVIATION_RATIO = 0.1  # Deviation floor relative to the mean
+BASELINE_STATE_VERSION = 1  # Format version of the persisted state file
 
-        return {
-            "status": status,  # Detection status (good/warn/bad)
-            "ms": total_ms,  # Total time in milliseconds
-            "results": results,  # Detection results list
-            "msg": self._msg(status, results)  # Status message
-        }
 
-    def _test(self, url: str, timeout: float) -> Dict[str, Any]:
+class CircuitBreaker:
+    """Circuit breaker for a single probe target
+
+    The breaker starts closed and lets every probe through. After
+    `failure_threshold` consecutive failures it opens and rejects probes
+    until a jittered cool-down has elapsed, then lets a single half-open
+    trial probe through. A successful trial closes the circuit again, a
+    failed one re-opens it with an exponentially longer cool-down.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 cooldown: float = BREAKER_COOLDOWN_SEC,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN_SEC,
+                 jitter: float = BREAKER_JITTER):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.jitter = jitter
+        self.state = self.CLOSED
+        self.failures = 0  # Consecutive failures while closed
+        self.trips = 0  # Consecutive times the circuit has opened
+        self.retry_at = 0.0  # Monotonic time of the next half-open trial
+        self._lock = threading.Lock()
+
+    def allow(self, now: float = None) -> bool:
         """
-        Test accessibility of a single URL
+        Decide whether a probe may be sent to the target
 
         Args:
-            url (str): URL to test
-            timeout (float): Request timeout in seconds
+            now (float): Current monotonic time, defaults to time.monotonic()
 
         Returns:
-            Dict[str, Any]: Dictionary containing test results, including success status,
-                  response time, status code or error message
+            bool: True if the probe should be sent, False if the target is
+                  known to be down
         """
-        try:
-            t0 = time.time()  # Record request start time
-            # Send GET request to specified URL, set timeout and user agent
-            resp = requests.get(url, timeout=timeout, headers={
-                "User-Agent": "GitHubChecker/1.0"
-            })
-            # Return success result: status code 200 means success
-            return {
-                "ok": resp.status_code == 200,  # Whether successful
-                "ms": round((time.time() - t0) * 1000),  # Response time
-                "status_code": resp.status_code  # HTTP status code
-            }
-        except requests.exceptions.Timeout:
-            # Request timeout exception
-            return {
-                "ok": False,
-                "error": "Request timed out",
-                "error_type": "timeout",
-                "suggestion": "Network is slow or server is not responding"
-            }
-        except requests.exceptions.ConnectionError as e:
-            # Connection error exception
-            return {
-                "ok": False,
-                "error": "Connection error - check network",
-                "error_type": "connection",
-                "suggestion": "Please verify your network connection",
-                "details": str(e)
-            }
-        except requests.exceptions.HTTPError as e:
-            # HTTP error exception
-            return {
-                "ok": False,
-                "error": f"HTTP error: {str(e)}",
-                "error_type": "http",
-                "suggestion": "Server returned an invalid HTTP response"
-            }
-        except requests.exceptions.TooManyRedirects:
-            # Too many redirects exception
-            return {
-                "ok": False,
-                "error": "Too many redirects",
-                "error_type": "redirect",
-                "suggestion": "URL is redirecting too many times"
-            }
-        except requests.exceptions.RequestException as e:
-            # Other request exceptions
-            return {
-                "ok": False,
-                "error": f"Request error: {str(e)}",
-                "error_type": "request",
-                "suggestion": "Request failed, please try again"
-            }
-        except Exception as e:
-            # Other unexpected exceptions
-            return {
-                "ok": False,
-                "error": f"Unexpected error: {str(e)}",
-                "error_type": "unknown",
-                "suggestion": "An unexpected error occurred"
-            }
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and now >= self.retry_at:
+                self.state = self.HALF_OPEN  # Let exactly one trial through
+                return True
+            return False
 
-    def _judge(self, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+    def record(self, ok: bool, now: float = None) -> None:
         """
-        Judge network status based on detection results
+        Record the outcome of a probe that was allowed through
 
         Args:
-            results (List[Tuple[str, Dict[str, Any]]]): Detection results list
+            ok (bool): Whether the probe succeeded
+            now (float): Current monotonic time, defaults to time.monotonic()
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if ok:
+                self.state = self.CLOSED
+                self.failures = 0
+                self.trips = 0
+                return
 
-        Returns:
-            str: Network status ("good", "warn", or "bad")
-                 - "good": All targets succeed and avg response < 3 seconds
-                 - "warn": Partial success or avg response >= 3 seconds
-                 - "bad": All targets fail
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.trips += 1
+                self.state = self.OPEN
+                self.retry_at = now + self._backoff()
+
+    def remaining(self, now: float = None) -> float:
         """
-        if not results:
-            return "bad"  # No results means bad status
+        Seconds left before the next half-open trial (0 if not open)
+        """
+        now = time.monotonic() if now is None else now
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.retry_at - now)
 
-        # Calculate number of successful results
-        ok = sum(1 for _, r in results if r.get("ok"))
-        if ok == 0:
-            return "bad"  # No successful results
-        if ok < len(results):
-            return "warn"  # Partial success
+    def cancel(self) -> None:
+        """Give back a half-open trial whose outcome will never be recorded"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN  # retry_at has passed, the next probe is the trial
 
-        # Calculate average response time
-        avg = sum(r["ms"] for _, r in results) / len(results)
-        return "good" if avg < RESPONSE_TIME_THRESHOLD_MS else "warn"
+    def _backoff(self) -> float:
+        """Exponential cool-down for the current trip count, with jitter"""
+        delay = min(self.max_cooldown, self.cooldown * (2 ** (self.trips - 1)))
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return delay
 
-    def _msg(self, status: str, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+
+class LatencyBaseline:
+    """Learned per-target latency baseline
+
+    Each target keeps an exponentially weighted moving average of its
+    latency and of the mean absolute deviation around it, the estimator TCP
+    uses for round-trip times. A sample more than `band` deviations above
+    the mean is an anomaly. Every successful sample updates the model in
+    O(1), so a lasting shift becomes the new baseline after a few dozen
+    samples. The state can be saved to and loaded from a JSON file so the
+    baseline survives across runs.
+    """
+
+    def __init__(self, path: str = None, alpha: float = BASELINE_ALPHA,
+                 beta: float = BASELINE_BETA, band: float = BASELINE_BAND,
+                 min_samples: int = BASELINE_MIN_SAMPLES):
         """
-        Generate user-friendly status message based on detection results
+        Args:
+            path (str): State file read by load() and written by save()
+            alpha (float): EWMA gain of the mean
+            beta (float): EWMA gain of the deviation
+            band (float): Anomaly threshold in deviations above the mean
+            min_samples (int): Samples to learn before flagging anomalies
+        """
+        self.path = path
+        self.alpha = alpha
+        self.beta = beta
+        self.band = band
+        self.min_samples = min_samples
+        self.targets: Dict[str, Dict[str, float]] = {}  # name -> mean, dev, samples
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, r: Dict[str, Any]) -> None:
+        """
+        Score a probe result against the baseline, then learn from it
+
+        Adds baseline_ms, deviation (in deviations above the mean) and
+        anomaly to successful results once the target has enough samples.
+        Failed and deferred results are ignored.
 
         Args:
-            status (str): Network status ("good", "warn", or "bad")
-            results (List[Tuple[str, Dict[str, Any]]]): Detection results list
+            name (str): Target name
+            r (Dict[str, Any]): Probe result, annotated in place
+        """
+        if not r.get("ok") or "ms" not in r or r.get("deferred"):
+            return
+        ms = float(r["ms"])
+        with self._lock:
+            state = self.targets.get(name)
+            if state is None:
+                self.targets[name] = {"mean": ms, "dev": ms / 2, "samples": 1}
+                return
+            if state["samples"] >= self.min_samples:
+                spread = max(state["dev"], BASELINE_MIN_DEVIATION_MS,
+                             state["mean"] * BASELINE_MIN_DEVIATION_RATIO)
+                deviation = (ms - state["mean"]) / spread
+                r["baseline_ms"] = round(state["mean"], 1)
+                r["deviation"] = round(deviation, 2)
+                r["anomaly"] = deviation > self.band
+            state["dev"] += self.beta * (abs(ms - state["mean"]) - state["dev"])
+            state["mean"] += self.alpha * (ms - state["mean"])
+            state["samples"] += 1
+
+    def load(self) -> "LatencyBaseline":
+        """
+        Load the state file if it exists and has a known format
 
         Returns:
-            str: Formatted status message (without status prefix)
+            LatencyBaseline: self, for chaining
         """
-        if status == "good":
-            successful_results = [r for _, r in results if "ms" in r]
-            if successful_results:
-                avg_time = sum(r["ms"] for _, r in results
-                               if "ms" in r) / len(successful_results)
-                return f"GitHub is accessible (avg {avg_time:.0f}ms)"
-            else:
-                return "GitHub is accessible"
-        elif status == "warn":
-            failed_targets = [name for name, r in results if not r.get("ok")]
-            if failed_targets:
-                return (f"GitHub is unstable "
-                        f"({', '.join(failed_targets)} affected)")
-            else:
-                successful_results = [r for _, r in results if "ms" in r]
-                if successful_results:
-                    avg_time = sum(r["ms"] for _, r in results
-                                   if "ms" in r) / len(successful_results)
-                    return (f"GitHub is accessible but slow "
-                            f"(avg {avg_time:.0f}ms)")
-                else:
-                    return "GitHub is accessible but slow"
-        elif status == "bad":
-            failed_targets = [name for name, r in results if not r.get("ok")]
-            return (f"Cannot connect to GitHub "
-                    f"({', '.join(failed_targets)})")
-        else:
-            return "Unknown status"
+        try:
+            with open(self.path) as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            return self  # Missing or unreadable state starts a fresh baseline
+        if isinstance(doc, dict) and doc.get("version") == BASELINE_STATE_VERSION:
+            self.targets = {name: dict(state) for name, state in doc.get("targets", {}).items()}
+        return self
 
+    def save(self) -> None:
+        """Write the state file atomically"""
+        with self._lock:
+            doc = {"version": BASELINE_STATE_VERSION, "targets": self.targets}
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(doc, f)
+            os.replace(tmp, self.path)
 
-def spinning_cursor() -> Iterator[str]:
-    """
-    Generator that yields spinning cursor animation
 
-    Yields:
-        str: Spinning cursor characters
+class ProbeListener:
+    """Subscriber to probe events, see Checker.add_listener
+
+    Both methods are called on the thread running the probe. Subclasses
+    override the events they need and must return quickly.
     """
-    while True:
-        for cursor in SPINNER_CHARS:  # Spinner character sequence
-            yield cursor  # Generate next cursor character
 
+    def probe_started(self, name: str, url: str) -> None:
+        """Called before a target is probed"""
 
-def format_fun_status(status: str, avg_ms: float = None) -> str:
-    """
-    Format status message with fun descriptions
+    def probe_finished(self, name: str, r: Dict[str, Any]) -> None:
+        """Called with the result once a target has been probed"""
 
-    Args:
-        status (str): Status type ("good", "warn", "bad")
-        avg_ms (float): Average response time in milliseconds
 
-    Returns:
-        str: Fun status description
-    """
-    if status == "good":
-        if avg_ms and avg_ms < 500:
-            return "GitHub is super fast! Everything is blazing!"
-        elif avg_ms and avg_ms < 1000:
-            return "GitHub is happy and responsive!"
-        else:
-            return "GitHub is accessible and working normally!"
-    elif status == "warn":
-        if avg_ms and avg_ms > 3000:
-            return "GitHub seems to be taking a nap... zzz"
-        else:
-            return "GitHub is a bit slow today..."
-    else:
-        return "GitHub appears to be unreachable at the moment"
+class _NoSpan:
+    """Reusable no-op context manager used when tracing is disabled"""
 
+    def __enter__(self):
+        return self
 
-def main() -> int:
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def _process_age() -> float:
     """
-    Main function: Execute GitHub accessibility check main logic
+    Seconds since this process started, or None where /proc is unavailable
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")  # Field 22: starttime
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
 
-    This function is responsible for:
-    1. Parsing command line arguments
-    2. Starting animation indicator
-    3. Executing checks
-    4. Displaying results
-    5. Providing operation suggestions
 
-    Returns:
-        int: Exit code (0 for success, non-zero for errors)
+class Tracer(ProbeListener):
+    """Per-stage timing recorder for profiling the checker itself
+
+    Stages are recorded with the monotonic perf_counter clock, either as
+    spans around code or, as a probe listener, from probe start to end on
+    the probing thread. The recording can be exported as a JSON summary or
+    in the Chrome trace-event format (chrome://tracing, Perfetto).
     """
-    # Create command line argument parser
-    parser = argparse.ArgumentParser(
-        description="GitHub Network Status Checker")
-    # Add full test mode parameter
-    parser.add_argument('-f', '--full-test', action='store_true',
-                        help='Perform full test with multiple checks')
-    # Add JSON output parameter
-    parser.add_argument('-j', '--json', action='store_true',
-                        help='Output results in JSON format')
-    # Add theme parameter
-    parser.add_argument('-t', '--theme', choices=['default', 'minimal', 'fun'],
-                        default='default', help='Output theme (default: default)')
-    # Add intro parameter to show value proposition
-    parser.add_argument('-i', '--intro', action='store_true',
-                        help='Show tool value proposition')
-    args = parser.parse_args()  # Parse command line arguments
 
-    # Show value proposition if --intro is used
-    if args.intro:
-        print("=" * 50)
-        print("GitHub Network Status Checker - Solve Your GitHub Connection Anxiety")
-        print("=" * 50)
-        print("Core Value:")
-        print("  * Quickly detect GitHub accessibility, avoid wasted operations")
-        print("  * Provide response time reference, optimize your workflow")
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._started: Dict[Tuple[int, str], float] = {}  # (thread, target) -> probe start
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float, cat: str = "stage", **args: Any) -> None:
+        """
+        Record a finished stage
+
+        Args:
+            name (str): Stage name
+            start (float): perf_counter at the start of the stage
+            end (float): perf_counter at the end of the stage
+            cat (str): Category ("stage", "probe" or "import")
+            **args: Extra details attached to the stage
+        """
+        with self._lock:
+            self.events.append({"name": name, "cat": cat, "start": start, "end": end,
+                                "tid": threading.get_ident(), "args": args})
+
+    @contextmanager
+    def span(self, name: str, cat: str = "stage", **args: Any) -> Iterator[None]:
+        """Record the code run inside the with block as one stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), cat, **args)
+
+    def record_startup(self) -> None:
+        """Record interpreter startup (where measurable) and module imports"""
+        age = _process_age()
+        if age is not None:
+            started = time.perf_counter() - age
+            if started < _MODULE_START:
+                self.record("interpreter startup", started, _MODULE_START, "import")
+        self.record("imports", _MODULE_START, _IMPORTS_END, "import")
+        self.record("import requests", _REQUESTS_IMPORT_START, _REQUESTS_IMPORT_END, "import")
+
+    def probe_started(self, name: str, url: str) -> None:
+        self._started[(threading.get_ident(), name)] = time.perf_counter()
+
+    def probe_finished(self, name: str, r: Dict[str, Any]) -> None:
+        start = self._started.pop((threading.get_ident(), name), None)
+        if start is not None:
+            self.record(f"probe {name}", start, time.perf_counter(), "probe",
+                        ok=r.get("ok"), status_code=r.get("status_code"), error_type=r.get("error_type"))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Recorded stages as a JSON-serialisable summary
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - stages (list): name, cat, start_ms (from the first stage),
+                  ms and args of every stage in start order
+                - total_ms (float): First stage start to last stage end
+        """
+        events = sorted(self.events, key=lambda e: e["start"])
+        if not events:
+            return {"stages": [], "total_ms": 0.0}
+        origin = events[0]["start"]
+        return {
+            "stages": [{
+                "name": e["name"],
+                "cat": e["cat"],
+                "start_ms": round((e["start"] - origin) * 1000, 3),
+                "ms": round((e["end"] - e["start"]) * 1000, 3),
+                "args": e["args"]
+            } for e in events],
+            "total_ms": round((max(e["end"] for e in events) - origin) * 1000, 3)
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        Recorded stages in the Chrome trace-event format
+
+        Returns:
+            Dict[str, Any]: Trace with one complete ("X") event per stage,
+                  timestamps in microseconds from the first stage
+        """
+        origin = min((e["start"] for e in self.events), default=0.0)
+        pid = os.getpid()
+        return {
+            "traceEvents": [{
+                "name": e["name"],
+                "cat": e["cat"],
+                "ph": "X",
+                "ts": round((e["start"] - origin) * 1e6, 1),
+                "dur": round((e["end"] - e["start"]) * 1e6, 1),
+                "pid": pid,
+                "tid": e["tid"],
+                "args": e["args"]
+            } for e in self.events],
+            "displayTimeUnit": "ms"
+        }
+
+
+class ProgressDisplay(ProbeListener):
+    """Progress line driven by probe events
+
+    Redraws a single terminal line whenever a probe starts or finishes,
+    so there is no animation thread and nothing runs between events. The
+    display is thread-safe and works with concurrent probes and full
+    tests. Use `enabled_for` to leave it off for non-terminal output.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream: Terminal stream to draw on, defaults to sys.stdout
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.label = ""
+        self.total = 0
+        self.done = 0
+        self._cursor = spinning_cursor()
+        self._width = 0  # Width of the line currently drawn
+        self._closed = True  # Ignore events outside start()/finish()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled_for(stream, renderer: "Renderer") -> bool:
+        """Whether progress should be shown: human output on a terminal"""
+        isatty = getattr(stream, "isatty", None)
+        return not renderer.machine_readable and isatty is not None and isatty()
+
+    def start(self, label: str, total: int) -> None:
+        """
+        Begin a run and draw its first line
+
+        Args:
+            label (str): Text shown before the progress
+            total (int): Expected number of probes, 0 if unknown
+        """
+        with self._lock:
+            self.label = label
+            self.total = total
+            self.done = 0
+            self._closed = False
+            self._draw("")
+
+    def probe_started(self, name: str, url: str) -> None:
+        with self._lock:
+            if not self._closed:
+                self._draw(f"{name}...")
+
+    def probe_finished(self, name: str, r: Dict[str, Any]) -> None:
+        with self._lock:
+            if not self._closed:
+                self.done += 1
+                self._draw(f"{name} {'OK' if r.get('ok') else 'FAIL'}")
+
+    def finish(self) -> None:
+        """Remove the progress line and ignore later events"""
+        with self._lock:
+            self._closed = True
+            if self._width:
+                self.stream.write("\r" + " " * max(self._width, SPINNER_PADDING) + "\r")
+                self.stream.flush()
+                self._width = 0
+
+    def _draw(self, detail: str) -> None:
+        """Redraw the line in place; caller holds the lock"""
+        count = f"[{self.done}/{self.total}] " if self.total else ""
+        line = f"{self.label} {next(self._cursor)} {count}{detail}"
+        self.stream.write("\r" + line.ljust(self._width))
+        self.stream.flush()
+        self._width = len(line)
+
+
+class SeriesWriter(ProbeListener):
+    """Append-only binary file of probe samples
+
+    Every sample is one fixed-width SERIES_RECORD after a SERIES_HEADER_SIZE
+    header, which holds the signature and the target names as a JSON list
+    (a target's id is its index). Samples are stamped under a lock as they
+    are appended, so records are in time order and SeriesReader can find a
+    time range by binary search. As a probe listener, the writer records
+    every probe of the checkers it is added to, except results deferred by
+    the rate-limit budget, which repeat an earlier sample.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Sample file, created if missing and appended to otherwise
+
+        Raises:
+            ValueError: If the file exists but is not a sample file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._file = open(path, "r+b")
+        except FileNotFoundError:
+            self._file = open(path, "w+b")
+        try:
+            if os.fstat(self._file.fileno()).st_size:
+                self.targets = _read_series_header(self._file.read(SERIES_HEADER_SIZE))
+            else:
+                self.targets = []
+                self._write_header()
+        except ValueError:
+            self._file.close()
+            raise
+        self._ids = {name: i for i, name in enumerate(self.targets)}
+        self._file.seek(0, os.SEEK_END)
+
+    def probe_finished(self, name: str, r: Dict[str, Any]) -> None:
+        if not r.get("deferred"):
+            self.append(name, r)
+
+    def append(self, name: str, r: Dict[str, Any], timestamp: float = None) -> None:
+        """
+        Append one sample and flush it to the file
+
+        Args:
+            name (str): Target name
+            r (Dict[str, Any]): Probe result
+            timestamp (float): Unix time of the sample, default now
+        """
+        error_type = r.get("error_type")
+        error_id = SERIES_ERROR_TYPES.index(error_type) if error_type in SERIES_ERROR_TYPES \
+            else SERIES_ERROR_TYPES.index("unknown")
+        with self._lock:
+            target_id = self._ids.get(name)
+            if target_id is None:
+                target_id = self._add_target(name)
+            record = SERIES_RECORD.pack(
+                time.time() if timestamp is None else timestamp, target_id,
+                r.get("status_code") or 0, r["ms"] if "ms" in r else math.nan,
+                error_id, SERIES_FLAG_OK if r.get("ok") else 0)
+            self._file.write(record)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the file"""
+        with self._lock:
+            self._file.close()
+
+    def _add_target(self, name: str) -> int:
+        """Give a new target the next id and rewrite the header; caller holds the lock"""
+        self.targets.append(name)
+        try:
+            self._write_header()
+        except ValueError:
+            self.targets.pop()
+            raise
+        self._ids[name] = len(self.targets) - 1
+        return self._ids[name]
+
+    def _write_header(self) -> None:
+        """Write the header in place, then continue at the end of the file"""
+        table = json.dumps(self.targets, separators=(",", ":")).encode("utf-8")
+        header = SERIES_HEADER.pack(SERIES_MAGIC, SERIES_VERSION, len(table)) + table
+        if len(header) > SERIES_HEADER_SIZE:
+            raise ValueError(f"Too many targets for the sample file header ({len(self.targets)})")
+        self._file.seek(0)
+        self._file.write(header.ljust(SERIES_HEADER_SIZE, b"\0"))
+        self._file.flush()
+        self._file.seek(0, os.SEEK_END)
+
+
+def _read_series_header(data: bytes) -> List[str]:
+    """
+    Parse a sample file header
+
+    Returns:
+        List[str]: Target names, indexed by target id
+
+    Raises:
+        ValueError: If the data is not a sample file header of a known version
+    """
+    if len(data) < SERIES_HEADER_SIZE:
+        raise ValueError("Not a sample file (truncated header)")
+    magic, version, length = SERIES_HEADER.unpack_from(data)
+    if magic != SERIES_MAGIC or version != SERIES_VERSION:
+        raise ValueError("Not a sample file or unsupported version")
+    start = SERIES_HEADER.size
+    return json.loads(bytes(data[start:start + length]).decode("utf-8"))
+
+
+class SeriesReader:
+    """Memory-mapped reader of a file written by SeriesWriter
+
+    The file is mapped read-only and records are decoded straight from the
+    mapping, so slicing weeks of samples by time range costs two binary
+    searches and no copy. Use as a context manager, or call close().
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Sample file
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the file is not a sample file
+        """
+        with open(path, "rb") as f:
+            self.targets = _read_series_header(f.read(SERIES_HEADER_SIZE))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # A record cut short by a crash mid-write is ignored
+        self.count = (len(self._map) - SERIES_HEADER_SIZE) // SERIES_RECORD.size
+
+    def __enter__(self) -> "SeriesReader":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        """Unmap the file; iterators from records() must be finished first"""
+        self._map.close()
+
+    def records(self, start: float = None, end: float = None,
+                targets: List[str] = None) -> Iterator[Tuple[float, str, Dict[str, Any]]]:
+        """
+        Iterate over the samples in a time range
+
+        Args:
+            start (float): First Unix time included, default the first sample
+            end (float): Unix time excluded, default after the last sample
+            targets (List[str]): Only these targets, default all
+
+        Yields:
+            Tuple[float, str, Dict[str, Any]]: Timestamp, target name and a
+            probe result with ok, ms (if any), status_code and error_type
+        """
+        lo = 0 if start is None else self._bisect(start)
+        hi = self.count if end is None else self._bisect(end)
+        if lo >= hi:
+            return
+        wanted = None
+        if targets is not None:
+            wanted = {i for i, name in enumerate(self.targets) if name in targets}
+        view = memoryview(self._map)[SERIES_HEADER_SIZE + lo * SERIES_RECORD.size:
+                                     SERIES_HEADER_SIZE + hi * SERIES_RECORD.size]
+        records = SERIES_RECORD.iter_unpack(view)
+        try:
+            for timestamp, target_id, status_code, ms, error_id, flags in records:
+                if wanted is not None and target_id not in wanted:
+                    continue
+                r = {"ok": bool(flags & SERIES_FLAG_OK)}
+                if not math.isnan(ms):
+                    r["ms"] = ms
+                if status_code:
+                    r["status_code"] = status_code
+                if error_id:
+                    r["error_type"] = SERIES_ERROR_TYPES[error_id] if error_id < len(SERIES_ERROR_TYPES) \
+                        else "unknown"
+                yield timestamp, self.targets[target_id], r
+        finally:
+            del records  # Drop the buffer export so the mapping can be closed
+            view.release()
+
+    def _bisect(self, timestamp: float) -> int:
+        """Index of the first record at or after timestamp"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if SERIES_RECORD.unpack_from(self._map, SERIES_HEADER_SIZE + mid * SERIES_RECORD.size)[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class DnsError(socket.gaierror):
+    """Raised when a DNS query fails or returns an unusable answer
+
+    A socket.gaierror, so a failing resolver behind socket.getaddrinfo
+    surfaces through requests as an ordinary name resolution failure.
+    """
+
+
+def _split_hostport(value: str, default_port: int) -> Tuple[str, int]:
+    """
+    Split "host" or "host:port" (or "[v6]:port") into host and port
+    """
+    if value.startswith("["):
+        host, _, rest = value[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else default_port
+    if value.count(":") == 1:
+        host, _, port = value.partition(":")
+        return host, int(port)
+    return value, default_port
+
+
+def _skip_dns_name(data: bytes, offset: int) -> int:
+    """Return the offset just past a (possibly compressed) DNS name"""
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2  # Compression pointer ends the name
+        if length == 0:
+            return offset + 1
+        offset += length + 1
+
+
+def dns_query(server: str, host: str, timeout: float = DNS_QUERY_TIMEOUT) -> Tuple[List[str], int]:
+    """
+    Resolve the IPv4 addresses of a host with a single UDP query
+
+    Args:
+        server (str): Resolver address, "ip" or "ip:port"
+        host (str): Host name to resolve
+        timeout (float): Query timeout in seconds
+
+    Returns:
+        Tuple[List[str], int]: Sorted IPv4 addresses and the smallest TTL of
+              the answer records in seconds
+
+    Raises:
+        DnsError: If the query times out or the answer is an error or malformed
+    """
+    server_host, server_port = _split_hostport(server, 53)
+    qid = random.getrandbits(16)
+    qname = b"".join(bytes([len(label)]) + label
+                     for label in host.rstrip(".").encode("idna").split(b"."))
+    packet = struct.pack(">HHHHHH", qid, 0x0100, 1, 0, 0, 0) + qname + b"\0" + struct.pack(">HH", 1, 1)
+
+    family = socket.AF_INET6 if ":" in server_host else socket.AF_INET
+    with socket.socket(family, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.sendto(packet, (server_host, server_port))
+            while True:
+                data, _ = sock.recvfrom(4096)
+                if len(data) >= 12 and struct.unpack(">H", data[:2])[0] == qid:
+                    break  # Ignore stray datagrams with another query id
+        except socket.timeout:
+            raise DnsError(f"DNS query to {server} timed out")
+        except OSError as e:
+            raise DnsError(f"DNS query to {server} failed: {e}")
+
+    flags, qdcount, ancount = struct.unpack(">HHH", data[2:8])
+    rcode = flags & 0x000F
+    if rcode != 0:
+        raise DnsError(f"DNS server {server} returned rcode {rcode} for {host}")
+
+    addresses: List[str] = []
+    ttl = None
+    try:
+        offset = 12
+        for _ in range(qdcount):
+            offset = _skip_dns_name(data, offset) + 4  # Skip QTYPE and QCLASS
+
+        for _ in range(ancount):
+            offset = _skip_dns_name(data, offset)
+            rtype, _, rttl, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+            offset += 10
+            if rtype in (1, 5):  # A and CNAME records both bound the cache lifetime
+                ttl = rttl if ttl is None else min(ttl, rttl)
+            if rtype == 1 and rdlength == 4:
+                addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+            offset += rdlength
+    except (struct.error, IndexError, OSError):
+        # Truncated or malformed records; OSError from inet_ntoa on short data
+        raise DnsError(f"DNS server {server} returned a malformed answer for {host}")
+
+    if not addresses:
+        raise DnsError(f"DNS server {server} returned no A records for {host}")
+    return sorted(addresses), ttl or 0
+
+
+class DnsCache:
+    """In-process DNS cache shared by all probes of a Checker
+
+    Answers from the system resolver are cached for `ttl` seconds because
+    getaddrinfo does not expose record TTLs. When an explicit `resolver` is
+    configured, IPv4 lookups are sent to it directly and cached for the TTL
+    carried in the answer.
+    """
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL_SEC, resolver: str = None):
+        """
+        Args:
+            ttl (float): Cache lifetime for system resolver answers in seconds
+            resolver (str): Optional resolver address ("ip" or "ip:port")
+        """
+        self.ttl = ttl
+        self.resolver = resolver
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Drop-in replacement for socket.getaddrinfo backed by the cache"""
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                _record_dns_lookup(0.0, True)
+                return entry[1]
+
+        t0 = time.perf_counter()
+        ttl = self.ttl
+        if self.resolver and family in (0, socket.AF_INET) and not _is_ip_address(host):
+            addresses, answer_ttl = dns_query(self.resolver, host)
+            ttl = min(answer_ttl, DNS_MAX_TTL_SEC)
+            sock_type = type or socket.SOCK_STREAM
+            result = [(socket.AF_INET, sock_type, proto, "", (ip, port)) for ip in addresses]
+        else:
+            result = _system_getaddrinfo(host, port, family, type, proto, flags)
+        _record_dns_lookup((time.perf_counter() - t0) * 1000, False)
+
+        with self._lock:
+            self.misses += 1
+            if ttl > 0:
+                self._entries[key] = (now + ttl, result)
+        return result
+
+    def clear(self) -> None:
+        """Forget all cached answers"""
+        with self._lock:
+            self._entries.clear()
+
+    def active(self):
+        """
+        Route getaddrinfo calls made by the current thread through this cache
+        """
+        return _resolve_through(self)
+
+
+class _AlternateAddresses:
+    """Resolver returning another resolver's answers rotated by one
+
+    Used for hedged attempts so that, when a name has several addresses,
+    the second attempt connects to a different one than the first.
+    """
+
+    def __init__(self, base: DnsCache = None):
+        self.base = base  # None resolves through the system
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        resolve = self.base.getaddrinfo if self.base is not None else _system_getaddrinfo
+        answers = list(resolve(host, port, family, type, proto, flags))
+        return answers[1:] + answers[:1]
+
+    def active(self):
+        """Route getaddrinfo calls made by the current thread through this resolver"""
+        return _resolve_through(self)
+
+
+@contextmanager
+def _resolve_through(resolver: Any) -> Iterator[Any]:
+    """
+    Route getaddrinfo calls of the current thread to resolver.getaddrinfo
+
+    socket.getaddrinfo is replaced by a thread-local dispatcher while at
+    least one scope is active anywhere in the process.
+    """
+    global _dns_hook_users, _dns_hook_saved
+    with _dns_hook_lock:
+        if _dns_hook_users == 0:
+            _dns_hook_saved = socket.getaddrinfo
+            socket.getaddrinfo = _dispatch_getaddrinfo
+        _dns_hook_users += 1
+    previous = getattr(_dns_local, "cache", None)
+    _dns_local.cache = resolver
+    try:
+        yield resolver
+    finally:
+        _dns_local.cache = previous
+        with _dns_hook_lock:
+            _dns_hook_users -= 1
+            if _dns_hook_users == 0:
+                socket.getaddrinfo = _dns_hook_saved
+
+
+_system_getaddrinfo = socket.getaddrinfo  # Original resolver function
+_dns_local = threading.local()  # Active cache and lookup stats per thread
+_dns_hook_lock = threading.Lock()
+_dns_hook_users = 0  # Number of active DnsCache.active() scopes
+_dns_hook_saved = None  # socket.getaddrinfo before the hook was installed
+
+
+def _dispatch_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """Installed as socket.getaddrinfo while any DnsCache is active"""
+    cache = getattr(_dns_local, "cache", None)
+    if cache is None:
+        return _system_getaddrinfo(host, port, family, type, proto, flags)
+    return cache.getaddrinfo(host, port, family, type, proto, flags)
+
+
+def _is_ip_address(host: str) -> bool:
+    """Whether host is a literal IPv4 or IPv6 address"""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except (OSError, ValueError):
+            pass
+    return False
+
+
+def _record_dns_lookup(ms: float, cached: bool) -> None:
+    """Accumulate lookup cost for the probe running in this thread"""
+    stats = getattr(_dns_local, "stats", None)
+    if stats is not None:
+        stats["lookups"] += 1
+        stats["dns_ms"] += ms
+        stats["dns_cached"] = stats["dns_cached"] and cached
+
+
+def benchmark_resolvers(hosts: List[str], resolvers: List[str],
+                        rounds: int = DNS_BENCHMARK_ROUNDS,
+                        timeout: float = DNS_QUERY_TIMEOUT,
+                        limiter: "ResourceLimiter" = None) -> Dict[str, Any]:
+    """
+    Time resolution of hosts against several resolvers
+
+    Args:
+        hosts (List[str]): Host names to resolve
+        resolvers (List[str]): Resolver addresses, or "system" for the
+            operating system resolver
+        rounds (int): Number of queries per host and resolver
+        timeout (float): Timeout of each query in seconds
+        limiter (ResourceLimiter): Budget each query holds a slot of (keyed
+            by resolver), waiting left out of the timings; None is unlimited
+
+    Returns:
+        Dict[str, Any]: Dictionary containing:
+            - resolvers (list): Per resolver latency (avg/min/max in ms),
+              failures and answers, fastest first
+            - consistency (dict): Per host, whether all resolvers that
+              answered returned the same address set (None if none did)
+    """
+    def resolve(resolver: str, host: str) -> List[str]:
+        if resolver == SYSTEM_RESOLVER:
+            infos = _system_getaddrinfo(host, 443, socket.AF_INET, socket.SOCK_STREAM)
+            return sorted({info[4][0] for info in infos})
+        return dns_query(resolver, host, timeout=timeout)[0]
+
+    def timed(resolver: str, host: str) -> float:
+        t0 = time.perf_counter()
+        answers[resolver][host] = resolve(resolver, host)
+        return (time.perf_counter() - t0) * 1000
+
+    def run(resolver: str) -> Dict[str, Any]:
+        timings: List[float] = []
+        answers[resolver] = {}
+        failures = 0
+        for host in hosts:
+            for _ in range(rounds):
+                try:
+                    if limiter is None:
+                        timings.append(timed(resolver, host))
+                    else:
+                        with limiter.slot(resolver):
+                            timings.append(timed(resolver, host))
+                except (DnsError, OSError, UnicodeError):
+                    failures += 1
+        return {
+            "resolver": resolver,
+            "avg_ms": sum(timings) / len(timings) if timings else None,
+            "min_ms": min(timings) if timings else None,
+            "max_ms": max(timings) if timings else None,
+            "failures": failures,
+            "answers": answers[resolver]
+        }
+
+    answers: Dict[str, Dict[str, List[str]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(resolvers))) as pool:
+        entries = list(pool.map(run, resolvers))
+
+    consistency = {}
+    for host in hosts:
+        answer_sets = {tuple(e["answers"][host]) for e in entries if host in e["answers"]}
+        consistency[host] = len(answer_sets) == 1 if answer_sets else None
+
+    entries.sort(key=lambda e: e["avg_ms"] if e["avg_ms"] is not None else float("inf"))
+    return {"resolvers": entries, "consistency": consistency}
+
+
+class TlsProber:
+    """TLS handshake prober with session resumption
+
+    Each probe opens a fresh TCP connection, performs a TLS handshake and
+    sends a HEAD request. The negotiated session is remembered per host and
+    offered again on the next probe, so the first probe measures a cold
+    handshake and later ones a resumed (warm) handshake. The connection is
+    the prober's own: its handshake cost is a metric apart from, and does
+    not speed up, the HTTP probe of the same target.
+    """
+
+    def __init__(self, context: ssl.SSLContext = None):
+        """
+        Args:
+            context (ssl.SSLContext): TLS context, defaults to a verifying
+                client context
+        """
+        self.context = context or ssl.create_default_context()
+        self.sessions: Dict[Tuple[str, int], ssl.SSLSession] = {}
+        self._lock = threading.Lock()
+
+    def probe(self, host: str, port: int = 443, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Perform one TLS handshake and report its cost
+
+        Args:
+            host (str): Server host name
+            port (int): Server port
+            timeout (float): Connect and read timeout in seconds
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - tls_connect_ms (float): TCP connect time
+                - tls_handshake_ms (float): TLS handshake time
+                - tls_resumed (bool): Whether a previous session was resumed
+                - tls_version (str): Negotiated protocol version
+                - tls_cipher (str): Negotiated cipher suite
+                - tls_cert_ms (float): Time to retrieve the certificate chain
+                - tls_cert_bytes (int): DER size of the certificate chain
+              or tls_error (str) if the handshake failed
+        """
+        key = (host, port)
+        with self._lock:
+            session = self.sessions.get(key)
+        try:
+            t0 = time.perf_counter()
+            with socket.create_connection((host, port), timeout=timeout) as raw:
+                t1 = time.perf_counter()
+                with self.context.wrap_socket(raw, server_hostname=host, session=session,
+                                              do_handshake_on_connect=False) as tls:
+                    tls.do_handshake()
+                    t2 = time.perf_counter()
+
+                    # Python 3.13+ exposes the verified chain, older versions the leaf only
+                    get_chain = getattr(tls, "get_verified_chain", None)
+                    if get_chain is not None:
+                        chain = [cert if isinstance(cert, bytes) else cert.public_bytes(ssl.Encoding.DER)
+                                 for cert in get_chain()]
+                    else:
+                        chain = [tls.getpeercert(binary_form=True) or b""]
+                    t3 = time.perf_counter()
+
+                    # TLS 1.3 tickets arrive after the handshake, so read a response
+                    tls.sendall(f"HEAD / HTTP/1.1\r\nHost: {host}\r\n"
+                                f"User-Agent: GitHubChecker/1.0\r\nConnection: close\r\n\r\n".encode("ascii"))
+                    tls.recv(TLS_PROBE_READ_BYTES)
+
+                    if tls.session is not None:
+                        with self._lock:
+                            self.sessions[key] = tls.session
+                    cipher = tls.cipher()
+                    return {
+                        "tls_connect_ms": round((t1 - t0) * 1000, 1),
+                        "tls_handshake_ms": round((t2 - t1) * 1000, 1),
+                        "tls_resumed": tls.session_reused,
+                        "tls_version": tls.version(),
+                        "tls_cipher": cipher[0] if cipher else None,
+                        "tls_cert_ms": round((t3 - t2) * 1000, 3),
+                        "tls_cert_bytes": sum(len(cert) for cert in chain)
+                    }
+        except (OSError, ssl.SSLError, ValueError) as e:
+            return {"tls_error": str(e) or type(e).__name__}
+
+
+class Http2Prober:
+    """HTTP/2 prober sending all paths of an origin over one connection
+
+    Every URL passed to `fetch` must share the same origin. One connection
+    is opened per call and each URL is requested on its own concurrent
+    stream. https:// origins negotiate h2 through ALPN, http:// origins use
+    cleartext HTTP/2 with prior knowledge (useful for local test servers).
+    Requires the optional `h2` package.
+    """
+
+    def __init__(self, context: ssl.SSLContext = None):
+        """
+        Args:
+            context (ssl.SSLContext): TLS context, defaults to a verifying
+                client context offering only h2 through ALPN
+        """
+        if h2 is None:
+            raise RuntimeError("HTTP/2 probing requires the 'h2' package (pip install h2)")
+        if context is None:
+            context = ssl.create_default_context()
+            context.set_alpn_protocols(["h2"])
+        self.context = context
+
+    def fetch(self, urls: List[str], timeout: float = DEFAULT_TIMEOUT) -> List[Dict[str, Any]]:
+        """
+        Request all URLs concurrently over one HTTP/2 connection
+
+        Args:
+            urls (List[str]): URLs sharing one origin
+            timeout (float): Overall timeout in seconds
+
+        Returns:
+            List[Dict[str, Any]]: One result per URL in the same schema as
+                  Checker._test, plus h2_stream and h2_connect_ms
+        """
+        if not urls:
+            return []
+        parts = urlsplit(urls[0])
+        host = parts.hostname
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        authority = parts.netloc.rpartition("@")[2]
+        deadline = time.perf_counter() + timeout
+        streams: Dict[int, Dict[str, Any]] = {}
+        connect_ms = None
+
+        try:
+            t0 = time.perf_counter()
+            sock = socket.create_connection((host, port), timeout=timeout)
+        except socket.timeout:
+            return [_timeout_result() for _ in urls]
+        except OSError as e:
+            return [_connection_error_result(e) for _ in urls]
+
+        try:
+            if parts.scheme == "https":
+                sock = self.context.wrap_socket(sock, server_hostname=host)
+                if sock.selected_alpn_protocol() != "h2":
+                    return [{
+                        "ok": False,
+                        "error": "Server did not negotiate HTTP/2",
+                        "error_type": "http",
+                        "suggestion": "Use the requests backend for this target"
+                    } for _ in urls]
+            connect_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+            conn = h2.connection.H2Connection(
+                config=h2.config.H2Configuration(client_side=True, header_encoding="utf-8"))
+            conn.initiate_connection()
+            for index, url in enumerate(urls):
+                url_parts = urlsplit(url)
+                path = (url_parts.path or "/") + (f"?{url_parts.query}" if url_parts.query else "")
+                stream_id = conn.get_next_available_stream_id()
+                conn.send_headers(stream_id, [
+                    (":method", "GET"),
+                    (":authority", authority),
+                    (":scheme", parts.scheme),
+                    (":path", path),
+                    ("user-agent", "GitHubChecker/1.0"),
+                ], end_stream=True)
+                streams[stream_id] = {"index": index, "t0": time.perf_counter(), "result": None}
+            sock.sendall(conn.data_to_send())
+
+            pending = set(streams)
+            while pending:
+                remain = deadline - time.perf_counter()
+                if remain <= 0:
+                    raise socket.timeout()
+                sock.settimeout(remain)
+                data = sock.recv(H2_READ_SIZE)
+                if not data:
+                    raise ConnectionError("Connection closed by server")
+                for event in conn.receive_data(data):
+                    stream = streams.get(getattr(event, "stream_id", None))
+                    if isinstance(event, h2.events.ResponseReceived) and stream:
+                        stream["status"] = int(dict(event.headers)[":status"])
+                    elif isinstance(event, h2.events.DataReceived):
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded) and stream:
+                        status = stream.get("status", 0)
+                        stream["result"] = {
+                            "ok": status == 200,
+                            "ms": round((time.perf_counter() - stream["t0"]) * 1000),
+                            "status_code": status
+                        }
+                        pending.discard(event.stream_id)
+                    elif isinstance(event, h2.events.StreamReset) and stream:
+                        stream["result"] = {
+                            "ok": False,
+                            "error": f"HTTP/2 stream reset (code {event.error_code})",
+                            "error_type": "http",
+                            "suggestion": "Server returned an invalid HTTP response"
+                        }
+                        pending.discard(event.stream_id)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        raise ConnectionError(f"HTTP/2 connection terminated (code {event.error_code})")
+                outgoing = conn.data_to_send()
+                if outgoing:
+                    sock.sendall(outgoing)
+
+            conn.close_connection()
+            sock.sendall(conn.data_to_send())
+        except socket.timeout:
+            pass  # Streams that did not finish are reported as timeouts below
+        except (OSError, ssl.SSLError, ConnectionError, h2.exceptions.ProtocolError) as e:
+            return [_connection_error_result(e) for _ in urls]
+        finally:
+            sock.close()
+
+        results = [_timeout_result() for _ in urls]
+        for stream_id, stream in streams.items():
+            if stream["result"] is not None:
+                stream["result"].update(h2_stream=stream_id, h2_connect_ms=connect_ms)
+                results[stream["index"]] = stream["result"]
+        return results
+
+
+class TcpProber:
+    """Connect-only prober measuring TCP handshakes
+
+    Opens `count` non-blocking connections per endpoint at once and waits
+    for all of them on one selector, closing each as soon as its handshake
+    completes. No data is sent, so a probe costs a few packets and almost
+    no CPU. Handshakes still unanswered at the timeout count as lost.
+    """
+
+    def __init__(self, count: int = TCP_PROBE_COUNT):
+        """
+        Args:
+            count (int): Handshakes per endpoint
+        """
+        self.count = max(1, count)
+
+    def probe(self, host: str, port: int, timeout: float = TCP_PROBE_TIMEOUT) -> Dict[str, Any]:
+        """
+        Probe one endpoint, see probe_many
+        """
+        return self.probe_many([(host, port)], timeout)[0]
+
+    def probe_many(self, endpoints: List[Tuple[str, int]],
+                   timeout: float = TCP_PROBE_TIMEOUT) -> List[Dict[str, Any]]:
+        """
+        Fire all handshakes to all endpoints concurrently
+
+        Args:
+            endpoints (List[Tuple[str, int]]): (host, port) pairs
+            timeout (float): Seconds to wait for the handshakes
+
+        Returns:
+            List[Dict[str, Any]]: One result per endpoint in the same schema
+                  as Checker._test, with ms the median connect time plus:
+                - tcp_port (int): Probed port
+                - tcp_sent (int): Handshakes attempted
+                - tcp_received (int): Handshakes completed
+                - loss_pct (float): Handshakes unanswered within the timeout
+                - connect_ms (dict): min, avg, p50, p90 and max connect time
+        """
+        stats = [{"times": [], "refused": 0, "error": None} for _ in endpoints]
+        sel = selectors.DefaultSelector()
+        try:
+            for index, (host, port) in enumerate(endpoints):
+                try:
+                    family, socktype, proto, _, addr = socket.getaddrinfo(
+                        host, port, type=socket.SOCK_STREAM)[0]
+                except OSError as e:
+                    stats[index]["error"] = e
+                    continue
+                for _ in range(self.count):
+                    sock = socket.socket(family, socktype, proto)
+                    sock.setblocking(False)
+                    t0 = time.perf_counter()
+                    err = sock.connect_ex(addr)
+                    if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                        sel.register(sock, selectors.EVENT_WRITE, (index, t0))
+                    else:
+                        stats[index]["refused"] += 1
+                        sock.close()
+
+            deadline = time.perf_counter() + timeout
+            while sel.get_map():
+                remain = deadline - time.perf_counter()
+                if remain <= 0:
+                    break
+                for key, _ in sel.select(remain):
+                    now = time.perf_counter()
+                    index, t0 = key.data
+                    sock = key.fileobj
+                    sel.unregister(sock)
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        stats[index]["times"].append((now - t0) * 1000)
+                    else:
+                        stats[index]["refused"] += 1
+                    sock.close()
+        finally:
+            for key in list(sel.get_map().values()):
+                key.fileobj.close()  # Lost handshakes
+            sel.close()
+
+        return [self._result(port, stat) for (_, port), stat in zip(endpoints, stats)]
+
+    def _result(self, port: int, stat: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarise the handshakes of one endpoint"""
+        if stat["error"] is not None:
+            return {
+                "ok": False,
+                "error": "Cannot resolve host",
+                "error_type": "dns",
+                "suggestion": "Check your DNS settings",
+                "details": str(stat["error"]),
+                "tcp_port": port
+            }
+        times = sorted(stat["times"])
+        lost = self.count - len(times) - stat["refused"]
+        result: Dict[str, Any] = {
+            "tcp_port": port,
+            "tcp_sent": self.count,
+            "tcp_received": len(times),
+            "loss_pct": round(lost / self.count * 100, 1)
+        }
+        if not times:
+            result.update(_timeout_result() if lost else _connection_error_result(
+                ConnectionRefusedError(f"Connection refused on port {port}")))
+            return result
+        result.update({
+            "ok": True,
+            "ms": round(_percentile(times, 50), 1),
+            "connect_ms": {
+                "min": round(times[0], 1),
+                "avg": round(sum(times) / len(times), 1),
+                "p50": round(_percentile(times, 50), 1),
+                "p90": round(_percentile(times, 90), 1),
+                "max": round(times[-1], 1)
+            }
+        })
+        return result
+
+
+class SshProber:
+    """SSH endpoint prober reading the server identification banner
+
+    Connects to an SSH server and reads the version line it sends before
+    any key exchange ("SSH-2.0-..."), then disconnects. The banner proves
+    the SSH service itself answers, which a bare TCP handshake through a
+    middlebox does not.
+    """
+
+    def probe(self, host: str, port: int = 22, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Connect and read the SSH banner
+
+        Args:
+            host (str): Server host name
+            port (int): Server port
+            timeout (float): Overall timeout in seconds
+
+        Returns:
+            Dict[str, Any]: Result in the same schema as Checker._test, with
+                  ms the time until the banner arrived, plus:
+                - ssh_connect_ms (float): TCP connect time
+                - ssh_banner_ms (float): Time from connect to banner
+                - ssh_banner (str): Server identification line
+        """
+        deadline = time.perf_counter() + timeout
+        try:
+            t0 = time.perf_counter()
+            with socket.create_connection((host, port), timeout=timeout) as sock:
+                t1 = time.perf_counter()
+                data = b""
+                # Servers may send other lines before the identification line
+                while True:
+                    line, sep, rest = data.partition(b"\n")
+                    if sep and line.startswith(b"SSH-"):
+                        break
+                    if sep:
+                        data = rest
+                        continue
+                    if len(data) > SSH_BANNER_MAX_BYTES:
+                        raise ValueError("No SSH identification line")
+                    sock.settimeout(max(0.001, deadline - time.perf_counter()))
+                    chunk = sock.recv(SSH_BANNER_MAX_BYTES + 1)
+                    if not chunk:
+                        raise ValueError("Connection closed before the SSH banner")
+                    data += chunk
+                t2 = time.perf_counter()
+        except socket.timeout:
+            return _timeout_result()
+        except OSError as e:
+            return _connection_error_result(e)
+        except ValueError as e:
+            return {
+                "ok": False,
+                "error": str(e),
+                "error_type": "protocol",
+                "suggestion": "The port answers but not with SSH, check proxies or firewalls"
+            }
+        return {
+            "ok": True,
+            "ms": round((t2 - t0) * 1000),
+            "ssh_connect_ms": round((t1 - t0) * 1000, 1),
+            "ssh_banner_ms": round((t2 - t1) * 1000, 1),
+            "ssh_banner": line.rstrip(b"\r").decode("ascii", "replace")
+        }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil(n * pct / 100)
+    return sorted_values[int(rank) - 1]
+
+
+def _timeout_result() -> Dict[str, Any]:
+    """Result dictionary for a probe that timed out"""
+    return {
+        "ok": False,
+        "error": "Request timed out",
+        "error_type": "timeout",
+        "suggestion": "Network is slow or server is not responding"
+    }
+
+
+def _connection_error_result(e: Exception) -> Dict[str, Any]:
+    """Result dictionary for a probe that could not connect"""
+    return {
+        "ok": False,
+        "error": "Connection error - check network",
+        "error_type": "connection",
+        "suggestion": "Please verify your network connection",
+        "details": str(e)
+    }
+
+
+def parse_rate_limit(headers: Any) -> Dict[str, Any]:
+    """
+    Extract GitHub X-RateLimit-* headers from a response
+
+    Args:
+        headers (Any): Response headers (a case-insensitive mapping)
+
+    Returns:
+        Dict[str, Any]: limit, remaining, used, reset (epoch seconds) and
+              resource, or None if the response carries no rate-limit headers
+    """
+    if not isinstance(headers, Mapping) or "X-RateLimit-Remaining" not in headers:
+        return None
+    info: Dict[str, Any] = {}
+    for key in ("limit", "remaining", "used", "reset"):
+        value = headers.get(f"X-RateLimit-{key.capitalize()}")
+        try:
+            info[key] = int(value)
+        except (TypeError, ValueError):
+            info[key] = None
+    info["resource"] = headers.get("X-RateLimit-Resource")
+    return info
+
+
+def is_reachable(r: Dict[str, Any]) -> bool:
+    """
+    Whether a probe result shows the target is reachable
+
+    Rate-limited answers come from a reachable server, so they count as
+    reachable even though the probe itself did not succeed.
+    """
+    return bool(r.get("ok")) or r.get("error_type") == "rate_limited"
+
+
+class ResourceLimiter:
+    """Global budget for probes: connections, per-host concurrency, rates
+
+    Every probe of the checkers sharing a limiter holds one slot for the
+    duration of its exchange. A slot is granted when fewer than
+    `max_in_flight` probes (and fewer than `per_host` probes to the same
+    host) are running, a probe token is available (`probes_per_sec`, with
+    a one second burst) and the byte budget is not overdrawn. Bytes are
+    only known once a probe ends, so they are charged afterwards and the
+    debt delays later probes (`bytes_per_sec`). A limit of 0 is
+    unlimited. The wait for a slot is reported as queue_ms, apart from
+    the measured latency.
+    """
+
+    def __init__(self, max_in_flight: int = 0, per_host: int = 0,
+                 probes_per_sec: float = 0.0, bytes_per_sec: float = 0.0):
+        """
+        Args:
+            max_in_flight (int): Probes running at once over all hosts
+            per_host (int): Probes running at once per host
+            probes_per_sec (float): Probes started per second
+            bytes_per_sec (float): Response bytes received per second
+        """
+        self.max_in_flight = max_in_flight
+        self.per_host = per_host
+        self.probes_per_sec = probes_per_sec
+        self.bytes_per_sec = bytes_per_sec
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.queued = 0  # Probes that had to wait for a slot
+        self._hosts: Dict[str, int] = {}
+        self._probe_tokens = max(1.0, probes_per_sec)
+        self._byte_tokens = bytes_per_sec
+        self._refilled = time.monotonic()
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[Dict[str, Any]]:
+        """
+        Hold a probe slot for the with block
+
+        Args:
+            host (str): Host the probe connects to
+
+        Yields:
+            Dict[str, Any]: queue_ms (time waited for the slot); set "bytes"
+            to the bytes received so they are charged to the budget
+        """
+        slot = self.acquire(host)
+        try:
+            yield slot
+        finally:
+            self.release(host, slot)
+
+    def acquire(self, host: str, blocking: bool = True) -> Dict[str, Any]:
+        """
+        Take a probe slot, to be given back with release()
+
+        Args:
+            host (str): Host the probe connects to
+            blocking (bool): Wait for a slot; otherwise return None at once
+                if none is free
+
+        Returns:
+            Dict[str, Any]: The slot as yielded by slot(), or None
+        """
+        t0 = time.perf_counter()
+        with self._cond:
+            waited = False
+            while True:
+                delay = self._delay(host)
+                if delay == 0:
+                    break
+                if not blocking:
+                    return None
+                waited = True
+                self._cond.wait(delay)  # None waits for a slot to be released
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self._hosts[host] = self._hosts.get(host, 0) + 1
+            if self.probes_per_sec:
+                self._probe_tokens -= 1
+            if waited:
+                self.queued += 1
+        return {"queue_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+    def release(self, host: str, slot: Dict[str, Any]) -> None:
+        """Give back a slot from acquire(), charging its "bytes" to the budget"""
+        with self._cond:
+            self.in_flight -= 1
+            self._hosts[host] -= 1
+            if self.bytes_per_sec:
+                self._byte_tokens -= slot.get("bytes", 0)
+            self._cond.notify_all()
+
+    def _delay(self, host: str) -> float:
+        """Seconds until a slot could be granted, None until one is released, 0 now; caller holds the lock"""
+        now = time.monotonic()
+        elapsed, self._refilled = now - self._refilled, now
+        if self.probes_per_sec:
+            self._probe_tokens = min(max(1.0, self.probes_per_sec),
+                                     self._probe_tokens + elapsed * self.probes_per_sec)
+        if self.bytes_per_sec:
+            self._byte_tokens = min(self.bytes_per_sec, self._byte_tokens + elapsed * self.bytes_per_sec)
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return None
+        if self.per_host and self._hosts.get(host, 0) >= self.per_host:
+            return None
+        if self.probes_per_sec and self._probe_tokens < 1:
+            return (1 - self._probe_tokens) / self.probes_per_sec
+        if self.bytes_per_sec and self._byte_tokens < 0:
+            return -self._byte_tokens / self.bytes_per_sec
+        return 0
+
+
+def judge_totals(total: int, reachable: int, flagged: bool, avg_ms: float) -> str:
+    """
+    Status from result totals, the rule behind Checker._judge
+
+    Args:
+        total (int): Number of results
+        reachable (int): Results from reachable targets, see is_reachable
+        flagged (bool): Whether any result was rate limited, anomalous or lossy
+        avg_ms (float): Average response time of the timed results
+
+    Returns:
+        str: "bad" if nothing was reachable, "warn" on partial success,
+             flags or a slow average, "good" otherwise
+    """
+    if total == 0 or reachable == 0:
+        return "bad"  # No successful results
+    if reachable < total:
+        return "warn"  # Partial success
+    if flagged:
+        return "warn"  # Rate limited, far slower than the baseline or lossy
+    return "good" if avg_ms < RESPONSE_TIME_THRESHOLD_MS else "warn"
+
+
+_opened = threading.local()  # Connections opened by the requests of each thread
+
+
+class _TrackedConnection:
+    """Mixin counting the connects of pooled connections per thread"""
+
+    def connect(self):
+        _opened.count = getattr(_opened, "count", 0) + 1
+        super().connect()
+
+
+class _TrackedHTTPConnection(_TrackedConnection, HTTPConnection):
+    pass
+
+
+class _TrackedHTTPSConnection(_TrackedConnection, HTTPSConnection):
+    pass
+
+
+class _TrackedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TrackedHTTPConnection
+
+
+class _TrackedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TrackedHTTPSConnection
+
+
+class ConnectionTrackingAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter whose pools count the connections they open
+
+    A request through it opened a new connection when opened_connections()
+    grew while it ran (redirects included), and reused one otherwise.
+    Counts are per thread, so concurrent probes are told apart exactly.
+    SOCKS proxies keep their own pools and are not tracked.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self._track(self.poolmanager)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith("socks"):
+            self._track(manager)
+        return manager
+
+    @staticmethod
+    def _track(manager: Any) -> None:
+        manager.pool_classes_by_scheme = {"http": _TrackedHTTPConnectionPool,
+                                          "https": _TrackedHTTPSConnectionPool}
+
+
+def opened_connections() -> int:
+    """Connections opened so far by ConnectionTrackingAdapter requests of this thread"""
+    return getattr(_opened, "count", 0)
+
+
+def tracked_session(**adapter_kwargs) -> requests.Session:
+    """
+    Session that reports connection reuse, see ConnectionTrackingAdapter
+
+    Args:
+        **adapter_kwargs: HTTPAdapter arguments such as pool_maxsize
+
+    Returns:
+        requests.Session: Session with a tracking adapter for http and https
+    """
+    session = requests.Session()
+    adapter = ConnectionTrackingAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def is_cold_sample(r: Dict[str, Any], first: bool) -> bool:
+    """
+    Whether a probe result paid connection or DNS setup
+
+    A sample is cold when its request opened a new connection or resolved
+    its host without the DNS cache, and warm when it reused a connection
+    or a cached address. Results that carry neither (errors, replayed,
+    HTTP/2 and SSH probes) count as cold only as a target's first sample.
+
+    Args:
+        r (Dict[str, Any]): Probe result
+        first (bool): Whether r is the first sample of its target
+
+    Returns:
+        bool: True for a cold sample, False for a warm one
+    """
+    if r.get("connection") == "new" or r.get("dns_cached") is False:
+        return True
+    if r.get("connection") == "reused" or r.get("dns_cached"):
+        return False
+    return first
+
+
+class _DetachableProbe:
+    """Handle of a fast-verdict probe thread, detached once the verdict is in
+
+    A detached probe drops its side effects (checker state, listener
+    events) and its limiter slot is given back at once instead of when
+    its exchange ends.
+    """
+
+    __slots__ = ("detached", "held", "_lock")
+
+    def __init__(self):
+        self.detached = False
+        self.held = None  # (limiter, host, slot) while a limiter slot is held
+        self._lock = threading.Lock()
+
+    def hold(self, limiter: ResourceLimiter, host: str, slot: Dict[str, Any]) -> bool:
+        """Track a slot taken by the probe; False (slot given back) if already detached"""
+        with self._lock:
+            self.held = (limiter, host, slot)
+        if self.detached:
+            self.give_back()
+            return False
+        return True
+
+    def give_back(self) -> None:
+        """Release the held slot, once"""
+        with self._lock:
+            held, self.held = self.held, None
+        if held is not None:
+            limiter, host, slot = held
+            limiter.release(host, slot)
+
+    def detach(self) -> None:
+        """Drop the probe's side effects from now on and free its slot"""
+        self.detached = True
+        self.give_back()
+
+
+class _TargetTally:
+    """Running per-target totals behind target_stats, see Checker.test"""
+
+    __slots__ = ("samples", "successes", "ms_total")
+
+    def __init__(self):
+        self.samples = 0
+        self.successes = 0
+        self.ms_total = 0.0
+
+    def add(self, r: Dict[str, Any]) -> None:
+        """Count one probe result"""
+        self.samples += 1
+        if "ms" in r:
+            self.ms_total += r["ms"]
+        if r.get("ok", False):
+            self.successes += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Average response (over all samples) and success rate in percent"""
+        return {
+            "avg_response": self.ms_total / self.samples,
+            "success_rate": self.successes / self.samples * 100
+        }
+
+
+def _policy_number(spec: Dict[str, Any], key: str, default: float, where: str) -> float:
+    """Non-negative number of a policy mapping, ValueError for any other type"""
+    value = spec.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"Invalid {key} in {where}: {value!r} (use a non-negative number)")
+    return float(value)
+
+
+def _policy_flag(spec: Dict[str, Any], key: str, default: bool, where: str) -> bool:
+    """Boolean of a policy mapping, ValueError for any other type"""
+    value = spec.get(key, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"Invalid {key} in {where}: {value!r} (use true or false)")
+    return value
+
+
+class _LatencyRule:
+    """Compiled latency threshold of a JudgePolicy"""
+
+    __slots__ = ("metric", "pct", "warn_ms", "bad_ms", "min_samples")
+
+    def __init__(self, spec: Dict[str, Any], where: str):
+        if not isinstance(spec, dict):
+            raise ValueError(f"{where} must be a JSON object")
+        unknown = set(spec) - set(POLICY_LATENCY_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown key(s) in {where}: {', '.join(sorted(unknown))}")
+        metric = spec.get("metric", POLICY_DEFAULT_METRIC)
+        if metric == "avg":
+            self.pct = None
+        else:
+            try:
+                self.pct = float(metric[1:]) if isinstance(metric, str) and metric.startswith("p") else None
+            except ValueError:
+                self.pct = None
+            if self.pct is None or not 0 < self.pct <= 100:
+                raise ValueError(f"Invalid metric in {where}: {metric!r} (use avg or p1..p100)")
+        self.metric = metric
+        for key in ("warn_ms", "bad_ms"):
+            limit = spec.get(key)
+            if limit is not None and (isinstance(limit, bool) or not isinstance(limit, (int, float))
+                                      or limit < 0):
+                raise ValueError(f"Invalid {key} in {where}: {limit!r} (use a non-negative number or null)")
+        self.warn_ms = spec.get("warn_ms")
+        self.bad_ms = spec.get("bad_ms")
+        self.min_samples = spec.get("min_samples", 1)
+        if isinstance(self.min_samples, bool) or not isinstance(self.min_samples, int) or self.min_samples < 1:
+            raise ValueError(f"Invalid min_samples in {where}: {self.min_samples!r} (use an integer of at least 1)")
+
+    def value(self, values: List[float]) -> float:
+        """The rule's metric over the latencies, None below min_samples"""
+        if not values or len(values) < self.min_samples:
+            return None
+        if self.pct is None:
+            return sum(values) / len(values)
+        return _percentile(sorted(values), self.pct)
+
+    def judge(self, values: List[float]) -> str:
+        """Status the latencies call for: "bad", "warn" or None"""
+        value = self.value(values)
+        if value is None:
+            return None
+        if self.bad_ms is not None and value >= self.bad_ms:
+            return "bad"
+        if self.warn_ms is not None and value >= self.warn_ms:
+            return "warn"
+        return None
+
+    def breach(self, values: List[float], status: str) -> str:
+        """Description of the latencies reaching the status's limit, else None"""
+        limit = self.bad_ms if status == "bad" else self.warn_ms
+        value = self.value(values)
+        if value is None or limit is None or value < limit:
+            return None
+        return f"{self.metric} {value:.0f}ms >= {limit:g}ms"
+
+
+class _TargetRule:
+    """Compiled per-target part of a JudgePolicy"""
+
+    __slots__ = ("weight", "required", "latency")
+
+    def __init__(self, spec: Dict[str, Any], where: str):
+        if not isinstance(spec, dict):
+            raise ValueError(f"{where} must be a JSON object")
+        unknown = set(spec) - set(POLICY_TARGET_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown key(s) in {where}: {', '.join(sorted(unknown))}")
+        weight = _policy_number(spec, "weight", 1.0, where)
+        self.weight = 0.0 if _policy_flag(spec, "optional", False, where) else weight
+        self.required = _policy_flag(spec, "required", False, where)
+        self.latency = _LatencyRule(spec["latency"], f"{where}.latency") if "latency" in spec else None
+
+
+class JudgePolicy:
+    """Declarative status policy, compiled once and evaluated by Checker._judge
+
+    The policy is a JSON-style mapping, all keys optional:
+
+        {
+          "good_score": 1.0,      # weighted share of reachable results needed for "good"
+          "bad_score": 0.0,       # share at or below which the status is "bad"
+          "warn_on_flags": true,  # rate limits, baseline anomalies and loss give "warn"
+          "latency": {"metric": "avg", "warn_ms": 3000, "bad_ms": null, "min_samples": 1},
+          "default": {"weight": 1},
+          "targets": {
+            "homepage": {"required": true},
+            "raw": {"optional": true},
+            "api": {"weight": 2, "latency": {"metric": "p95", "warn_ms": 800, "min_samples": 3}}
+          }
+        }
+
+    Every result counts with its target's weight (optional targets weigh
+    0 and never change the status). A required target that was reachable
+    in none of its results makes the status "bad". Latency rules apply to
+    the timed results of weighted targets (globally) or of one target,
+    once at least min_samples are present. The default policy is exactly
+    the built-in rule, see judge_totals.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Args:
+            config (Dict[str, Any]): Policy mapping as described above
+
+        Raises:
+            ValueError: If the policy has unknown keys or invalid values
+        """
+        if config is None:
+            config = {}
+        if not isinstance(config, dict) or not isinstance(config.get("targets", {}), dict):
+            raise ValueError("A policy and its targets must be JSON objects")
+        unknown = set(config) - set(POLICY_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown policy key(s): {', '.join(sorted(unknown))}")
+        self.good_score = _policy_number(config, "good_score", 1.0, "policy")
+        self.bad_score = _policy_number(config, "bad_score", 0.0, "policy")
+        if self.bad_score > self.good_score:
+            raise ValueError(f"bad_score {self.bad_score:g} is above good_score {self.good_score:g}")
+        self.warn_on_flags = _policy_flag(config, "warn_on_flags", True, "policy")
+        latency = config.get("latency", {"warn_ms": RESPONSE_TIME_THRESHOLD_MS})
+        self.latency = _LatencyRule(latency, "latency") if latency is not None else None
+        self.default = _TargetRule(config.get("default", {}), "default")
+        self.targets = {name: _TargetRule(spec, f"targets.{name}")
+                        for name, spec in config.get("targets", {}).items()}
+        # Targets whose results are tallied one by one
+        self._track_all = self.default.required or self.default.latency is not None
+        self._tracked = {name for name, rule in self.targets.items()
+                         if rule.required or rule.latency is not None}
+
+    @classmethod
+    def load(cls, path: str) -> "JudgePolicy":
+        """
+        Compile a policy from a JSON file
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a valid policy
+        """
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def evaluate(self, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Judge detection results
+
+        Args:
+            results (List[Tuple[str, Dict[str, Any]]]): Detection results list
+
+        Returns:
+            str: "good", "warn" or "bad"
+        """
+        if not results:
+            return "bad"  # No results means bad status
+
+        score, flagged, timed, tracked = self._tally(results)
+        if score <= self.bad_score:
+            return "bad"
+        statuses = [self.latency.judge(timed) if self.latency is not None else None]
+        for rule, reachable, target_timed in tracked.values():
+            if rule.required and not reachable:
+                return "bad"  # A required target was never reachable
+            if rule.latency is not None:
+                statuses.append(rule.latency.judge(target_timed))
+        if "bad" in statuses:
+            return "bad"
+        if score < self.good_score:
+            return "warn"  # Partial success
+        if flagged and self.warn_on_flags:
+            return "warn"  # Rate limited, far slower than the baseline or lossy
+        return "warn" if "warn" in statuses else "good"
+
+    def latency_breaches(self, results: List[Tuple[str, Dict[str, Any]]], status: str) -> List[str]:
+        """
+        Describe the latency rules whose limit for a status the results reach
+
+        Args:
+            results (List[Tuple[str, Dict[str, Any]]]): Detection results list
+            status (str): "bad" or "warn"
+
+        Returns:
+            List[str]: One description per rule, e.g. "api p95 1200ms >= 800ms"
+        """
+        _, _, timed, tracked = self._tally(results)
+        breaches = [self.latency.breach(timed, status)] if self.latency is not None else []
+        breaches += [f"{name} {rule.latency.breach(target_timed, status)}"
+                     for name, (rule, _, target_timed) in tracked.items()
+                     if rule.latency is not None and rule.latency.breach(target_timed, status)]
+        return [breach for breach in breaches if breach]
+
+    def _tally(self, results: List[Tuple[str, Dict[str, Any]]]
+               ) -> Tuple[float, bool, List[float], Dict[str, List[Any]]]:
+        """Weighted reachability score, flags, timed weighted results and per-target tallies"""
+        total = scored = 0.0
+        any_reachable = flagged = False
+        timed: List[float] = []
+        tracked: Dict[str, List[Any]] = {}  # name -> [rule, reachable count, timed]
+        for name, r in results:
+            rule = self.targets.get(name, self.default)
+            # Rate-limited targets are reachable and do not count as network failures
+            reachable = is_reachable(r)
+            any_reachable = any_reachable or reachable
+            if rule.weight:
+                total += rule.weight
+                if reachable:
+                    scored += rule.weight
+                if r.get("error_type") == "rate_limited" or r.get("anomaly") or r.get("loss_pct"):
+                    flagged = True
+                if "ms" in r:
+                    timed.append(r["ms"])
+            if self._track_all or name in self._tracked:
+                entry = tracked.get(name)
+                if entry is None:
+                    entry = tracked[name] = [rule, 0, []]
+                entry[1] += reachable
+                if "ms" in r:
+                    entry[2].append(r["ms"])
+
+        # Only optional targets were probed: judge plain reachability
+        score = scored / total if total else (1.0 if any_reachable else 0.0)
+        return score, flagged, timed, tracked
+
+
+DEFAULT_POLICY = JudgePolicy()  # Built-in policy of every Checker
+
+
+class Checker:
+    """GitHub accessibility checker
+
+    This class is responsible for performing accessibility checks on GitHub
+    website and API, and collecting statistics such as response time and
+    success rate
+    """
+
+    # Target URLs - includes GitHub homepage and API endpoints
+    TARGETS = [
+        ("homepage", "https://github.com"),  # GitHub homepage
+        ("api", "https://api.github.com"),  # GitHub API
+    ]
+
+    # SSH git endpoints - (name, host, port)
+    SSH_TARGETS = [
+        ("ssh", "github.com", 22),  # git@github.com
+        ("ssh-443", "ssh.github.com", 443),  # SSH over the HTTPS port
+    ]
+
+    def __init__(self, breaker_threshold: int = 0,
+                 breaker_cooldown: float = BREAKER_COOLDOWN_SEC,
+                 proxy: str = None, target_proxies: Dict[str, str] = None,
+                 dns_cache: DnsCache = None, tls_prober: TlsProber = None,
+                 h2_prober: Http2Prober = None,
+                 targets: List[Tuple[str, str]] = None,
+                 session: requests.Session = None,
+                 api_token: str = None,
+                 baseline: LatencyBaseline = None,
+                 tcp_precheck: TcpProber = None,
+                 ssh_prober: SshProber = None,
+                 tracer: Tracer = None,
+                 fast_verdict: bool = False,
+                 hedge: bool = False,
+                 policy: JudgePolicy = None,
+                 transport: Any = None,
+                 limiter: ResourceLimiter = None):
+        """
+        Args:
+            breaker_threshold (int): Consecutive failures before a target's
+                circuit opens; 0 disables the circuit breaker
+            breaker_cooldown (float): Initial cool-down in seconds before a
+                half-open retry of an open circuit
+            proxy (str): Proxy URL for all targets, "direct" to bypass any
+                environment proxy, None to inherit the environment
+            target_proxies (Dict[str, str]): Per-target proxy overrides,
+                keyed by target name, same values as `proxy`
+            dns_cache (DnsCache): DNS cache shared by all probes of this
+                checker; None resolves every request through the system
+            tls_prober (TlsProber): Adds the handshake cost of a separate TLS
+                connection (resuming sessions across probes) to each direct
+                HTTPS result, apart from its ms; None disables
+            h2_prober (Http2Prober): Probe all targets of an origin over one
+                multiplexed HTTP/2 connection instead of one requests call
+                per target; proxied targets still use requests
+            targets (List[Tuple[str, str]]): (name, url) pairs to probe instead
+                of the GitHub defaults in TARGETS
+            session (requests.Session): Session whose connection pools are
+                reused across probes, see tracked_session for results that
+                tell new connections from reused ones; None sends each probe
+                on its own
+            api_token (str): GitHub token sent to rate-limited targets
+                (RATE_LIMIT_TARGETS) for the higher authenticated limit
+            baseline (LatencyBaseline): Learned latency baseline that flags
+                results far above a target's usual latency; None disables
+            tcp_precheck (TcpProber): Connect-only probe run before the HTTP
+                probes of each check; if no handshake reaches any target the
+                check fails at once. None disables
+            ssh_prober (SshProber): Probe the SSH_TARGETS banners alongside the
+                HTTPS targets of each check; None disables
+            tracer (Tracer): Records every probe and the judge/message stages
+                of each check; None disables
+            fast_verdict (bool): Probe all targets concurrently and return as
+                soon as the status can no longer change, abandoning the
+                probes still running (not used with the HTTP/2 backend)
+            hedge (bool): Send a second request to another address of the
+                target when the first has not answered within the target's
+                recent p95 latency, and take the first reply
+            policy (JudgePolicy): Status policy of _judge; None uses the
+                built-in DEFAULT_POLICY
+            transport: Carries out the HTTP exchange of each probe, e.g. a
+                RecordingTransport or ReplayTransport; None sends requests
+            limiter (ResourceLimiter): Budget shared with other checkers
+                for concurrent probes and probe/byte rates; None is unlimited
+        """
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.breakers: Dict[str, CircuitBreaker] = {}  # Per-target circuits
+        self.proxy = proxy
+        self.target_proxies = dict(target_proxies or {})
+        self.dns_cache = dns_cache
+        self.tls_prober = tls_prober
+        self.h2_prober = h2_prober
+        if targets is not None:
+            self.TARGETS = list(targets)
+            self.SSH_TARGETS = []
+        self.session = session
+        self.api_token = api_token
+        self.rate_limits: Dict[str, Dict[str, Any]] = {}  # Latest rate-limit state per target
+        self.validators: Dict[str, Dict[str, str]] = {}  # ETag/Last-Modified per target
+        self.baseline = baseline
+        self.tcp_precheck = tcp_precheck
+        self.ssh_prober = ssh_prober
+        self.tracer = tracer
+        self.fast_verdict = fast_verdict
+        self.hedge = hedge
+        self.policy = policy if policy is not None else DEFAULT_POLICY
+        self.transport = transport
+        self.limiter = limiter
+        self.latencies: Dict[str, deque] = {}  # Recent successful latencies per target
+        self._latency_lock = threading.Lock()
+        self._probe_local = threading.local()  # _DetachableProbe of fast-verdict probe threads
+        self.listeners: List[ProbeListener] = []  # Probe event subscribers
+        if tracer is not None:
+            self.add_listener(tracer)
+
+    def add_listener(self, listener: ProbeListener) -> None:
+        """
+        Subscribe to probe start/end events of this checker
+
+        Args:
+            listener (ProbeListener): Subscriber called on the probing thread
+        """
+        self.listeners = self.listeners + [listener]  # Copy, probes may be iterating
+
+    def remove_listener(self, listener: ProbeListener) -> None:
+        """Unsubscribe a listener added with add_listener"""
+        self.listeners = [item for item in self.listeners if item is not listener]
+
+    def _span(self, name: str):
+        """Tracer span of a stage, or a no-op when tracing is disabled"""
+        return self.tracer.span(name) if self.tracer is not None else _NO_SPAN
+
+    def test(self, timeout: float = DEFAULT_TIMEOUT, warmup: int = 0) -> Dict[str, Any]:
+        """
+        Perform full test with multiple checks and calculate average
+
+        Args:
+            timeout (float): Request timeout in seconds
+            warmup (int): Checks run first and left out of the statistics,
+                so connections and DNS entries are set up beforehand
+
+        Returns:
+            Dict[str, Any]: Dictionary containing test results including:
+                - status (str): Overall status ("good", "warn", "bad")
+                - msg (str): Status message
+                - iterations (int): Number of iterations performed
+                - warmup (int): Number of warm-up checks left out
+                - avg_total_time (float): Average total time in milliseconds
+                - successful_checks (int): Number of successful checks
+                - target_stats (dict): Statistics for each target, with the
+                  cold and warm samples (see is_cold_sample) also apart
+                - all_results (list): All test results
+        """
+        for _ in range(warmup):
+            self.check(timeout=timeout)
+        return self._summarise([self.check(timeout=timeout) for _ in range(FULL_TEST_ITERATIONS)], warmup)
+
+    def _summarise(self, results: List[Dict[str, Any]], warmup: int = 0) -> Dict[str, Any]:
+        """
+        Aggregate the checks of a full test, see test()
+
+        Args:
+            results (List[Dict[str, Any]]): One check() result per iteration
+            warmup (int): Warm-up checks that ran before results
+
+        Returns:
+            Dict[str, Any]: Same structure as test()
+        """
+        all_results: List[Tuple[str, Dict[str, Any]]] = []
+        for result in results:
+            all_results.extend(result["results"])
+
+        # Calculate overall statistics
+        successful_checks = sum(1 for r in results if r["status"] != "bad")
+        total_time = sum(r["ms"] for r in results)
+        avg_time = total_time / len(results) if results else 0
+
+        # Calculate average response times for each target
+        names = [name for name, _ in self.TARGETS]
+        if self.ssh_prober is not None:
+            names += [name for name, _, _ in self.SSH_TARGETS]
+        tallies = {name: (_TargetTally(), _TargetTally(), _TargetTally()) for name in names}
+        for name, r in all_results:
+            if name in tallies:
+                tally, cold, warm = tallies[name]
+                # After a warm-up no sample is cold just for coming first
+                (cold if is_cold_sample(r, not tally.samples and not warmup) else warm).add(r)
+                tally.add(r)
+        target_stats: Dict[str, Dict[str, Any]] = {}
+        for name, (tally, cold, warm) in tallies.items():
+            if tally.samples:
+                target_stats[name] = stats = tally.stats()
+                for phase, phase_tally in (("cold", cold), ("warm", warm)):
+                    if phase_tally.samples:
+                        stats[phase] = dict(phase_tally.stats(), samples=phase_tally.samples)
+
+        with self._span("judge"):
+            overall_status = self._judge(all_results)
+        with self._span("msg"):
+            msg = self._msg(overall_status, all_results)
+
+        return {
+            "status": overall_status,
+            "msg": msg,
+            "iterations": len(results),
+            "warmup": warmup,
+            "avg_total_time": avg_time,
+            "successful_checks": successful_checks,
+            "target_stats": target_stats,
+            "results": all_results,
+            "all_results": all_results
+        }
+
+    def check(self, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Execute single detection
+
+        Args:
+            timeout (float): Request timeout in seconds, default is 8 seconds
+
+        Returns:
+            Dict[str, Any]: Dictionary containing detection status, total time,
+                  results and message
+        """
+        start = time.time()  # Record start time
+        results: List[Tuple[str, Dict[str, Any]]] = []  # Store detection results
+        fast = self.fast_verdict and self.h2_prober is None
+        status = None  # Set early by the fast verdict mode
+        abandoned: List[str] = []
+
+        # SSH banners are read in the background while the HTTPS targets run
+        ssh_pool = ssh_futures = None
+        if self.ssh_prober is not None and self.SSH_TARGETS and not fast:
+            ssh_pool = ThreadPoolExecutor(max_workers=len(self.SSH_TARGETS))
+            ssh_futures = [(name, ssh_pool.submit(self._probe_ssh, name, host, port, timeout))
+                           for name, host, port in self.SSH_TARGETS]
+
+        unreachable = self._tcp_precheck_failure(timeout)
+        if unreachable is not None:
+            results = unreachable  # Nothing answers, skip the HTTP probes
+        elif fast:
+            # Observes the baseline itself, before each verdict attempt
+            results, status, abandoned = self._check_fast(timeout)
+        elif self.h2_prober is not None:
+            results = self._check_h2(start, timeout)
+        else:
+            # Iterate through all targets for detection
+            for name, url in self.TARGETS:
+                elapsed = time.time() - start  # Calculate elapsed time
+                remain = max(MIN_REMAIN_TIMEOUT, timeout - elapsed)  # Remaining time
+
+                r = self._probe(name, url, remain)  # Execute single URL test
+                results.append((name, r))  # Add result to list
+
+                # If homepage detection fails, stop subsequent detection
+                if name == "homepage" and not r["ok"]:
+                    break
+
+        if ssh_futures is not None:
+            results = results + [(name, future.result()) for name, future in ssh_futures]
+            ssh_pool.shutdown()
+
+        total_ms = (time.time() - start) * 1000  # Total time in ms
+        if self.baseline is not None and not (fast and unreachable is None):
+            for name, r in results:
+                self.baseline.observe(name, r)
+        if status is None:
+            with self._span("judge"):
+                status = self._judge(results)  # Judge detection status
+        with self._span("msg"):
+            msg = self._msg(status, results)
+
+        check = {
+            "status": status,  # Detection status (good/warn/bad)
+            "ms": total_ms,  # Total time in milliseconds
+            "results": results,  # Detection results list
+            "msg": msg  # Status message
+        }
+        if abandoned:
+            check["abandoned"] = abandoned  # Targets still running at the verdict
+        return check
+
+    def _check_fast(self, timeout: float) -> Tuple[List[Tuple[str, Dict[str, Any]]], str, List[str]]:
+        """
+        Probe every target concurrently and stop at the first certain verdict
+
+        After each result, _judge is evaluated with the unfinished targets
+        assumed to all succeed instantly, to all succeed slowly and to all
+        fail. When these agree, no outcome of the remaining probes can change the status.
+        A failed homepage decides the check at once, as in the sequential
+        mode. Results are fed to the latency baseline as they arrive, so its
+        anomaly flags count towards the verdict. Probes run on daemon
+        threads, so abandoned ones never delay the process exit; they are
+        detached (see _DetachableProbe), so they neither update breakers,
+        rate limits, validators or latencies nor notify listeners, and
+        their limiter slots are freed for the next check.
+
+        Args:
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            Tuple: Finished results in target order, the status (None if it
+                  has to be judged from the results) and abandoned target names
+        """
+        jobs = [(name, self._probe, (name, url, timeout)) for name, url in self.TARGETS]
+        if self.ssh_prober is not None:
+            jobs += [(name, self._probe_ssh, (name, host, port, timeout))
+                     for name, host, port in self.SSH_TARGETS]
+        done: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        handles = {name: _DetachableProbe() for name, _, _ in jobs}
+
+        def run(name: str, probe: Any, probe_args: Tuple) -> None:
+            self._probe_local.handle = handles[name]
+            done.put((name, probe(*probe_args)))
+
+        for name, probe, probe_args in jobs:
+            threading.Thread(target=run, args=(name, probe, probe_args), daemon=True).start()
+
+        finished: Dict[str, Dict[str, Any]] = {}
+        status = None
+        timed_out = False
+        deadline = time.time() + timeout + MIN_REMAIN_TIMEOUT  # Probes enforce their own timeout
+        while len(finished) < len(jobs):
+            try:
+                name, r = done.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                timed_out = True
+                break
+            finished[name] = r
+            if self.baseline is not None:
+                self.baseline.observe(name, r)
+            if name == "homepage" and not r.get("ok"):
+                break  # Same short-circuit as the sequential check
+            status = self._certain_status(list(finished.items()),
+                                          [name for name, _, _ in jobs if name not in finished])
+            if status is not None:
+                break
+
+        for name, handle in handles.items():
+            if name not in finished:
+                handle.detach()  # Abandoned or overdue: must not touch later checks
+        if timed_out:
+            # The unfinished probes overran their own timeout, count them as timeouts
+            return [(name, finished.get(name) or _timeout_result()) for name, _, _ in jobs], None, []
+        results = [(name, finished[name]) for name, _, _ in jobs if name in finished]
+        return results, status, [name for name, _, _ in jobs if name not in finished]
+
+    def _certain_status(self, finished: List[Tuple[str, Dict[str, Any]]], remaining: List[str]) -> str:
+        """
+        Status that holds whatever the remaining probes return, or None
+
+        The remaining targets are assumed to succeed instantly, to succeed
+        arbitrarily slowly (for latency rules) and to fail.
+        """
+        if not remaining:
+            return self._judge(finished)
+        best = self._judge(finished + [(name, {"ok": True, "ms": 0}) for name in remaining])
+        slow = self._judge(finished + [(name, {"ok": True, "ms": math.inf}) for name in remaining])
+        worst = self._judge(finished + [(name, _timeout_result()) for name in remaining])
+        return best if best == slow == worst else None
+
+    def check_tcp(self, timeout: float = TCP_PROBE_TIMEOUT,
+                  prober: TcpProber = None) -> Dict[str, Any]:
+        """
+        Execute a connect-only detection of every target and SSH endpoint
+
+        Args:
+            timeout (float): Seconds to wait for the handshakes
+            prober (TcpProber): Prober to use, defaults to a TcpProber
+
+        Returns:
+            Dict[str, Any]: Same structure as check(), one result per
+                  endpoint carrying the TcpProber fields
+        """
+        start = time.time()
+        endpoints = self._tcp_endpoints() + [(name, host, port) for name, host, port in self.SSH_TARGETS]
+        probed = self._probe_endpoints(prober or TcpProber(), endpoints, timeout)
+        results = [(name, r) for (name, _, _), r in zip(endpoints, probed)]
+        status = self._judge(results)
+        return {
+            "status": status,
+            "ms": (time.time() - start) * 1000,
+            "results": results,
+            "msg": self._msg(status, results)
+        }
+
+    def _probe_endpoints(self, prober: TcpProber, endpoints: List[Tuple[str, str, int]],
+                         timeout: float) -> List[Dict[str, Any]]:
+        """
+        TcpProber.probe_many over (name, host, port) endpoints
+
+        With a limiter every endpoint is probed in a slot of its own, so
+        the endpoints run as concurrently as the limits allow.
+        """
+        if self.limiter is None:
+            return prober.probe_many([(host, port) for _, host, port in endpoints], timeout)
+
+        def probe(endpoint: Tuple[str, str, int]) -> Dict[str, Any]:
+            _, host, port = endpoint
+            with self.limiter.slot(host) as slot:
+                r = prober.probe_many([(host, port)], timeout)[0]
+            r["queue_ms"] = slot["queue_ms"]
+            return r
+
+        with ThreadPoolExecutor(max_workers=len(endpoints) or 1) as pool:
+            return list(pool.map(probe, endpoints))
+
+    def _tcp_endpoints(self) -> List[Tuple[str, str, int]]:
+        """(name, host, port) of every HTTP target"""
+        endpoints = []
+        for name, url in self.TARGETS:
+            parts = urlsplit(url)
+            endpoints.append((name, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)))
+        return endpoints
+
+    def _tcp_precheck_failure(self, timeout: float) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the TCP pre-check, returning its results if no target could be
+        reached and None otherwise (or when the pre-check is disabled)
+
+        Proxied checks are not pre-checked, the proxy may be the only route.
+        """
+        if self.tcp_precheck is None or self.target_proxies or self.proxy not in (None, DIRECT_ROUTE):
+            return None
+        if self.proxy is None and any(requests.utils.get_environ_proxies(url) for _, url in self.TARGETS):
+            return None
+        endpoints = self._tcp_endpoints()
+        probed = self._probe_endpoints(self.tcp_precheck, endpoints, min(timeout, TCP_PROBE_TIMEOUT))
+        if any(r["ok"] for r in probed):
+            return None
+        return [(name, r) for (name, _, _), r in zip(endpoints, probed)]
+
+    def _check_h2(self, start: float, timeout: float) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Probe targets origin by origin, one multiplexed HTTP/2 connection each
+
+        Args:
+            start (float): Start time of the check (time.time())
+            timeout (float): Overall timeout of the check in seconds
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: Results grouped by origin, in
+                  order of each origin's first target
+        """
+        origins: Dict[str, List[Tuple[str, str]]] = {}
+        for name, url in self.TARGETS:
+            parts = urlsplit(url)
+            origins.setdefault(f"{parts.scheme}://{parts.netloc}", []).append((name, url))
+
+        results: List[Tuple[str, Dict[str, Any]]] = []
+        for group in origins.values():
+            remain = max(MIN_REMAIN_TIMEOUT, timeout - (time.time() - start))
+            by_name: Dict[str, Dict[str, Any]] = {}
+            streams: List[Tuple[str, str]] = []
+            for name, url in group:
+                if self.target_proxies.get(name, self.proxy) not in (None, DIRECT_ROUTE):
+                    by_name[name] = self._probe(name, url, remain)  # No proxy support in h2
+                    continue
+                self._notify_started(name, url)
+                blocked = self._circuit_open_result(name)
+                if blocked is not None:
+                    by_name[name] = self._notify_finished(name, blocked)
+                else:
+                    streams.append((name, url))
+
+            if streams:
+                # One connection per origin, so one limiter slot
+                with self._limited(urlsplit(group[0][1]).hostname) as slot, self._dns_scope() as dns:
+                    fetched = self.h2_prober.fetch([url for _, url in streams], remain)
+                    slot["bytes"] = sum(r.pop("bytes", 0) for r in fetched)
+                for (name, _), r in zip(streams, fetched):
+                    if self.limiter is not None:
+                        r["queue_ms"] = slot["queue_ms"]
+                    r = self._finish_probe(name, r, self.target_proxies.get(name, self.proxy), dns)
+                    by_name[name] = self._notify_finished(name, r)
+
+            results.extend((name, by_name[name]) for name, _ in group)
+            # If homepage detection fails, stop subsequent detection
+            if "homepage" in by_name and not by_name["homepage"]["ok"]:
+                break
+        return results
+
+    def _breaker(self, name: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker of a target, or None if breakers are disabled
+        """
+        if self.breaker_threshold <= 0:
+            return None
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(
+                failure_threshold=self.breaker_threshold,
+                cooldown=self.breaker_cooldown)
+        return breaker
+
+    def _notify_started(self, name: str, url: str) -> None:
+        """Tell the listeners a probe is starting"""
+        for listener in self.listeners:
+            listener.probe_started(name, url)
+
+    def _notify_finished(self, name: str, r: Dict[str, Any]) -> Dict[str, Any]:
+        """Tell the listeners a probe has finished, returning its result"""
+        if self._detached():
+            return r  # Abandoned by a fast verdict, its check has been reported
+        for listener in self.listeners:
+            listener.probe_finished(name, r)
+        return r
+
+    def _probe(self, name: str, url: str, timeout: float) -> Dict[str, Any]:
+        """
+        Probe a named target, honouring its circuit breaker
+
+        Args:
+            name (str): Target name
+            url (str): URL to test
+            timeout (float): Request timeout in seconds
+
+        Returns:
+            Dict[str, Any]: Result of _test, or an immediate failure result if
+                  the target's circuit is open
+        """
+        self._notify_started(name, url)
+        return self._notify_finished(name, self._probe_target(name, url, timeout))
+
+    def _probe_ssh(self, name: str, host: str, port: int, timeout: float) -> Dict[str, Any]:
+        """Read the banner of an SSH target, notifying the listeners"""
+        self._notify_started(name, f"ssh://{host}:{port}")
+        with self._limited(host) as slot:
+            if slot is None:
+                return self._drop_detached(name)
+            r = self.ssh_prober.probe(host, port, timeout)
+        if self.limiter is not None:
+            r["queue_ms"] = slot["queue_ms"]
+        return self._notify_finished(name, r)
+
+    @contextmanager
+    def _limited(self, host: str) -> Iterator[Dict[str, Any]]:
+        """Slot of the shared ResourceLimiter, a free one without limiter, None if detached"""
+        if self.limiter is None:
+            yield None if self._detached() else {}
+            return
+        handle = getattr(self._probe_local, "handle", None)
+        if handle is None:
+            with self.limiter.slot(host) as slot:
+                yield slot
+            return
+        slot = self.limiter.acquire(host)
+        if not handle.hold(self.limiter, host, slot):
+            yield None  # Detached while queued: do not probe outside the budget
+            return
+        try:
+            yield slot
+        finally:
+            handle.give_back()
+
+    def _detached(self) -> bool:
+        """Whether the calling probe thread was abandoned by a fast verdict"""
+        handle = getattr(self._probe_local, "handle", None)
+        return handle is not None and handle.detached
+
+    def _drop_detached(self, name: str) -> Dict[str, Any]:
+        """Result of a detached probe, giving back a half-open breaker trial it will not record"""
+        breaker = self._breaker(name)
+        if breaker is not None:
+            breaker.cancel()
+        return dict(_timeout_result(), error="Abandoned after the verdict")
+
+    def _probe_target(self, name: str, url: str, timeout: float) -> Dict[str, Any]:
+        """Body of _probe, without listener notifications"""
+        # Deferral first: the breaker's half-open trial must be followed by a probe
+        deferred = self._rate_limit_deferral(name)
+        if deferred is not None:
+            return deferred
+        blocked = self._circuit_open_result(name)
+        if blocked is not None:
+            return blocked
+
+        proxy = self.target_proxies.get(name, self.proxy)
+        # Revalidate the last response instead of downloading it again
+        headers = {VALIDATOR_HEADERS[key]: value
+                   for key, value in self.validators.get(name, {}).items()}
+        if self.api_token and name in RATE_LIMIT_TARGETS:
+            headers["Authorization"] = f"Bearer {self.api_token}"
+        with self._limited(urlsplit(url).hostname) as slot:
+            if slot is None:
+                return self._drop_detached(name)
+            if self.transport is not None:
+                r, dns = self.transport.exchange(
+                    name, url, timeout, lambda: self._exchange(name, url, timeout, proxy, headers))
+            else:
+                r, dns = self._exchange(name, url, timeout, proxy, headers)
+            if self._detached():
+                return self._drop_detached(name)
+            with self._dns_scope():
+                self._probe_tls(url, proxy, timeout, r)
+            slot["bytes"] = r.pop("bytes", 0)
+        if self.limiter is not None:
+            r["queue_ms"] = slot["queue_ms"]
+        validators = r.pop("validators", None)
+        if validators:
+            self.validators[name] = validators
+        if "rate_limit" in r:
+            self.rate_limits[name] = dict(r["rate_limit"], probed_at=time.time(), result=r)
+        return self._finish_probe(name, r, proxy, dns)
+
+    def _exchange(self, name: str, url: str, timeout: float, proxy: str,
+                  headers: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        The HTTP exchange of a probe: one request, or a hedged pair
+
+        Returns:
+            Tuple: Result of _test and the DNS statistics of the exchange
+        """
+        if self.hedge:
+            return self._hedged_test(name, url, timeout, proxy_settings(proxy), headers)
+        with self._dns_scope() as dns:
+            r = self._test(url, timeout, proxies=proxy_settings(proxy), headers=headers)
+        return r, dns
+
+    def _hedge_delay(self, name: str) -> float:
+        """Hedge delay of a target in milliseconds: its recent p95 latency"""
+        with self._latency_lock:
+            history = sorted(self.latencies.get(name, ()))
+        if len(history) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY_MS
+        return max(HEDGE_MIN_DELAY_MS, _percentile(history, HEDGE_PERCENTILE))
+
+    def _hedged_test(self, name: str, url: str, timeout: float, proxies: Dict[str, str],
+                     headers: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run _test, hedged by a second attempt if the first is slow
+
+        The first attempt runs on a daemon thread. If it has not answered
+        within the hedge delay, a second attempt starts, resolving the host
+        to its next address, in a limiter slot of its own (no hedge if none
+        is free at once). The first successful reply wins (or the last
+        failure if neither succeeds). When the hedge fired, both attempts
+        are recorded under "hedge" and ms is the time from the first
+        attempt's start to the winning reply.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: Winning result and the DNS
+                  statistics of its attempt
+        """
+        delay = self._hedge_delay(name)
+        replies: "queue.Queue[Tuple[int, Dict[str, Any], Dict[str, Any], float]]" = queue.Queue()
+        t0 = time.perf_counter()
+
+        host = urlsplit(url).hostname
+
+        def attempt(index: int, slot: Dict[str, Any] = None) -> None:
+            with self._dns_scope() as dns:
+                if index == 0:
+                    r = self._test(url, timeout, proxies=proxies, headers=headers)
+                else:
+                    with _AlternateAddresses(self.dns_cache).active():
+                        r = self._test(url, timeout, proxies=proxies, headers=headers)
+            if slot is not None:  # The hedge's own limiter slot, the probe holds the first one
+                slot["bytes"] = r.pop("bytes", 0)
+                self.limiter.release(host, slot)
+            replies.put((index, r, dns, time.perf_counter()))
+
+        threading.Thread(target=attempt, args=(0,), daemon=True).start()
+        try:
+            first = replies.get(timeout=delay / 1000)
+        except queue.Empty:
+            first = None
+        slot = None
+        if first is None and self.limiter is not None:
+            # The second connection takes a slot of its own; without a free one there is no hedge
+            slot = self.limiter.acquire(host, blocking=False)
+            if slot is None:
+                try:
+                    first = replies.get(timeout=timeout + MIN_REMAIN_TIMEOUT)
+                except queue.Empty:
+                    return _timeout_result(), None
+        if first is None:
+            threading.Thread(target=attempt, args=(1, slot), daemon=True).start()
+            hedge_start = time.perf_counter()
+            attempts = []
+            deadline = time.perf_counter() + timeout + MIN_REMAIN_TIMEOUT
+            while len(attempts) < 2:
+                try:
+                    attempts.append(replies.get(timeout=max(0.0, deadline - time.perf_counter())))
+                except queue.Empty:
+                    break
+                if attempts[-1][1].get("ok"):
+                    break
+
+        if first is not None:  # Answered before the hedge delay, or not hedged
+            r, dns = first[1], first[2]
+        elif not attempts:
+            return _timeout_result(), None
+        else:
+            index, r, dns, finished = attempts[-1]
+            r = dict(r, ms=round((finished - t0) * 1000))
+            by_index = {item[0]: item for item in attempts}
+            r["hedge"] = {
+                "delay_ms": round(delay, 1),
+                "winner": index,
+                "attempts": [
+                    {"pending": True} if i not in by_index else {
+                        "ok": by_index[i][1].get("ok"),
+                        "ms": by_index[i][1].get("ms"),
+                        "status_code": by_index[i][1].get("status_code"),
+                        "error_type": by_index[i][1].get("error_type"),
+                        "alternate_address": i == 1,
+                        "started_ms": round(((t0 if i == 0 else hedge_start) - t0) * 1000, 1)
+                    } for i in (0, 1)
+                ]
+            }
+        if r.get("ok") and "ms" in r and not self._detached():
+            with self._latency_lock:
+                self.latencies.setdefault(name, deque(maxlen=HEDGE_HISTORY_SIZE)).append(r["ms"])
+        return r, dns
+
+    def _rate_limit_deferral(self, name: str) -> Dict[str, Any]:
+        """
+        Result to use instead of probing a target whose rate-limit budget
+        would otherwise run out, or None if the target may be probed
+
+        The remaining requests of the current window are spread evenly until
+        the window resets. Between those slots the previous result is reused
+        (marked "deferred"); an exhausted budget yields a rate_limited result
+        without sending a request.
+        """
+        info = self.rate_limits.get(name)
+        if not info or info["remaining"] is None or info["reset"] is None:
+            return None
+        now = time.time()
+        if now >= info["reset"]:
+            return None  # A new window has started
+        if info["remaining"] <= 0:
+            return {
+                "ok": False,
+                "error": "API rate limit exhausted",
+                "error_type": "rate_limited",
+                "suggestion": (f"Rate limit resets in {info['reset'] - now:.0f}s, "
+                               f"set {TOKEN_ENV_VARS[0]} for a higher limit"),
+                "rate_limit": {k: info[k] for k in ("limit", "remaining", "used", "reset", "resource")},
+                "deferred": True
+            }
+        if now - info["probed_at"] < (info["reset"] - now) / info["remaining"]:
+            return dict(info["result"], deferred=True)
+        return None
+
+    def _circuit_open_result(self, name: str) -> Dict[str, Any]:
+        """
+        Immediate failure result if the target's circuit is open, else None
+        """
+        breaker = self._breaker(name)
+        if breaker is None or breaker.allow():
+            return None
+        return {
+            "ok": False,
+            "error": "Circuit open - target known down",
+            "error_type": "circuit_open",
+            "suggestion": (f"Target failed repeatedly, next retry in "
+                           f"{breaker.remaining():.0f}s"),
+            "circuit": breaker.state
+        }
+
+    @contextmanager
+    def _dns_scope(self):
+        """
+        Resolve through the shared DNS cache and collect lookup cost
+
+        Yields:
+            Dict[str, Any]: Lookup statistics of the scope, None without cache
+        """
+        if self.dns_cache is None:
+            yield None
+            return
+        _dns_local.stats = stats = {"lookups": 0, "dns_ms": 0.0, "dns_cached": True}
+        try:
+            with self.dns_cache.active():
+                yield stats
+        finally:
+            _dns_local.stats = None
+
+    def _finish_probe(self, name: str, r: Dict[str, Any], proxy: str = None,
+                      dns: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Attach route and DNS details to a result and feed its circuit breaker
+        """
+        if dns and dns["lookups"]:
+            r["dns_ms"] = round(dns["dns_ms"], 1)
+            r["dns_cached"] = dns["dns_cached"]
+        if proxy is not None:
+            r["proxy"] = proxy_label(proxy)
+        breaker = self._breaker(name)
+        if breaker is not None:
+            breaker.record(is_reachable(r))
+            r["circuit"] = breaker.state
+        return r
+
+    def _probe_tls(self, url: str, proxy: str, timeout: float, r: Dict[str, Any]) -> None:
+        """
+        Add TLS handshake fields to a result if TLS probing is enabled
+
+        Only direct HTTPS targets of reachable hosts are probed, a proxied
+        handshake would measure the tunnel rather than the target.
+        """
+        parts = urlsplit(url)
+        if (self.tls_prober is None or parts.scheme != "https"
+                or proxy not in (None, DIRECT_ROUTE) or "status_code" not in r):
+            return
+        r.update(self.tls_prober.probe(parts.hostname, parts.port or 443, timeout))
+
+    def _test(self, url: str, timeout: float, proxies: Dict[str, str] = None,
+              headers: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Test accessibility of a single URL
+
+        Args:
+            url (str): URL to test
+            timeout (float): Request timeout in seconds
+            proxies (Dict[str, str]): Explicit requests proxy mapping, None to
+                inherit the environment
+            headers (Dict[str, str]): Extra request headers
+
+        Returns:
+            Dict[str, Any]: Dictionary containing test results, including success status,
+                  response time, status code or error message
+        """
+        try:
+            t0 = time.time()  # Record request start time
+            kwargs: Dict[str, Any] = {}
+            if proxies is not None:
+                kwargs["proxies"] = proxies
+            get = self.session.get if self.session is not None else requests.get
+            opened = opened_connections()
+            # Send GET request to specified URL, set timeout and user agent
+            resp = get(url, timeout=timeout, headers=dict({
+                "User-Agent": "GitHubChecker/1.0"
+            }, **(headers or {})), **kwargs)
+            # Return success result: status code 200, or 304 for a
+            # conditional request whose cached copy is still valid
+            result = {
+                "ok": resp.status_code in SUCCESS_STATUS_CODES,  # Whether successful
+                "ms": round((time.time() - t0) * 1000),  # Response time
+                "status_code": resp.status_code  # HTTP status code
+            }
+            if resp.status_code == 304:
+                result["not_modified"] = True
+            content = getattr(resp, "content", None)
+            if isinstance(content, bytes):
+                result["bytes"] = len(content)  # Charged to the limiter by _probe
+            adapter = getattr(resp, "connection", None)  # Set by the adapter that sent it
+            if isinstance(adapter, ConnectionTrackingAdapter):
+                result["connection"] = "new" if opened_connections() > opened else "reused"
+            elif self.session is None and isinstance(adapter, requests.adapters.HTTPAdapter):
+                result["connection"] = "new"  # requests.get opens a fresh pool per call
+            resp_headers = getattr(resp, "headers", None)
+            if isinstance(resp_headers, Mapping) and resp.status_code in SUCCESS_STATUS_CODES:
+                validators = {key: resp_headers[key] for key in VALIDATOR_HEADERS
+                              if resp_headers.get(key)}
+                if validators:
+                    result["validators"] = validators  # Consumed by _probe
+            rate_limit = parse_rate_limit(resp_headers)
+            if rate_limit is not None:
+                result["rate_limit"] = rate_limit
+                # An exhausted budget is the API refusing us, not a network failure
+                if resp.status_code in RATE_LIMIT_STATUS_CODES and rate_limit["remaining"] == 0:
+                    result.update({
+                        "error": "API rate limit exceeded",
+                        "error_type": "rate_limited",
+                        "suggestion": f"Wait for the limit to reset or set {TOKEN_ENV_VARS[0]}"
+                    })
+            return result
+        except requests.exceptions.Timeout:
+            # Request timeout exception
+            return {
+                "ok": False,
+                "error": "Request timed out",
+                "error_type": "timeout",
+                "suggestion": "Network is slow or server is not responding"
+            }
+        except requests.exceptions.ConnectionError as e:
+            # Connection error exception
+            return {
+                "ok": False,
+                "error": "Connection error - check network",
+                "error_type": "connection",
+                "suggestion": "Please verify your network connection",
+                "details": str(e)
+            }
+        except requests.exceptions.HTTPError as e:
+            # HTTP error exception
+            return {
+                "ok": False,
+                "error": f"HTTP error: {str(e)}",
+                "error_type": "http",
+                "suggestion": "Server returned an invalid HTTP response"
+            }
+        except requests.exceptions.TooManyRedirects:
+            # Too many redirects exception
+            return {
+                "ok": False,
+                "error": "Too many redirects",
+                "error_type": "redirect",
+                "suggestion": "URL is redirecting too many times"
+            }
+        except requests.exceptions.RequestException as e:
+            # Other request exceptions
+            return {
+                "ok": False,
+                "error": f"Request error: {str(e)}",
+                "error_type": "request",
+                "suggestion": "Request failed, please try again"
+            }
+        except Exception as e:
+            # Other unexpected exceptions
+            return {
+                "ok": False,
+                "error": f"Unexpected error: {str(e)}",
+                "error_type": "unknown",
+                "suggestion": "An unexpected error occurred"
+            }
+
+    def _judge(self, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Judge network status based on detection results
+
+        Args:
+            results (List[Tuple[str, Dict[str, Any]]]): Detection results list
+
+        Returns:
+            str: Network status ("good", "warn", or "bad") under the
+                 checker's policy; with the default policy:
+                 - "good": All targets succeed and avg response < 3 seconds
+                 - "warn": Partial success or avg response >= 3 seconds
+                 - "bad": All targets fail
+        """
+        return self.policy.evaluate(results)
+
+    def _msg(self, status: str, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Generate user-friendly status message based on detection results
+
+        Args:
+            status (str): Network status ("good", "warn", or "bad")
+            results (List[Tuple[str, Dict[str, Any]]]): Detection results list
+
+        Returns:
+            str: Formatted status message (without status prefix)
+        """
+        if status == "good":
+            successful_results = [r for _, r in results if "ms" in r]
+            if successful_results:
+                avg_time = sum(r["ms"] for _, r in results
+                               if "ms" in r) / len(successful_results)
+                return f"GitHub is accessible (avg {avg_time:.0f}ms)"
+            else:
+                return "GitHub is accessible"
+        elif status == "warn":
+            failed_targets = [name for name, r in results if not is_reachable(r)]
+            limited = [name for name, r in results if r.get("error_type") == "rate_limited"]
+            if failed_targets:
+                return (f"GitHub is unstable "
+                        f"({', '.join(failed_targets)} affected)")
+            elif limited:
+                return (f"GitHub is accessible "
+                        f"({', '.join(limited)} rate limited)")
+            elif any(r.get("anomaly") for _, r in results):
+                degraded = sorted({name for name, r in results if r.get("anomaly")})
+                return (f"GitHub latency is degraded "
+                        f"({', '.join(degraded)} above baseline)")
+            elif any(r.get("loss_pct") for _, r in results):
+                lossy = [f"{name} {r['loss_pct']:g}%" for name, r in results if r.get("loss_pct")]
+                return (f"GitHub has packet loss "
+                        f"({', '.join(lossy)} lost)")
+            else:
+                successful_results = [r for _, r in results if "ms" in r]
+                if successful_results:
+                    avg_time = sum(r["ms"] for _, r in results
+                                   if "ms" in r) / len(successful_results)
+                    return (f"GitHub is accessible but slow "
+                            f"(avg {avg_time:.0f}ms)")
+                else:
+                    return "GitHub is accessible but slow"
+        elif status == "bad":
+            failed_targets = [name for name, r in results if not is_reachable(r)]
+            if failed_targets or not results:
+                return (f"Cannot connect to GitHub "
+                        f"({', '.join(failed_targets)})")
+            # Everything answered: a latency rule of the policy failed the check
+            breaches = self.policy.latency_breaches(results, "bad")
+            if breaches:
+                return f"GitHub is too slow to use ({'; '.join(breaches)})"
+            return "GitHub is too slow to use"
+        else:
+            return "Unknown status"
+
+
+def proxy_settings(proxy: str) -> Dict[str, str]:
+    """
+    Build the requests proxy mapping for a configured proxy
+
+    Args:
+        proxy (str): Proxy URL (http://, https://, socks5://, socks5h://),
+            "direct" for no proxy, or None to inherit the environment
+
+    Returns:
+        Dict[str, str]: Proxy mapping for requests, or None to let requests
+              pick proxies from the environment
+    """
+    if proxy is None:
+        return None
+    if proxy == DIRECT_ROUTE:
+        # None values override environment proxies and are then dropped
+        return {"http": None, "https": None}
+    return {"http": proxy, "https": proxy}
+
+
+def proxy_label(proxy: str) -> str:
+    """
+    Display label for a proxy URL with any credentials masked
+
+    Args:
+        proxy (str): Proxy URL or "direct"
+
+    Returns:
+        str: Proxy URL safe for printing
+    """
+    parts = urlsplit(proxy)
+    if parts.username is None and parts.password is None:
+        return proxy
+    host = parts.hostname or ""
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    return f"{parts.scheme}://***@{host}"
+
+
+def compare_routes(proxies: List[str], timeout: float = DEFAULT_TIMEOUT,
+                   iterations: int = 1, limiter: ResourceLimiter = None) -> List[Dict[str, Any]]:
+    """
+    Probe all targets directly and through each proxy concurrently
+
+    Args:
+        proxies (List[str]): Proxy URLs to compare against the direct route
+        timeout (float): Request timeout in seconds
+        iterations (int): Number of checks per route
+        limiter (ResourceLimiter): Budget shared by the probes of all
+            routes; None is unlimited
+
+    Returns:
+        List[Dict[str, Any]]: One entry per route, ranked best first by
+              success rate and then average latency. Each entry contains:
+                - route (str): Masked proxy URL or "direct"
+                - status (str): Status of the route's combined results
+                - success_rate (float): Successful probes in percent
+                - avg_ms (float): Average latency of successful probes
+                - targets (dict): Per-target success rate and latency
+    """
+    routes = [DIRECT_ROUTE] + [p for p in proxies if p != DIRECT_ROUTE]
+
+    def run(route: str) -> Dict[str, Any]:
+        chk = Checker(proxy=route, limiter=limiter)
+        results: List[Tuple[str, Dict[str, Any]]] = []
+        for _ in range(iterations):
+            results.extend(chk.check(timeout=timeout)["results"])
+
+        ok_ms = [r["ms"] for _, r in results if r.get("ok") and "ms" in r]
+        targets: Dict[str, Dict[str, Any]] = {}
+        for name, _ in Checker.TARGETS:
+            target_results = [r for n, r in results if n == name]
+            target_ms = [r["ms"] for r in target_results if r.get("ok") and "ms" in r]
+            targets[name] = {
+                "success_rate": (len(target_ms) / len(target_results) * 100
+                                 if target_results else 0.0),
+                "avg_ms": sum(target_ms) / len(target_ms) if target_ms else None
+            }
+        return {
+            "route": proxy_label(route),
+            "status": chk._judge(results),
+            "success_rate": len(ok_ms) / len(results) * 100 if results else 0.0,
+            "avg_ms": sum(ok_ms) / len(ok_ms) if ok_ms else None,
+            "targets": targets
+        }
+
+    with ThreadPoolExecutor(max_workers=len(routes)) as pool:
+        ranked = list(pool.map(run, routes))
+
+    ranked.sort(key=lambda e: (-e["success_rate"],
+                               e["avg_ms"] if e["avg_ms"] is not None else float("inf")))
+    return ranked
+
+
+def spinning_cursor() -> Iterator[str]:
+    """
+    Generator that yields spinning cursor animation
+
+    Yields:
+        str: Spinning cursor characters
+    """
+    while True:
+        for cursor in SPINNER_CHARS:  # Spinner character sequence
+            yield cursor  # Generate next cursor character
+
+
+def format_fun_status(status: str, avg_ms: float = None, too_slow: bool = False) -> str:
+    """
+    Format status message with fun descriptions
+
+    Args:
+        status (str): Status type ("good", "warn", "bad")
+        avg_ms (float): Average response time in milliseconds
+        too_slow (bool): Whether a "bad" status comes from a latency rule
+            while every target answered
+
+    Returns:
+        str: Fun status description
+    """
+    if status == "good":
+        if avg_ms and avg_ms < 500:
+            return "GitHub is super fast! Everything is blazing!"
+        elif avg_ms and avg_ms < 1000:
+            return "GitHub is happy and responsive!"
+        else:
+            return "GitHub is accessible and working normally!"
+    elif status == "warn":
+        if avg_ms and avg_ms > 3000:
+            return "GitHub seems to be taking a nap... zzz"
+        else:
+            return "GitHub is a bit slow today..."
+    elif too_slow:
+        return "GitHub is crawling far too slowly to use"
+    else:
+        return "GitHub appears to be unreachable at the moment"
+
+
+# Pre-built pieces of the human-readable reports
+_RULE = "\n" + "=" * 50  # Section separator preceded by a blank line
+_SUGGESTIONS_GOOD = (
+    f"  {colorize('Network is stable.', Colors.GREEN)}",
+    f"  {colorize('You can push code normally.', Colors.GREEN)}",
+)
+_SUGGESTIONS_SLOW = (
+    f"  {colorize('Network is slow but accessible.', Colors.YELLOW)}",
+    f"  {colorize('Consider waiting for better connectivity.', Colors.YELLOW)}",
+)
+_SUGGESTIONS_BAD = (
+    f"  {colorize('Network connection failed.', Colors.RED)}",
+    f"  {colorize('Check your network settings.', Colors.RED)}",
+)
+_SUGGESTIONS_TOO_SLOW = (
+    f"  {colorize('Network is reachable but too slow to use.', Colors.RED)}",
+    f"  {colorize('Check your bandwidth, proxy or VPN.', Colors.RED)}",
+)
+_UNSTABLE_HEAD = f"  {colorize('Network is unstable.', Colors.YELLOW)}"
+_UNSTABLE_TAIL = f"  {colorize('Try again later.', Colors.YELLOW)}"
+
+
+def failed_targets(r: Dict[str, Any]) -> List[str]:
+    """
+    Names of the failed targets of a check or full test result
+
+    Args:
+        r (Dict[str, Any]): Result of Checker.check or Checker.test
+
+    Returns:
+        List[str]: Failed target names in result order
+    """
+    return [name for name, result in r.get("results", []) if not is_reachable(result)]
+
+
+def too_slow(r: Dict[str, Any]) -> bool:
+    """
+    Whether a "bad" check or full test failed on latency alone
+
+    Args:
+        r (Dict[str, Any]): Result of Checker.check or Checker.test
+
+    Returns:
+        bool: True if every target answered, so a latency rule of the
+              judgement policy gave the status
+    """
+    return r["status"] == "bad" and bool(r.get("results")) and not failed_targets(r)
+
+
+def json_report(r: Dict[str, Any], is_full_test: bool, timestamp: str) -> Dict[str, Any]:
+    """
+    Build the JSON document describing a check or full test
+
+    Args:
+        r (Dict[str, Any]): Result of Checker.check or Checker.test
+        is_full_test (bool): Whether r comes from Checker.test
+        timestamp (str): Report timestamp
+
+    Returns:
+        Dict[str, Any]: JSON-serialisable report including a suggestion
+    """
+    report = {
+        "version": "v1.1.0",
+        "timestamp": timestamp,
+        "status": r["status"],
+        "message": r["msg"],
+        "is_full_test": is_full_test
+    }
+    report.update(json_result_fields(r, is_full_test))
+
+    # Generate suggestion based on status
+    if r["status"] == "good":
+        report["suggestion"] = "Network is stable, you can push code normally."
+    elif r["status"] == "warn":
+        failed = failed_targets(r)
+        if failed:
+            report["suggestion"] = f"Network is unstable for {', '.join(failed)}. Try again later."
+        else:
+            report["suggestion"] = "Network is slow but accessible."
+    elif too_slow(r):
+        report["suggestion"] = "Network is reachable but too slow to use."
+    else:
+        report["suggestion"] = "Network connection failed."
+    return report
+
+
+class Renderer:
+    """Base class of output renderers
+
+    A renderer turns the result of Checker.check or Checker.test into the
+    complete report text. The report is built in one buffer and written with
+    a single call instead of one print per line.
+    """
+
+    name = ""
+    machine_readable = False  # True for formats parsed by other programs
+
+    def render(self, r: Dict[str, Any], is_full_test: bool, timestamp: str = None) -> str:
+        """
+        Render a report
+
+        Args:
+            r (Dict[str, Any]): Result of Checker.check or Checker.test
+            is_full_test (bool): Whether r comes from Checker.test
+            timestamp (str): Report timestamp, defaults to the current time
+
+        Returns:
+            str: Complete report text, ending with a newline
+        """
+        raise NotImplementedError
+
+    def write(self, r: Dict[str, Any], is_full_test: bool, stream=None) -> None:
+        """
+        Render a report and write it to stream (stdout by default) at once
+        """
+        stream = stream or sys.stdout
+        stream.write(self.render(r, is_full_test))
+        stream.flush()
+
+
+class DefaultRenderer(Renderer):
+    """Rich, colored, screenshot-friendly report"""
+
+    name = "default"
+
+    def render(self, r: Dict[str, Any], is_full_test: bool, timestamp: str = None) -> str:
+        timestamp = timestamp or time.strftime("%Y-%m-%d %H:%M:%S")
+        out = ["\nResults:", "-" * 40]
+
+        if is_full_test:
+            out.append(f"Full test completed ({r['iterations']} iterations)")
+            out.append(f"Successful checks: {r['successful_checks']}/{r['iterations']}")
+            out.append(f"Average total time: {r['avg_total_time']:.0f}ms")
+            out.append("\nTarget statistics:")
+            for name, stats in r["target_stats"].items():
+                out.append(f"  {name:10}: Avg {stats['avg_response']:.0f}ms, "
+                           f"Success rate: {stats['success_rate']:.1f}%")
+                if "warm" in stats:
+                    phases = [f"{phase} Avg {stats[phase]['avg_response']:.0f}ms ({stats[phase]['samples']})"
+                              for phase in ("cold", "warm") if phase in stats]
+                    out.append(f"  {'':10}  {', '.join(phases)}")
+        else:
+            out += [_RULE, "DETECTION RESULTS", "-" * 20]
+            for name, result in r["results"]:
+                if result.get("ok"):
+                    out.append(f"  {name:10}: OK   ({result.get('ms', 0):.0f}ms)")
+                else:
+                    out.append(f"  {name:10}: FAIL ({result.get('error', 'Unknown error')})")
+                if "tls_handshake_ms" in result:
+                    resumed = "resumed" if result["tls_resumed"] else "full"
+                    out.append(f"  {'':10}  TLS probe: {result['tls_version']} {result['tls_cipher']}, "
+                               f"handshake {result['tls_handshake_ms']:.0f}ms ({resumed})")
+
+        out += [_RULE, f"STATUS: {format_status(r['status'], r['msg'])}", _RULE, "SUGGESTION"]
+        if r["status"] == "good":
+            out += _SUGGESTIONS_GOOD
+        elif r["status"] == "warn":
+            failed = failed_targets(r)
+            if failed:
+                failed_list = ', '.join(failed)
+                out += (_UNSTABLE_HEAD,
+                        f"  {colorize(f'Issues with: {failed_list}', Colors.YELLOW)}",
+                        _UNSTABLE_TAIL)
+            else:
+                out += _SUGGESTIONS_SLOW
+        elif too_slow(r):
+            out += _SUGGESTIONS_TOO_SLOW
+        else:
+            out += _SUGGESTIONS_BAD
+
+        out += [_RULE, "SHARE THIS RESULT", f"GitHub Checker v1.1.0 | {r['msg']} | {timestamp}"]
+        return "\n".join(out) + "\n"
+
+
+class MinimalRenderer(Renderer):
+    """One line per target plus a status line"""
+
+    name = "minimal"
+
+    def render(self, r: Dict[str, Any], is_full_test: bool, timestamp: str = None) -> str:
+        out = [f"{name}: OK ({result.get('ms', 0):.0f}ms)" if result.get("ok") else f"{name}: FAIL"
+               for name, result in r["results"]]
+        label = {"good": "OK", "warn": "WARN"}.get(r["status"], "FAIL")
+        out.append(f"STATUS: {label} ({r['msg']})")
+        return "\n".join(out) + "\n"
+
+
+class FunRenderer(Renderer):
+    """Report with playful descriptions"""
+
+    name = "fun"
+
+    def render(self, r: Dict[str, Any], is_full_test: bool, timestamp: str = None) -> str:
+        timestamp = timestamp or time.strftime("%Y-%m-%d %H:%M:%S")
+        out = [_RULE, "DETECTION RESULTS", "-" * 20]
+        for name, result in r["results"]:
+            if result.get("ok"):
+                out.append(f"  {name:10}: OK   ({result.get('ms', 0):.0f}ms)")
+            else:
+                out.append(f"  {name:10}: FAIL")
+
+        avg_ms = r.get("avg_total_time", 0) if is_full_test else None
+        slow = too_slow(r)
+        out += [_RULE, f"STATUS: {format_fun_status(r['status'], avg_ms, slow)}", _RULE, "SUGGESTION"]
+
+        if r["status"] == "good":
+            out += ["  You can push code now! Go for it!", "  Everything is working great!"]
+        elif r["status"] == "warn":
+            failed = failed_targets(r)
+            if failed:
+                out += ["  GitHub is having some trouble...",
+                        f"  Slow spot: {', '.join(failed)}",
+                        "  Maybe wait a bit and try again?"]
+            else:
+                out += ["  Things are a bit slow today...", "  But you can still get work done!"]
+        elif slow:
+            out += ["  GitHub answers, but far too slowly...", "  Check your bandwidth or proxy first."]
+        else:
+            out += ["  GitHub seems to be taking a break...", "  Check your network connection first."]
+
+        out += [_RULE, "SHARE THIS RESULT", f"GitHub Checker v1.1.0 | {r['msg']} | {timestamp}"]
+        return "\n".join(out) + "\n"
+
+
+class JsonRenderer(Renderer):
+    """Indented JSON document"""
+
+    name = "json"
+    machine_readable = True
+
+    def render(self, r: Dict[str, Any], is_full_test: bool, timestamp: str = None) -> str:
+        timestamp = timestamp or time.strftime("%Y-%m-%d %H:%M:%S")
+        return json.dumps(json_report(r, is_full_test, timestamp), indent=2, ensure_ascii=False) + "\n"
+
+
+class NdjsonRenderer(Renderer):
+    """Compact JSON document on a single line, for streams of reports"""
+
+    name = "ndjson"
+    machine_readable = True
+
+    def render(self, r: Dict[str, Any], is_full_test: bool, timestamp: str = None) -> str:
+        timestamp = timestamp or time.strftime("%Y-%m-%d %H:%M:%S")
+        return json.dumps(json_report(r, is_full_test, timestamp), ensure_ascii=False,
+                          separators=(",", ":")) + "\n"
+
+
+RENDERERS: Dict[str, type] = {
+    cls.name: cls for cls in (DefaultRenderer, MinimalRenderer, FunRenderer, JsonRenderer, NdjsonRenderer)
+}
+
+
+def get_renderer(name: str) -> Renderer:
+    """
+    Create the renderer registered under name
+
+    Raises:
+        ValueError: If no renderer has that name
+    """
+    try:
+        return RENDERERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown renderer '{name}', choose from {', '.join(RENDERERS)}")
+
+
+def benchmark_renderers(iterations: int = RENDER_BENCH_ITERATIONS) -> Dict[str, Dict[str, float]]:
+    """
+    Time every renderer on synthetic results, without any probing
+
+    Args:
+        iterations (int): Renders per renderer and result kind
+
+    Returns:
+        Dict[str, Dict[str, float]]: Microseconds per render for each
+              renderer name, for a single check ("check") and a full
+              test ("full_test")
+    """
+    results = [("homepage", {"ok": True, "ms": 120, "status_code": 200}),
+               ("api", {"ok": False, "error": "Request timed out", "error_type": "timeout"})]
+    check = {"status": "warn", "ms": 8120.0, "results": results,
+             "msg": "GitHub is unstable (api affected)"}
+    full = dict(check, iterations=FULL_TEST_ITERATIONS, avg_total_time=8120.0, successful_checks=3,
+                target_stats={"homepage": {"avg_response": 120.0, "success_rate": 100.0},
+                              "api": {"avg_response": 0.0, "success_rate": 0.0}},
+                all_results=results * FULL_TEST_ITERATIONS)
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    timings: Dict[str, Dict[str, float]] = {}
+    for name, cls in RENDERERS.items():
+        renderer = cls()
+        timings[name] = {}
+        for kind, r, is_full_test in (("check", check, False), ("full_test", full, True)):
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                renderer.render(r, is_full_test, timestamp)
+            timings[name][kind] = (time.perf_counter() - t0) / iterations * 1e6
+    return timings
+
+
+def status_exit_code(status: str) -> int:
+    """
+    Map a network status to the process exit code
+
+    Args:
+        status (str): Status type ("good", "warn", "bad")
+
+    Returns:
+        int: 0 for good, 1 for warn, 2 for anything else
+    """
+    if status == "good":
+        return 0
+    elif status == "warn":
+        return 1
+    else:
+        return 2
+
+
+class NotifyError(Exception):
+    """A notification sink refused or failed a delivery"""
+
+
+class WebhookSink:
+    """Notification sink POSTing the JSON payload to an HTTP(S) URL"""
+
+    def __init__(self, url: str, timeout: float = NOTIFY_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        return self.url
+
+    def send(self, payload: Dict[str, Any]) -> None:
+        """
+        Deliver one payload
+
+        Raises:
+            NotifyError: If the request fails or the answer is not 2xx
+        """
+        try:
+            resp = requests.post(self.url, json=payload, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise NotifyError(str(e)) from e
+        if not 200 <= resp.status_code < 300:
+            raise NotifyError(f"HTTP {resp.status_code}")
+
+
+class CommandSink:
+    """Notification sink running a local command with the JSON payload on stdin"""
+
+    def __init__(self, command: str, timeout: float = NOTIFY_TIMEOUT):
+        self.command = command
+        self.argv = shlex.split(command)
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        return self.command
+
+    def send(self, payload: Dict[str, Any]) -> None:
+        """
+        Deliver one payload
+
+        Raises:
+            NotifyError: If the command cannot run, times out or exits non-zero
+        """
+        try:
+            proc = subprocess.run(self.argv, input=json.dumps(payload).encode("utf-8"),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                  timeout=self.timeout)
+        except (OSError, subprocess.SubprocessError) as e:
+            raise NotifyError(str(e)) from e
+        if proc.returncode != 0:
+            raise NotifyError(f"exit code {proc.returncode}")
+
+
+class RecordingTransport:
+    """Probe transport recording every real exchange to an NDJSON file
+
+    Each line holds the target name and URL, the Unix time, the wall-clock
+    duration of the exchange (wall_ms), the raw result of Checker._test and
+    the DNS statistics. ReplayTransport plays such a file back.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Recording file, appended to
+
+        Raises:
+            OSError: If the file cannot be opened
+        """
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def exchange(self, name: str, url: str, timeout: float,
+                 send: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Carry out the exchange with `send` and record it
+
+        Args:
+            name (str): Target name
+            url (str): Target URL
+            timeout (float): Request timeout in seconds
+            send: Callable running the real exchange, returning (result, dns)
+
+        Returns:
+            Tuple: What `send` returned
+        """
+        started = time.time()
+        t0 = time.perf_counter()
+        r, dns = send()
+        line = json.dumps({"name": name, "url": url, "ts": round(started, 3),
+                           "wall_ms": round((time.perf_counter() - t0) * 1000, 3),
+                           "result": r, "dns": dns}, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+        return r, dns
+
+    def close(self) -> None:
+        """Close the recording file"""
+        with self._lock:
+            self._file.close()
+
+
+class _ScriptedSession:
+    """Stand-in session answering every request with one scripted outcome"""
+
+    def __init__(self, outcome: Any):
+        self.outcome = outcome  # A requests.Response, or an exception to raise
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+def synthetic_exchange(fault: str, ms: float = None, status: int = None,
+                       url: str = "https://example.invalid/") -> Dict[str, Any]:
+    """
+    Build the recorded exchange of a synthetic fault
+
+    The outcome is run through the real Checker._test, so it is classified
+    exactly like a live response or exception.
+
+    Args:
+        fault (str): One of REPLAY_FAULTS
+        ms (float): Duration of the exchange, default per fault
+        status (int): HTTP status of a "5xx" fault, default 503
+        url (str): URL passed to _test
+
+    Returns:
+        Dict[str, Any]: Exchange with result and wall_ms, as replayed by
+            ReplayTransport
+
+    Raises:
+        ValueError: If the fault is unknown
+    """
+    if fault not in REPLAY_FAULTS:
+        raise ValueError(f"Unknown fault '{fault}' (use one of: {', '.join(REPLAY_FAULTS)})")
+    ms = REPLAY_FAULTS[fault] if ms is None else float(ms)
+    if fault == "timeout":
+        outcome: Any = requests.exceptions.ReadTimeout("Read timed out")
+    elif fault in ("reset", "refused"):
+        cause = ConnectionResetError(errno.ECONNRESET, "Connection reset by peer") if fault == "reset" \
+            else ConnectionRefusedError(errno.ECONNREFUSED, "Connection refused")
+        outcome = requests.exceptions.ConnectionError(cause)
+    else:
+        outcome = requests.Response()
+        outcome.status_code = {"5xx": status or 503, "rate_limited": RATE_LIMIT_STATUS_CODES[0]}.get(fault, 200)
+        if fault == "rate_limited":
+            outcome.headers.update({"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0",
+                                    "X-RateLimit-Reset": str(int(time.time()) + 3600)})
+    r = Checker(session=_ScriptedSession(outcome))._test(url, DEFAULT_TIMEOUT)
+    if "status_code" in r:
+        r["ms"] = round(ms)
+    return {"result": r, "wall_ms": ms, "dns": None}
+
+
+class ReplayTransport:
+    """Probe transport answering from a recording or a synthetic scenario
+
+    Exchanges are replayed per target in recorded order (cycling when
+    `loop` is set) through the rest of the real probe pipeline: circuit
+    breakers, rate-limit deferral, baselines, judging, rendering. The
+    recorded result, including its ms, is returned unchanged after
+    sleeping wall_ms divided by `speed`, so a replay keeps an incident's
+    statistics while running as fast as asked; speed 0 does not sleep.
+    """
+
+    def __init__(self, exchanges: List[Dict[str, Any]], speed: float = 1.0, loop: bool = True):
+        """
+        Args:
+            exchanges (List[Dict[str, Any]]): Recorded exchanges (name,
+                result, wall_ms, dns), see RecordingTransport
+            speed (float): Replay speed-up, 0 for no delays
+            loop (bool): Start a target's exchanges over when they run out
+        """
+        self.speed = speed
+        self.loop = loop
+        self.replayed = 0
+        self._exchanges: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in exchanges:
+            self._exchanges.setdefault(entry["name"], []).append(entry)
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, speed: float = 1.0, loop: bool = True) -> "ReplayTransport":
+        """
+        Read a recording or scenario file
+
+        Each NDJSON line is a recorded exchange, or a synthetic step such as
+        {"name": "api", "fault": "timeout", "ms": 8000, "count": 3}
+        (see REPLAY_FAULTS; "status" sets the code of a "5xx" fault).
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If a line is not a valid exchange or step
+        """
+        exchanges = []
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    if "fault" in entry:
+                        step = synthetic_exchange(entry["fault"], entry.get("ms"), entry.get("status"))
+                        exchanges += [dict(step, name=entry["name"])] * int(entry.get("count", 1))
+                    else:
+                        exchanges.append({"name": entry["name"], "result": dict(entry["result"]),
+                                          "wall_ms": float(entry.get("wall_ms", 0)), "dns": entry.get("dns")})
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"{path}:{number}: invalid exchange ({e})") from e
+        return cls(exchanges, speed=speed, loop=loop)
+
+    def exchange(self, name: str, url: str, timeout: float,
+                 send: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Replay the next exchange of a target; `send` is never called
+
+        Returns:
+            Tuple: A copy of the recorded result and DNS statistics, or a
+                connection error when the target has nothing left to replay
+        """
+        with self._lock:
+            entries = self._exchanges.get(name, [])
+            index = self._next.get(name, 0)
+            if index >= len(entries) and not (self.loop and entries):
+                return _connection_error_result(LookupError(f"No recorded exchange left for {name}")), None
+            entry = entries[index % len(entries)]
+            self._next[name] = index + 1
+            self.replayed += 1
+        if self.speed > 0 and entry["wall_ms"]:
+            time.sleep(entry["wall_ms"] / 1000 / self.speed)
+        dns = entry.get("dns")
+        return dict(entry["result"]), dict(dns) if dns else None
+
+
+def target_status(r: Dict[str, Any]) -> str:
+    """
+    Status of a single target's result, on the same scale as _judge
+
+    Returns:
+        str: "good" if it succeeded, "warn" if reachable but rate limited
+             or flagged, "bad" if it failed
+    """
+    if not is_reachable(r):
+        return "bad"
+    if not r.get("ok") or r.get("anomaly") or r.get("loss_pct"):
+        return "warn"
+    return "good"
+
+
+class Notifier:
+    """Alerts on status transitions, delivered in the background
+
+    observe() compares each check with the previous one, overall and per
+    target, and queues only the transitions (e.g. good -> warn). A worker
+    thread collects transitions for `batch_window` seconds into one
+    payload, collapses repeated changes of a target within the batch (a
+    flap that ends where it started is dropped), suppresses a transition
+    that repeats the last one delivered for its target within
+    `dedup_window` seconds and then hands the
+    payload to every sink, retrying failures with jittered exponential
+    backoff. Probing never waits for a sink; when the queue is full the
+    newest transitions are dropped and counted.
+    """
+
+    def __init__(self, sinks: List[Any], batch_window: float = NOTIFY_BATCH_SEC,
+                 dedup_window: float = NOTIFY_DEDUP_SEC, retries: int = NOTIFY_RETRIES,
+                 backoff: float = NOTIFY_BACKOFF_SEC):
+        """
+        Args:
+            sinks (List[Any]): Objects with send(payload), e.g. WebhookSink
+                and CommandSink, raising NotifyError on failure
+            batch_window (float): Seconds transitions are collected per payload
+            dedup_window (float): Seconds a repeat of a target's last
+                delivered transition is suppressed
+            retries (int): Retries of a failed delivery per sink
+            backoff (float): Delay before the first retry in seconds
+        """
+        self.sinks = list(sinks)
+        self.batch_window = batch_window
+        self.dedup_window = dedup_window
+        self.retries = retries
+        self.backoff = backoff
+        self.states: Dict[str, str] = {}  # Target name ("" for overall) -> last status
+        self.delivered = 0  # Payloads accepted by a sink
+        self.failed = 0  # Payloads a sink still refused after all retries
+        self.dropped = 0  # Transitions lost to a full queue
+        self._last_sent: Dict[str, Tuple[str, str, float]] = {}  # Target -> from, to, time
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def observe(self, r: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Queue the transitions of a check against the previous one
+
+        The first check of a target only sets its initial status.
+
+        Args:
+            r (Dict[str, Any]): Result of Checker.check
+
+        Returns:
+            List[Dict[str, Any]]: Transitions queued, each with target
+                (None for the overall status), from, to, timestamp, message
+        """
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        current = [("", r["status"], r["msg"])]
+        current += [(name, target_status(result), result.get("error") or "")
+                    for name, result in r["results"]]
+        events = []
+        with self._lock:
+            for key, status, message in current:
+                previous = self.states.get(key)
+                self.states[key] = status
+                if previous is not None and previous != status:
+                    events.append({"target": key or None, "from": previous, "to": status,
+                                   "timestamp": timestamp, "message": message})
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+        return events
+
+    def close(self, timeout: float = NOTIFY_TIMEOUT) -> None:
+        """Deliver what is queued (waiting at most `timeout` seconds) and stop"""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            # Collect until the batch window closes, or at once when stopping
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                try:
+                    batch.append(self._queue.get(
+                        timeout=0 if self._stop.is_set() else max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            events = self._dedup(batch)
+            if events and self._deliver(events):
+                self._remember(events)  # Only a delivered transition can be repeated
+
+    def _dedup(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Collapse a batch to one transition per target and drop repeats of the last delivered one
+
+        Only a repeat is dropped: after good -> bad and bad -> good, a new
+        good -> bad is sent, since the sinks believe the target is good.
+        Delivered transitions are recorded by _remember, so one that every
+        sink refused is sent again when it repeats.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        for event in batch:
+            first = merged.get(event["target"])
+            merged[event["target"]] = dict(event, **{"from": first["from"]}) if first else event
+        now = time.monotonic()
+        events = []
+        for event in merged.values():
+            key = event["target"] or ""
+            last = self._last_sent.get(key)
+            if event["from"] == event["to"] or (
+                    last is not None and last[:2] == (event["from"], event["to"])
+                    and now - last[2] < self.dedup_window):
+                continue
+            events.append(event)
+        return events
+
+    def _remember(self, events: List[Dict[str, Any]]) -> None:
+        """Record delivered transitions as the last one sent for their targets"""
+        now = time.monotonic()
+        for event in events:
+            self._last_sent[event["target"] or ""] = (event["from"], event["to"], now)
+
+    def _deliver(self, events: List[Dict[str, Any]]) -> bool:
+        """Send one payload to every sink, retrying with jittered backoff; True if any accepted it"""
+        overall = self.states.get("")
+        payload = {
+            "version": "v1.1.0",
+            "host": socket.gethostname(),
+            "status": overall,
+            "events": events
+        }
+        accepted = False
+        for sink in self.sinks:
+            delay = self.backoff
+            for attempt in range(self.retries + 1):
+                try:
+                    sink.send(payload)
+                    self.delivered += 1
+                    accepted = True
+                    break
+                except NotifyError as e:
+                    if attempt == self.retries:
+                        self.failed += 1
+                        sys.stderr.write(f"[WARN] Notification to {sink} failed: {e}\n")
+                        break
+                # Keep retrying while stopping, but without the long waits
+                if not self._stop.is_set():
+                    time.sleep(delay * random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER))
+                delay = min(delay * 2, NOTIFY_MAX_BACKOFF_SEC)
+        return accepted
+
+
+def watch(chk: Checker, interval: float = WATCH_DEFAULT_INTERVAL,
+          renderer: Renderer = None, rounds: int = None, notifier: Notifier = None) -> int:
+    """
+    Repeatedly run checks and print one report per round
+
+    Args:
+        chk (Checker): Checker instance, reused so circuit breakers persist
+        interval (float): Delay between rounds in seconds
+        renderer (Renderer): Renderer of each round's report, None for a
+            compact status line per round
+        rounds (int): Number of rounds to run, None to run until interrupted
+        notifier (Notifier): Alerted with every round's check; None disables
+
+    Returns:
+        int: Exit code of the last round's status
+    """
+    status = "bad"
+    n = 0
+    try:
+        while rounds is None or n < rounds:
+            r = chk.check(timeout=DEFAULT_TIMEOUT)
+            status = r["status"]
+            if notifier is not None:
+                notifier.observe(r)
+            if renderer is not None:
+                renderer.write(r, False)
+            else:
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                sys.stdout.write(f"[{timestamp}] {format_status(status, r['msg'])}\n")
+                sys.stdout.flush()
+
+            n += 1
+            if rounds is None or n < rounds:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nWatch stopped by user.")
+    return status_exit_code(status)
+
+
+class _StatusRequestHandler(BaseHTTPRequestHandler):
+    """Serves the latest pre-serialised status of a StatusServer"""
+
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        status_server = self.server.status_server
+        if self.path in ("/", "/status"):
+            code, body, content_type = status_server.status_code, status_server.json_body, "application/json"
+        elif self.path == "/healthz":
+            code, body, content_type = status_server.health_code, status_server.health_body, "text/plain"
+        else:
+            code, body, content_type = 404, b"not found\n", "text/plain"
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass  # Keep the server silent, hooks poll it frequently
+
+
+class _TcpStatusServer(socketserver.ThreadingMixIn, HTTPServer):
+    """Status endpoint listening on a TCP port"""
+
+    daemon_threads = True
+
+
+class _UnixStatusServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Status endpoint listening on a Unix domain socket"""
+
+    daemon_threads = True
+
+
+def _is_loopback(host: str) -> bool:
+    """Whether a listen host only accepts local connections"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Remove a Unix socket left behind by a server that is gone
+
+    Raises:
+        OSError: If path is not a socket, or a server still accepts on it
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "Not a socket, refusing to replace it", path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.remove(path)  # Nobody listening: stale
+            return
+    raise OSError(errno.EADDRINUSE, "A server is already listening", path)
+
+
+class StatusServer:
+    """Local status endpoint fed by a background check scheduler
+
+    A scheduler thread runs Checker.check every `interval` seconds and
+    serialises the outcome once. Requests are answered from that cached
+    payload, so polling the endpoint never triggers a probe:
+
+        GET /status   JSON with status, message, exit code and results
+        GET /healthz  "good"/"warn"/"bad" as text, HTTP 200 only when good
+    """
+
+    def __init__(self, chk: Checker, address: str = STATUS_DEFAULT_ADDRESS,
+                 interval: float = STATUS_DEFAULT_INTERVAL, timeout: float = DEFAULT_TIMEOUT,
+                 notifier: Notifier = None, allow_remote: bool = False):
+        """
+        Args:
+            chk (Checker): Checker used by the scheduler, reused across rounds
+            address (str): "host:port" on localhost, or "unix:/path/to/socket"
+            interval (float): Delay between background checks in seconds
+            timeout (float): Request timeout of each check in seconds
+            notifier (Notifier): Alerted with every background check; None disables
+            allow_remote (bool): Allow a TCP host other than a loopback address
+
+        Raises:
+            ValueError: If a TCP host is not loopback and allow_remote is not set
+            OSError: If the address cannot be bound, or a Unix path exists
+                and is not a stale socket
+        """
+        self.chk = chk
+        self.notifier = notifier
+        self.interval = interval
+        self.timeout = timeout
+        self.last_result: Dict[str, Any] = None
+        self.status_code = 503  # HTTP code of /status until the first check ends
+        self.json_body = json.dumps({"status": "pending", "message": "First check in progress",
+                                     "exit_code": 2}).encode("utf-8")
+        self.health_code = 503
+        self.health_body = b"pending\n"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        if address.startswith("unix:"):
+            path = address[len("unix:"):]
+            _remove_stale_socket(path)
+            self.httpd = _UnixStatusServer(path, _StatusRequestHandler)
+            self.address = address
+        else:
+            host, port = _split_hostport(address, 8765)
+            if not allow_remote and not _is_loopback(host):
+                raise ValueError(f"{host or '*'} is not a loopback address (use --allow-remote to serve it)")
+            self.httpd = _TcpStatusServer((host, port), _StatusRequestHandler)
+            self.address = f"{host}:{self.httpd.server_address[1]}"
+        self.httpd.status_server = self
+
+    def update(self, r: Dict[str, Any]) -> None:
+        """
+        Publish a check result, serialising it once for all later requests
+        """
+        body = {
+            "status": r["status"],
+            "message": r["msg"],
+            "exit_code": status_exit_code(r["status"]),
+            "checked_at": time.time(),
+            "check_ms": round(r["ms"], 2)
+        }
+        body.update(json_result_fields(r, False))
+        json_body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        health_body = f"{r['status']}\n".encode("ascii")
+        # Swap in complete values; readers never see a half-built payload
+        self.last_result = r
+        self.json_body, self.status_code = json_body, 200
+        self.health_body, self.health_code = health_body, 200 if r["status"] == "good" else 503
+
+    def start(self) -> None:
+        """Start the scheduler and the endpoint in background threads"""
+        for target in (self._schedule, self.httpd.serve_forever):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the scheduler and close the endpoint"""
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.address.startswith("unix:") and os.path.exists(self.address[len("unix:"):]):
+            os.remove(self.address[len("unix:"):])
+
+    def _schedule(self) -> None:
+        while not self._stop.is_set():
+            r = self.chk.check(timeout=self.timeout)
+            self.update(r)
+            if self.notifier is not None:
+                self.notifier.observe(r)
+            self._stop.wait(self.interval)
+
+
+def query_status(address: str = STATUS_DEFAULT_ADDRESS,
+                 timeout: float = STATUS_QUERY_TIMEOUT) -> Dict[str, Any]:
+    """
+    Fetch the latest status from a running StatusServer
+
+    Args:
+        address (str): "host:port" or "unix:/path/to/socket" of the server
+        timeout (float): Connect and read timeout in seconds
+
+    Returns:
+        Dict[str, Any]: Decoded /status document
+
+    Raises:
+        OSError: If the server cannot be reached
+        ValueError: If the answer is not a status document
+    """
+    if address.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address[len("unix:"):])
+    else:
+        sock = socket.create_connection(_split_hostport(address, 8765), timeout=timeout)
+    with sock:
+        sock.sendall(b"GET /status HTTP/1.0\r\nHost: localhost\r\n\r\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    _, sep, body = b"".join(chunks).partition(b"\r\n\r\n")
+    if not sep:
+        raise ValueError("Malformed response from status server")
+    doc = json.loads(body.decode("utf-8"))
+    if "status" not in doc:
+        raise ValueError("Response is not a status document")
+    return doc
+
+
+def json_result_fields(r: Dict[str, Any], is_full_test: bool) -> Dict[str, Any]:
+    """
+    JSON fields describing the results of a check or full test
+
+    Args:
+        r (Dict[str, Any]): Result of Checker.check or Checker.test
+        is_full_test (bool): Whether r comes from Checker.test
+
+    Returns:
+        Dict[str, Any]: Target statistics for a full test, or per-target
+              results for a single check
+    """
+    if is_full_test:
+        def fields(stats: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "avg_response_ms": round(stats["avg_response"], 2),
+                "success_rate": round(stats["success_rate"], 2)
+            }
+
+        return {
+            "iterations": r["iterations"],
+            "warmup": r.get("warmup", 0),
+            "successful_checks": r["successful_checks"],
+            "avg_total_time_ms": round(r["avg_total_time"], 2),
+            "target_stats": {
+                name: dict(fields(stats), **{
+                    phase: dict(fields(stats[phase]), samples=stats[phase]["samples"])
+                    for phase in ("cold", "warm") if phase in stats
+                })
+                for name, stats in r["target_stats"].items()
+            }
+        }
+    return {
+        "results": [
+            dict({
+                "target": name,
+                "status": ("OK" if result.get("ok") else
+                           "RATE_LIMITED" if is_reachable(result) else "FAIL"),
+                "response_time_ms": round(result.get("ms", 0), 2) if result.get("ok") else None,
+                "error": result.get("error") if not result.get("ok") else None
+            }, **{key: result[key] for key in RESULT_DETAIL_FIELDS if key in result})
+            for name, result in r["results"]
+        ]
+    }
+
+
+def load_target_sets(path: str) -> List[Dict[str, Any]]:
+    """
+    Load target sets for batch mode from a JSON file
+
+    The file holds a list of sets (or an object with a "sets" list). Each
+    set has a "name", its "targets" as an object or list of [name, url]
+    pairs, and optionally a "proxy":
+
+        [{"name": "ghe-eu", "proxy": "direct",
+          "targets": {"homepage": "https://ghe.example.com",
+                      "api": "https://ghe.example.com/api/v3"}}]
+
+    Args:
+        path (str): Path of the JSON file
+
+    Returns:
+        List[Dict[str, Any]]: Sets with "name", "targets" (list of pairs)
+              and "proxy" keys
+
+    Raises:
+        ValueError: If the file does not describe valid target sets
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("sets")
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of target sets")
+
+    sets = []
+    for i, entry in enumerate(data):
+        targets = entry.get("targets") if isinstance(entry, dict) else None
+        if isinstance(targets, dict):
+            targets = list(targets.items())
+        if not targets or not all(isinstance(t, (list, tuple)) and len(t) == 2 for t in targets):
+            raise ValueError(f"{path}: set #{i + 1} needs a non-empty \"targets\" mapping")
+        sets.append({
+            "name": entry.get("name") or f"set-{i + 1}",
+            "targets": [(str(name), str(url)) for name, url in targets],
+            "proxy": entry.get("proxy")
+        })
+    return sets
+
+
+def run_batch(target_sets: List[Dict[str, Any]], full_test: bool = False,
+              workers: int = BATCH_DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT,
+              dns_cache: DnsCache = None, processes: int = 0,
+              limiter: ResourceLimiter = None, warmup: int = 0, tracer: Tracer = None,
+              policy: JudgePolicy = None) -> Dict[str, Any]:
+    """
+    Check many target sets concurrently over one bounded worker pool
+
+    All sets share one requests session, so connections to hosts common to
+    several sets are pooled, and one DNS cache. With `processes` above one
+    the targets are sharded across worker processes instead, see
+    _run_batch_processes.
+
+    Args:
+        target_sets (List[Dict[str, Any]]): Sets as returned by load_target_sets
+        full_test (bool): Run Checker.test instead of Checker.check per set
+        workers (int): Maximum number of sets (or, with processes, target
+            chunks per process) probed at the same time
+        timeout (float): Request timeout in seconds
+        dns_cache (DnsCache): DNS cache shared by all sets
+        processes (int): Worker processes; 0 or 1 probes in this process
+        limiter (ResourceLimiter): Budget shared by the probes of all sets;
+            with processes each worker applies its own copy of the limits
+        warmup (int): Warm-up checks per set before a full test
+        tracer (Tracer): Tracer of the probes of every set; worker
+            processes are not traced
+        policy (JudgePolicy): Status policy of every set; None uses the
+            built-in DEFAULT_POLICY
+
+    Returns:
+        Dict[str, Any]: Aggregated report containing:
+            - status (str): Worst status over all sets
+            - elapsed_ms (float): Wall-clock time of the whole batch
+            - sets (list): Per set name, status, message and results
+    """
+    if processes > 1:
+        return _run_batch_processes(target_sets, full_test, workers, timeout, dns_cache, processes,
+                                    limiter, warmup, policy)
+    workers = max(1, min(workers, len(target_sets) or 1))
+    session = tracked_session(pool_connections=max(10, len(target_sets)), pool_maxsize=workers)
+
+    def run(target_set: Dict[str, Any]) -> Dict[str, Any]:
+        chk = Checker(targets=target_set["targets"], proxy=target_set["proxy"],
+                      dns_cache=dns_cache, session=session, limiter=limiter, tracer=tracer,
+                      policy=policy)
+        t0 = time.time()
+        r = chk.test(timeout=timeout, warmup=warmup) if full_test else chk.check(timeout=timeout)
+        entry = {
+            "name": target_set["name"],
+            "status": r["status"],
+            "message": r["msg"],
+            "ms": round((time.time() - t0) * 1000, 2)
+        }
+        entry.update(json_result_fields(r, full_test))
+        return entry
+
+    start = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(run, target_sets))
+    finally:
+        session.close()
+    return _batch_report(entries, full_test, start)
+
+
+def _batch_report(entries: List[Dict[str, Any]], full_test: bool, start: float) -> Dict[str, Any]:
+    """Aggregate per-set entries into the run_batch report"""
+    severity = {"good": 0, "warn": 1, "bad": 2}
+    worst = max((e["status"] for e in entries), key=lambda st: severity.get(st, 2), default="bad")
+    return {
+        "version": "v1.1.0",
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "is_full_test": full_test,
+        "status": worst,
+        "elapsed_ms": round((time.time() - start) * 1000, 2),
+        "sets": entries
+    }
+
+
+def _run_batch_processes(target_sets: List[Dict[str, Any]], full_test: bool, workers: int,
+                         timeout: float, dns_cache: DnsCache, processes: int,
+                         limiter: ResourceLimiter = None, warmup: int = 0,
+                         policy: JudgePolicy = None) -> Dict[str, Any]:
+    """
+    run_batch over worker processes, for CPU-bound sweeps of many targets
+
+    Every set is split into chunks of targets, and the chunks are dealt
+    round-robin to `processes` workers, each probing its chunks on up to
+    `workers` threads with its own session and DNS cache. A worker returns
+    one compact JSON document, which is decoded here. Each iteration's
+    chunk results are then concatenated back into one check per set, and
+    the result is judged and summarised exactly as for a single process.
+    A limiter cannot be shared between processes, so each worker gets a
+    ResourceLimiter with the same limits. Warm-up checks run in the
+    workers like any other iteration and are dropped here. The checks
+    are judged here, so the policy never reaches the workers.
+    """
+    if not full_test:
+        warmup = 0
+    iterations = warmup + FULL_TEST_ITERATIONS if full_test else 1
+    total = sum(len(target_set["targets"]) for target_set in target_sets)
+    chunk_size = max(1, -(-total // (processes * PROCESS_SHARDS_PER_WORKER)))
+    chunks = [(index, i, target_set["targets"][i:i + chunk_size], target_set["proxy"])
+              for index, target_set in enumerate(target_sets)
+              for i in range(0, len(target_set["targets"]), chunk_size)]
+    dns = {"ttl": dns_cache.ttl, "resolver": dns_cache.resolver} if dns_cache is not None else None
+    limits = {"max_in_flight": limiter.max_in_flight, "per_host": limiter.per_host,
+              "probes_per_sec": limiter.probes_per_sec,
+              "bytes_per_sec": limiter.bytes_per_sec} if limiter is not None else None
+    shards = [chunks[i::processes] for i in range(processes)]
+    jobs = [(shard, iterations, timeout, workers, dns, limits) for shard in shards if shard]
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=len(jobs) or 1) as pool:
+        encoded = list(pool.map(_run_shard, jobs))
+
+    # Per set: the chunk outputs of every iteration, in chunk order
+    per_set: Dict[int, List[Dict[str, Any]]] = {}
+    for shard, payload in zip((job[0] for job in jobs), encoded):
+        for chunk, output in zip(shard, json.loads(payload.decode("utf-8"))):
+            index = chunk[0]
+            per_set.setdefault(index, []).append(output)
+
+    entries = []
+    for index, target_set in enumerate(target_sets):
+        outputs = sorted(per_set.get(index, []), key=lambda output: output["offset"])
+        chk = Checker(targets=target_set["targets"], policy=policy)
+        checks = []
+        for i in range(warmup, iterations):
+            results = [(name, r) for output in outputs for name, r in output["checks"][i]["results"]]
+            status = chk._judge(results)
+            checks.append({
+                "status": status,
+                "ms": max((output["checks"][i]["ms"] for output in outputs), default=0.0),
+                "results": results,
+                "msg": chk._msg(status, results)
+            })
+        r = chk._summarise(checks, warmup) if full_test else checks[0]
+        entry = {
+            "name": target_set["name"],
+            "status": r["status"],
+            "message": r["msg"],
+            "ms": max((output["elapsed_ms"] for output in outputs), default=0.0)
+        }
+        entry.update(json_result_fields(r, full_test))
+        entries.append(entry)
+    return _batch_report(entries, full_test, start)
+
+
+def _run_shard(job: Tuple[List[Tuple[int, int, List[Tuple[str, str]], str]], int, float, int,
+                          Dict[str, Any], Dict[str, Any]]) -> bytes:
+    """
+    Worker process entry point of _run_batch_processes
+
+    Args:
+        job (Tuple): Chunks as (set index, offset in the set, targets,
+            proxy), iterations, timeout, thread count, DnsCache settings
+            (or None) and ResourceLimiter limits (or None)
+
+    Returns:
+        bytes: Compact JSON list with, per chunk, its offset, wall-clock
+               elapsed_ms and the ms and results of every iteration's check
+    """
+    chunks, iterations, timeout, workers, dns, limits = job
+    dns_cache = DnsCache(**dns) if dns is not None else None
+    limiter = ResourceLimiter(**limits) if limits is not None else None
+
+    def run(chunk: Tuple[int, int, List[Tuple[str, str]], str]) -> Dict[str, Any]:
+        _, offset, targets, proxy = chunk
+        chk = Checker(targets=targets, proxy=proxy, dns_cache=dns_cache, limiter=limiter)
+        t0 = time.time()
+        checks = [chk.check(timeout=timeout) for _ in range(iterations)]
+        return {
+            "offset": offset,
+            "elapsed_ms": round((time.time() - t0) * 1000, 2),
+            "checks": [{"ms": c["ms"], "results": c["results"]} for c in checks]
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        outputs = list(pool.map(run, chunks))
+    return json.dumps(outputs, separators=(",", ":")).encode("utf-8")
+
+
+def print_batch_report(report: Dict[str, Any], ndjson: bool = False) -> None:
+    """
+    Print a batch report as one JSON document or one JSON line per set
+
+    Args:
+        report (Dict[str, Any]): Result of run_batch
+        ndjson (bool): Print newline-delimited JSON, one set per line
+    """
+    if not ndjson:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    lines = [json.dumps(dict(entry, timestamp=report["timestamp"]), ensure_ascii=False)
+             for entry in report["sets"]]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def print_route_comparison(ranked: List[Dict[str, Any]], json_output: bool = False) -> None:
+    """
+    Print the ranked result of compare_routes as a table or JSON
+
+    Args:
+        ranked (List[Dict[str, Any]]): Routes as returned by compare_routes
+        json_output (bool): Print JSON instead of a table
+    """
+    if json_output:
+        print(json.dumps({
+            "version": "v1.1.0",
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "best_route": ranked[0]["route"] if ranked else None,
+            "routes": [
+                dict(entry, rank=i + 1,
+                     avg_ms=round(entry["avg_ms"], 2) if entry["avg_ms"] is not None else None,
+                     success_rate=round(entry["success_rate"], 2))
+                for i, entry in enumerate(ranked)
+            ]
+        }, indent=2, ensure_ascii=False))
+        return
+
+    print("\n" + "=" * 50)
+    print("ROUTE COMPARISON")
+    print("-" * 20)
+    for i, entry in enumerate(ranked):
+        avg = f"{entry['avg_ms']:.0f}ms" if entry["avg_ms"] is not None else "-"
+        print(f"  {i + 1}. {entry['route']:30} {entry['success_rate']:5.1f}% "
+              f"{avg:>8}  {format_status(entry['status'], entry['status'].upper())}")
+    if ranked:
+        print("\n" + "=" * 50)
+        print(f"Fastest route: {ranked[0]['route']}")
+
+
+def print_resolver_benchmark(bench: Dict[str, Any], json_output: bool = False) -> None:
+    """
+    Print the result of benchmark_resolvers as a table or JSON
+
+    Args:
+        bench (Dict[str, Any]): Result of benchmark_resolvers
+        json_output (bool): Print JSON instead of a table
+    """
+    if json_output:
+        print(json.dumps(dict(bench, version="v1.1.0",
+                              timestamp=time.strftime("%Y-%m-%d %H:%M:%S")),
+                         indent=2, ensure_ascii=False))
+        return
+
+    print("\n" + "=" * 50)
+    print("RESOLVER BENCHMARK")
+    print("-" * 20)
+    for entry in bench["resolvers"]:
+        if entry["avg_ms"] is None:
+            print(f"  {entry['resolver']:22}: {colorize('FAIL', Colors.RED)}")
+            continue
+        print(f"  {entry['resolver']:22}: Avg {entry['avg_ms']:.1f}ms "
+              f"(min {entry['min_ms']:.1f}, max {entry['max_ms']:.1f}), "
+              f"failures: {entry['failures']}")
+
+    print("\nAnswer consistency:")
+    for host, consistent in bench["consistency"].items():
+        if consistent is None:
+            label = colorize("no answers", Colors.RED)
+        elif consistent:
+            label = colorize("consistent", Colors.GREEN)
+        else:
+            label = colorize("differs", Colors.YELLOW)
+        print(f"  {host:22}: {label}")
+
+
+def summarize_series(reader: SeriesReader, start: float = None, end: float = None,
+                     window: float = None, targets: List[str] = None) -> List[Dict[str, Any]]:
+    """
+    Compute target_stats over fixed windows of a sample file
+
+    The samples are streamed from the mapping once, keeping only running
+    totals per window and target.
+
+    Args:
+        reader (SeriesReader): Open sample file
+        start (float): First Unix time included, default the first sample
+        end (float): Unix time excluded, default after the last sample
+        window (float): Window length in seconds, default one window for
+            the whole range
+        targets (List[str]): Only these targets, default all
+
+    Returns:
+        List[Dict[str, Any]]: Non-empty windows in time order, each with
+            start, end, samples and target_stats (avg_response,
+            success_rate and samples per target, as in Checker.test)
+    """
+    windows: Dict[int, Dict[str, _TargetTally]] = {}
+    origin = start
+    last = None
+    for timestamp, name, r in reader.records(start, end, targets):
+        if origin is None:
+            origin = timestamp
+        last = timestamp
+        index = int((timestamp - origin) // window) if window else 0
+        tallies = windows.setdefault(index, {})
+        tally = tallies.get(name)
+        if tally is None:
+            tally = tallies[name] = _TargetTally()
+        tally.add(r)
+
+    summary = []
+    for index in sorted(windows):
+        tallies = windows[index]
+        if window:
+            bounds = (origin + index * window, origin + (index + 1) * window)
+        else:
+            bounds = (origin, end if end is not None else last)
+        summary.append({
+            "start": bounds[0],
+            "end": bounds[1],
+            "samples": sum(tally.samples for tally in tallies.values()),
+            "target_stats": {name: dict(tallies[name].stats(), samples=tallies[name].samples)
+                             for name in sorted(tallies, key=reader.targets.index)}
+        })
+    return summary
+
+
+def print_series_summary(summary: List[Dict[str, Any]], json_output: bool = False) -> None:
+    """
+    Print the result of summarize_series as a table or JSON
+
+    Args:
+        summary (List[Dict[str, Any]]): Windows as returned by summarize_series
+        json_output (bool): Print JSON instead of a table
+    """
+    if json_output:
+        print(json.dumps({"version": "v1.1.0", "windows": summary}, indent=2, ensure_ascii=False))
+        return
+
+    def stamp(t: float) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+
+    if not summary:
+        print("No samples in the selected range.")
+    for entry in summary:
+        print(f"\n{stamp(entry['start'])} - {stamp(entry['end'])} ({entry['samples']} samples)")
+        for name, stats in entry["target_stats"].items():
+            rate = stats["success_rate"]
+            color = Colors.GREEN if rate == 100 else Colors.YELLOW if rate >= 50 else Colors.RED
+            print(f"  {name:10}: Avg {stats['avg_response']:.1f}ms, "
+                  f"success {colorize(f'{rate:.1f}%', color)} ({stats['samples']} samples)")
+
+
+class _LatencyHistogram:
+    """Latency histogram with logarithmic buckets and bounded memory
+
+    Buckets grow by REPORT_HISTOGRAM_GROWTH, so percentiles are within
+    about one percent of the exact value however many samples are added,
+    and a histogram never holds more than a few hundred buckets.
+    """
+
+    __slots__ = ("counts", "count", "total", "low", "high")
+
+    _LOG_GROWTH = math.log(REPORT_HISTOGRAM_GROWTH)
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, ms: float, weight: int = 1) -> None:
+        """Add a latency in milliseconds, counted weight times"""
+        if weight <= 0:
+            return
+        index = int(math.log(max(ms, REPORT_HISTOGRAM_MIN_MS)) / self._LOG_GROWTH)
+        self.counts[index] = self.counts.get(index, 0) + weight
+        self.count += weight
+        self.total += ms * weight
+        self.low = min(self.low, ms)
+        self.high = max(self.high, ms)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile (like _percentile), None when empty"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # Bucket midpoint, clamped to the exact extremes
+                value = REPORT_HISTOGRAM_GROWTH ** (index + 0.5)
+                return min(max(value, self.low), self.high)
+        return self.high
+
+
+class _ReportGroup:
+    """Running totals of one source, time bucket and target in a merged report"""
+
+    __slots__ = ("samples", "ok", "rate_limited", "flagged", "latency")
+
+    def __init__(self):
+        self.samples = 0
+        self.ok = 0
+        self.rate_limited = 0
+        self.flagged = False
+        self.latency = _LatencyHistogram()
+
+    def stats(self) -> Dict[str, Any]:
+        """Success rate, result counts, judged status and latency percentiles"""
+        latency = self.latency
+        avg = latency.total / latency.count if latency.count else None
+        stats = {
+            "samples": self.samples,
+            "success_rate": round(self.ok / self.samples * 100, 2),
+            "results": {"OK": self.ok, "RATE_LIMITED": self.rate_limited,
+                        "FAIL": self.samples - self.ok - self.rate_limited},
+            "status": judge_totals(self.samples, self.ok + self.rate_limited,
+                                   self.flagged or self.rate_limited > 0, avg or 0),
+            "avg_ms": round(avg, 2) if avg is not None else None
+        }
+        for pct in REPORT_PERCENTILES:
+            value = latency.percentile(pct)
+            stats[f"p{pct}_ms"] = round(value, 2) if value is not None else None
+        stats["max_ms"] = round(latency.high, 2) if latency.count else None
+        return stats
+
+
+def _iter_json_documents(stream: Any) -> Iterator[Any]:
+    """
+    Stream JSON documents from NDJSON lines or concatenated (pretty) JSON
+
+    Lines are parsed one at a time; a line that is not a complete document
+    starts a multi-line document, which is decoded once a line closes it.
+    Only one document is held in memory at a time.
+
+    Args:
+        stream: Text stream such as an open file
+
+    Yields:
+        Any: Decoded documents, None for each part that is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    pending: List[str] = []
+    for line in stream:
+        # Top-level documents start at column 0, pretty-printed members are indented
+        if pending and line[:1] in ("{", "["):
+            pending = []
+            yield None
+        if not pending:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            try:
+                yield json.loads(stripped)
+                continue
+            except ValueError:
+                pass
+        pending.append(line)
+        # A pretty-printed document ends with its closing bracket at column 0
+        if line[:1] not in ("}", "]"):
+            continue
+        try:
+            doc, _ = decoder.raw_decode("".join(pending).strip())
+        except ValueError:
+            doc = None
+        pending = []
+        yield doc
+    if pending:
+        yield None  # Incomplete document at the end of the stream
+
+
+class ResultReport:
+    """Merge of many JSON/NDJSON check outputs into one grouped summary
+
+    Reports (single checks, watch and serve streams, full tests and batch
+    reports) are folded into running totals per source, time bucket and
+    target as they are read, so memory depends on the number of groups,
+    not on the number of records. Latency percentiles come from
+    _LatencyHistogram, success rates and judged statuses follow
+    Checker.test and Checker._judge. Results deferred by the rate-limit
+    budget repeat an earlier sample and are not counted.
+    """
+
+    def __init__(self, bucket: float = None):
+        """
+        Args:
+            bucket (float): Time bucket length in seconds, None for a single
+                bucket per source
+        """
+        self.bucket = bucket
+        self.reports = 0
+        self.invalid = 0
+        self._groups: Dict[Tuple[str, float], Dict[str, Any]] = {}
+        self._hours: Tuple[str, float] = (None, None)  # Last parsed "YYYY-mm-dd HH" prefix
+
+    def add_file(self, source: str, stream: Any) -> None:
+        """
+        Fold every report of a stream into the totals
+
+        Args:
+            source (str): Source label of the stream (e.g. an office)
+            stream: Text stream of JSON or NDJSON reports
+        """
+        for doc in _iter_json_documents(stream):
+            if isinstance(doc, dict) and isinstance(doc.get("sets"), list):
+                for entry in doc["sets"]:  # Batch report: one source per target set
+                    if isinstance(entry, dict):
+                        self.add(f"{source}/{entry.get('name')}",
+                                 dict(entry, timestamp=entry.get("timestamp", doc.get("timestamp"))))
+            elif isinstance(doc, dict) and "status" in doc:
+                self.add(source, doc)
+            else:
+                self.invalid += 1
+
+    def add(self, source: str, doc: Dict[str, Any]) -> None:
+        """
+        Fold one report into the totals
+
+        Args:
+            source (str): Source label
+            doc (Dict[str, Any]): Report as printed by json_report
+        """
+        start = self._bucket_start(doc.get("timestamp"))
+        group = self._groups.get((source, start))
+        if group is None:
+            group = self._groups[(source, start)] = {
+                "reports": 0, "statuses": {"good": 0, "warn": 0, "bad": 0}, "targets": {}}
+        self.reports += 1
+        group["reports"] += 1
+        status = doc.get("status")
+        group["statuses"][status] = group["statuses"].get(status, 0) + 1
+
+        targets = group["targets"]
+        for result in doc.get("results") or ():
+            if result.get("deferred"):
+                continue
+            name = result.get("target")
+            target = targets.get(name)
+            if target is None:
+                target = targets[name] = _ReportGroup()
+            target.samples += 1
+            if result.get("status") == "OK":
+                target.ok += 1
+                if result.get("response_time_ms") is not None:
+                    target.latency.add(result["response_time_ms"])
+            elif result.get("status") == "RATE_LIMITED":
+                target.rate_limited += 1
+            if result.get("anomaly") or result.get("loss_pct"):
+                target.flagged = True
+        # Full tests only carry per-target averages and rates, counted as one
+        # sample per iteration, each successful one at the average latency
+        # (of its cold or warm phase when the document splits them)
+        iterations = doc.get("iterations") or 0
+        for name, stats in (doc.get("target_stats") or {}).items():
+            target = targets.get(name)
+            if target is None:
+                target = targets[name] = _ReportGroup()
+            ok = int(round(stats.get("success_rate", 0) * iterations / 100))
+            target.samples += iterations
+            target.ok += ok
+            phases = [stats[phase] for phase in ("cold", "warm") if isinstance(stats.get(phase), dict)]
+            if not phases:
+                phases = [dict(stats, samples=iterations)]
+            for phase in phases:
+                if phase.get("avg_response_ms") is not None:
+                    weight = int(round(phase.get("success_rate", 0) * (phase.get("samples") or 0) / 100))
+                    target.latency.add(phase["avg_response_ms"], weight)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        The merged report
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - reports (int): Reports merged
+                - invalid (int): Documents skipped as not being reports
+                - bucket_seconds (float): Bucket length, or None
+                - groups (list): Per source and bucket start (Unix time or
+                  None), in order: report count, report status
+                  distribution and per-target stats (samples,
+                  success_rate, result counts, judged status, avg and
+                  percentile latencies of successful probes)
+        """
+        groups = []
+        for (source, start) in sorted(self._groups, key=lambda key: (key[0], key[1] or 0)):
+            group = self._groups[(source, start)]
+            groups.append({
+                "source": source,
+                "bucket": start,
+                "reports": group["reports"],
+                "statuses": group["statuses"],
+                "targets": {name: target.stats() for name, target in group["targets"].items()
+                            if target.samples}
+            })
+        return {
+            "version": "v1.1.0",
+            "reports": self.reports,
+            "invalid": self.invalid,
+            "bucket_seconds": self.bucket,
+            "groups": groups
+        }
+
+    def _bucket_start(self, timestamp: Any) -> float:
+        """Start of the time bucket of a report timestamp, None without buckets"""
+        if not self.bucket or not isinstance(timestamp, str):
+            return None
+        # strptime is far slower than the rest of a record, so only the hour
+        # (the unit of DST shifts) goes through it, once per run of reports
+        hour = timestamp[:13]
+        if hour != self._hours[0]:
+            try:
+                self._hours = (hour, time.mktime(time.strptime(hour, "%Y-%m-%d %H")))
+            except ValueError:
+                self._hours = (hour, None)
+        try:
+            parsed = self._hours[1] + int(timestamp[14:16]) * 60 + int(timestamp[17:19])
+        except (TypeError, ValueError):
+            return None
+        return parsed - parsed % self.bucket
+
+
+def print_result_report(summary: Dict[str, Any], json_output: bool = False) -> None:
+    """
+    Print the summary of a ResultReport as a table or JSON
+
+    Args:
+        summary (Dict[str, Any]): Result of ResultReport.summary
+        json_output (bool): Print JSON instead of a table
+    """
+    if json_output:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Merged {summary['reports']} reports"
+          + (f" ({summary['invalid']} invalid documents skipped)" if summary["invalid"] else ""))
+    colors = {"good": Colors.GREEN, "warn": Colors.YELLOW, "bad": Colors.RED}
+    for group in summary["groups"]:
+        when = ""
+        if group["bucket"] is not None:
+            when = " " + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(group["bucket"]))
+        statuses = ", ".join(f"{status} {count}" for status, count in group["statuses"].items())
+        print(f"\n{group['source']}{when}: {group['reports']} reports ({statuses})")
+        for name, stats in group["targets"].items():
+            latency = "no latency samples" if stats["p50_ms"] is None else \
+                f"p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms, p99 {stats['p99_ms']:.1f}ms"
+            label = colorize(stats["status"].upper().ljust(4), colors[stats["status"]])
+            print(f"  {name:10}: {label} success {stats['success_rate']:.1f}% of {stats['samples']}, {latency}")
+
+
+def main() -> int:
+    """
+    Main function: Execute GitHub accessibility check main logic
+
+    This function is responsible for:
+    1. Parsing command line arguments
+    2. Showing probe progress on a terminal
+    3. Executing checks
+    4. Displaying results
+    5. Providing operation suggestions
+
+    Returns:
+        int: Exit code (0 for success, non-zero for errors)
+    """
+    parse_start = time.perf_counter()
+    # Create command line argument parser
+    parser = argparse.ArgumentParser(
+        description="GitHub Network Status Checker")
+    # Add full test mode parameter
+    parser.add_argument('-f', '--full-test', action='store_true',
+                        help='Perform full test with multiple checks')
+    parser.add_argument('--warmup', type=int, default=0, metavar='N',
+                        help='Run N warm-up checks before a full test, left out of the statistics, '
+                             'so its samples start on open connections (default: 0)')
+    # Add JSON output parameter
+    parser.add_argument('-j', '--json', action='store_true',
+                        help='Output results in JSON format')
+    # Add theme parameter
+    parser.add_argument('-t', '--theme', choices=list(RENDERERS),
+                        default='default', help='Output theme (default: default)')
+    # Add intro parameter to show value proposition
+    parser.add_argument('-i', '--intro', action='store_true',
+                        help='Show tool value proposition')
+    # Add watch mode parameters
+    parser.add_argument('-w', '--watch', type=float, metavar='SECONDS', nargs='?',
+                        const=WATCH_DEFAULT_INTERVAL, default=None,
+                        help='Check repeatedly every SECONDS '
+                             f'(default: {WATCH_DEFAULT_INTERVAL:.0f})')
+    parser.add_argument('--breaker-threshold', type=int, default=BREAKER_FAILURE_THRESHOLD,
+                        help='Consecutive failures before a target is treated as '
+                             f'down in watch mode, 0 to disable (default: {BREAKER_FAILURE_THRESHOLD})')
+    parser.add_argument('--breaker-cooldown', type=float, default=BREAKER_COOLDOWN_SEC,
+                        help='Initial cool-down in seconds before retrying a down target '
+                             f'(default: {BREAKER_COOLDOWN_SEC:.0f})')
+    # Add proxy parameters
+    parser.add_argument('--proxy', metavar='URL',
+                        help='Probe through this HTTP/SOCKS proxy, or "direct" '
+                             'to ignore environment proxies')
+    parser.add_argument('--target-proxy', action='append', default=[], metavar='NAME=URL',
+                        help='Proxy for a single target (repeatable)')
+    parser.add_argument('--compare-proxies', nargs='+', metavar='URL',
+                        help='Compare the direct route with these proxies and rank them')
+    # Add DNS parameters
+    parser.add_argument('--no-dns-cache', action='store_true',
+                        help='Resolve every request through the system resolver')
+    parser.add_argument('--dns-resolver', metavar='IP[:PORT]',
+                        help='Resolve target hosts with this DNS server instead of the system')
+    parser.add_argument('--dns-benchmark', nargs='+', metavar='RESOLVER',
+                        help='Benchmark resolution of target hosts against these '
+                             f'resolvers ("{SYSTEM_RESOLVER}" for the system resolver)')
+    # Add TLS parameter
+    parser.add_argument('--tls', action='store_true',
+                        help='Report TLS handshake cost measured on a separate connection per HTTPS '
+                             'target, resuming sessions across these probes')
+    # Add batch parameters
+    parser.add_argument('--batch', metavar='FILE',
+                        help='Check every target set listed in a JSON file and print one report')
+    parser.add_argument('--workers', type=int, default=BATCH_DEFAULT_WORKERS,
+                        help=f'Maximum target sets probed at once in batch mode (default: {BATCH_DEFAULT_WORKERS})')
+    parser.add_argument('--processes', type=int, default=0, metavar='N',
+                        help='Shard the batch targets across N worker processes, each running '
+                             '--workers threads (default: probe in this process)')
+    # Add resource limit parameters
+    parser.add_argument('--max-in-flight', type=int, default=0, metavar='N',
+                        help='Run at most N probes at once over all hosts (default: unlimited)')
+    parser.add_argument('--per-host', type=int, default=0, metavar='N',
+                        help='Run at most N probes at once to the same host (default: unlimited)')
+    parser.add_argument('--max-probes-per-sec', type=float, default=0.0, metavar='R',
+                        help='Start at most R probes per second (default: unlimited)')
+    parser.add_argument('--max-bytes-per-sec', type=float, default=0.0, metavar='B',
+                        help='Receive at most B response bytes per second on average (default: unlimited)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Output one JSON line per report (same as -t ndjson); in batch mode '
+                             'one line per target set')
+    # Add probe backend parameter
+    parser.add_argument('--backend', choices=[BACKEND_REQUESTS, BACKEND_H2], default=BACKEND_REQUESTS,
+                        help='Probe backend: one HTTP/1.1 request per target, or one multiplexed '
+                             f'HTTP/2 connection per origin (default: {BACKEND_REQUESTS})')
+    # Add TCP connect probe parameters
+    parser.add_argument('--tcp', type=int, nargs='?', const=TCP_PROBE_COUNT, metavar='N',
+                        help='Connect-only check: N concurrent TCP handshakes per target and SSH '
+                             f'endpoint, reporting latency and loss (default: {TCP_PROBE_COUNT})')
+    parser.add_argument('--ssh', action='store_true',
+                        help='Also check the SSH git endpoints (github.com:22, ssh.github.com:443) '
+                             'by reading their banners')
+    parser.add_argument('--tcp-precheck', action='store_true',
+                        help='Run a cheap TCP handshake check first and skip the HTTP probes if '
+                             'nothing is reachable')
+    # Add fast verdict parameter
+    parser.add_argument('--fast', action='store_true',
+                        help='Probe targets concurrently and stop as soon as the status is certain')
+    # Add hedged request parameter
+    parser.add_argument('--hedge', action='store_true',
+                        help="Send a second request when a target is slower than its recent p95 "
+                             "latency and take the first reply")
+    # Add self-profiling parameters
+    parser.add_argument('--profile', action='store_true',
+                        help="Print the checker's own per-stage timings as JSON to stderr")
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Write per-stage timings to FILE in Chrome trace-event format')
+    # Add latency baseline parameter
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='Learn per-target latency in FILE across runs and warn when a target '
+                             'is far slower than usual')
+    # Add notification parameters
+    parser.add_argument('--notify-webhook', action='append', default=[], metavar='URL',
+                        help='In watch and serve mode, POST status transitions as JSON to URL (repeatable)')
+    parser.add_argument('--notify-command', action='append', default=[], metavar='CMD',
+                        help='In watch and serve mode, run CMD with status transitions as JSON on stdin '
+                             '(repeatable)')
+    parser.add_argument('--notify-batch', type=float, default=NOTIFY_BATCH_SEC, metavar='SECONDS',
+                        help=f'Collect transitions for SECONDS into one notification (default: {NOTIFY_BATCH_SEC:g})')
+    # Add record/replay parameters
+    parser.add_argument('--record', metavar='FILE',
+                        help='Record every HTTP probe exchange (result and timing) to FILE as NDJSON')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='Answer HTTP probes from a --record file or synthetic fault scenario '
+                             'instead of the network')
+    parser.add_argument('--replay-speed', type=float, default=1.0, metavar='X',
+                        help='Replay X times faster than recorded, 0 for no delays (default: 1)')
+    # Add judgement policy parameter
+    parser.add_argument('--policy', metavar='FILE',
+                        help='Judge the status with the JSON policy in FILE (target weights, required '
+                             'and optional targets, latency percentiles, minimum samples)')
+    # Add time-series export parameter
+    parser.add_argument('--export', metavar='FILE',
+                        help='Append every probe sample to the binary time-series FILE '
+                             '(read it with the summary command)')
+    # Add render benchmark parameter
+    parser.add_argument('--bench-render', type=int, nargs='?', const=RENDER_BENCH_ITERATIONS,
+                        metavar='N', help='Benchmark the output renderers without probing '
+                                          f'(default: {RENDER_BENCH_ITERATIONS} renders each)')
+    # Add status server subcommands
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    serve_parser = subparsers.add_parser('serve', help='Check periodically and serve the latest status locally')
+    serve_parser.add_argument('--listen', default=STATUS_DEFAULT_ADDRESS, metavar='ADDRESS',
+                              help=f'HOST:PORT or unix:/path to listen on (default: {STATUS_DEFAULT_ADDRESS})')
+    serve_parser.add_argument('--allow-remote', action='store_true',
+                              help='Allow listening on a non-loopback address')
+    serve_parser.add_argument('--interval', type=float, default=STATUS_DEFAULT_INTERVAL, metavar='SECONDS',
+                              help=f'Delay between checks (default: {STATUS_DEFAULT_INTERVAL:.0f})')
+    status_parser = subparsers.add_parser('status', help='Query a running status server, exit 0/1/2')
+    status_parser.add_argument('--connect', default=STATUS_DEFAULT_ADDRESS, metavar='ADDRESS',
+                               help=f'HOST:PORT or unix:/path of the server (default: {STATUS_DEFAULT_ADDRESS})')
+    status_parser.add_argument('--timeout', type=float, default=STATUS_QUERY_TIMEOUT, metavar='SECONDS',
+                               help=f'Query timeout (default: {STATUS_QUERY_TIMEOUT:g})')
+    summary_parser = subparsers.add_parser('summary', help='Summarise a --export sample file over time windows')
+    summary_parser.add_argument('file', metavar='FILE', help='Sample file written with --export')
+    summary_parser.add_argument('--start', type=float, metavar='UNIX_TIME',
+                                help='First time included (default: first sample)')
+    summary_parser.add_argument('--end', type=float, metavar='UNIX_TIME',
+                                help='Time excluded (default: after the last sample)')
+    summary_parser.add_argument('--last', type=float, metavar='SECONDS',
+                                help='Only the last SECONDS before now (instead of --start)')
+    summary_parser.add_argument('--window', type=float, metavar='SECONDS',
+                                help='Split the range into windows of SECONDS (default: one window)')
+    summary_parser.add_argument('--target', action='append', metavar='NAME',
+                                help='Only this target (repeatable)')
+    report_parser = subparsers.add_parser('report', help='Merge JSON/NDJSON outputs of many runs into one summary')
+    report_parser.add_argument('files', nargs='+', metavar='[SOURCE=]FILE',
+                               help='Output files, labelled SOURCE (default: the file name); - for stdin')
+    report_parser.add_argument('--bucket', type=float, metavar='SECONDS',
+                               help='Group reports into time buckets of SECONDS (default: no buckets)')
+    args = parser.parse_args()  # Parse command line arguments
+    tracer = Tracer() if args.profile or args.trace else None
+    if tracer is not None:
+        tracer.record_startup()
+        tracer.record("parse_args", parse_start, time.perf_counter())
+
+    def emit_profile() -> None:
+        if tracer is None:
+            return
+        if args.profile:
+            sys.stderr.write(json.dumps(tracer.summary(), indent=2) + "\n")
+        if args.trace:
+            try:
+                with open(args.trace, "w") as f:
+                    json.dump(tracer.chrome_trace(), f)
+            except OSError as e:
+                print(f"[WARN] Cannot write trace to {args.trace}: {e}", file=sys.stderr)
+
+    # Every mode, including error exits, ends with the profile and trace
+    try:
+        return _run(parser, args, tracer)
+    finally:
+        emit_profile()
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace, tracer: Tracer) -> int:
+    """
+    Run the mode selected on the command line, see main()
+
+    Args:
+        parser (argparse.ArgumentParser): Parser, for usage errors
+        args (argparse.Namespace): Parsed command line arguments
+        tracer (Tracer): Tracer given to every Checker, None without
+            --profile and --trace
+
+    Returns:
+        int: Exit code (0 for success, non-zero for errors)
+    """
+    # Status client: map the served status to the usual exit codes
+    if args.command == 'status':
+        try:
+            doc = query_status(args.connect, timeout=args.timeout)
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"[ERROR] Status server unavailable at {args.connect}: {e}\n")
+            return STATUS_UNREACHABLE_EXIT_CODE
+        if args.json or args.ndjson:
+            print(json.dumps(doc, ensure_ascii=False))
+        elif args.theme != 'minimal':
+            print(format_status(doc["status"], doc["message"]))
+        return status_exit_code(doc["status"])
+
+    # Sample file summary: target_stats per time window, no probing
+    if args.command == 'summary':
+        start = time.time() - args.last if args.last is not None else args.start
+        try:
+            with SeriesReader(args.file) as reader:
+                summary = summarize_series(reader, start=start, end=args.end,
+                                           window=args.window, targets=args.target)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Cannot read sample file: {e}", file=sys.stderr)
+            return 5
+        print_series_summary(summary, json_output=args.json or args.ndjson)
+        return 0
+
+    # Merged report: stream many result files into one grouped summary
+    if args.command == 'report':
+        report = ResultReport(bucket=args.bucket)
+        for item in args.files:
+            source, sep, path = item.partition("=")
+            if not sep:
+                path = item
+                source = "stdin" if item == "-" else os.path.splitext(os.path.basename(item))[0]
+            try:
+                if path == "-":
+                    report.add_file(source, sys.stdin)
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        report.add_file(source, f)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"[ERROR] Cannot read {path}: {e}", file=sys.stderr)
+                return 5
+        print_result_report(report.summary(), json_output=args.json or args.ndjson)
+        return 0
+
+    # Select the output renderer; -j and --ndjson are shortcuts for the themes
+    if args.json:
+        args.theme = "json"
+    elif args.ndjson:
+        args.theme = "ndjson"
+    renderer = get_renderer(args.theme)
+    quiet = renderer.machine_readable  # Keep machine-readable output parseable
+
+    # Render benchmark mode: time formatting separately from probing
+    if args.bench_render:
+        timings = benchmark_renderers(args.bench_render)
+        if quiet:
+            print(json.dumps(timings, indent=2))
+        else:
+            print(f"Renderer benchmark ({args.bench_render} renders each, microseconds per render)")
+            for name, kinds in timings.items():
+                print(f"  {name:10}: check {kinds['check']:8.1f}us, full test {kinds['full_test']:8.1f}us")
+        return 0
+
+    # Show value proposition if --intro is used
+    if args.intro and not quiet:
+        print("=" * 50)
+        print("GitHub Network Status Checker - Solve Your GitHub Connection Anxiety")
+        print("=" * 50)
+        print("Core Value:")
+        print("  * Quickly detect GitHub accessibility, avoid wasted operations")
+        print("  * Provide response time reference, optimize your workflow")
         print("  * Give specific suggestions, reduce troubleshooting time")
         print("=" * 50)
         print()
 
     # Print friendly welcome message and version
-    print("=" * 50)
-    print("GitHub Network Status Checker")
-    print("Version: 1.1.0")
-    print("=" * 50)
-    # Print check start prompt
-    print("Checking GitHub accessibility...", end=" ")
-
-    # Start spinning cursor animation
-    import threading  # For creating animation thread
-    import itertools  # For cycling animation characters
-
-    spinner_thread = None
-
-    # For normal checks, display animation until check completes
-    if not args.full_test:
-        def show_spinner():
-            for cursor in itertools.cycle(SPINNER_CHARS):
-                if hasattr(show_spinner, 'done'):
-                    break
-                sys.stdout.write('\b' + cursor)
-                sys.stdout.flush()
-                time.sleep(SPINNER_DELAY)
-
-        spinner_thread = threading.Thread(target=show_spinner)
-        spinner_thread.daemon = True
-        spinner_thread.start()
+    if not quiet:
+        print("=" * 50)
+        print("GitHub Network Status Checker")
+        print("Version: 1.1.0")
+        print("=" * 50)
+    target_proxies = {}
+    for item in args.target_proxy:
+        name, sep, url = item.partition("=")
+        if not sep or not url:
+            parser.error(f"--target-proxy expects NAME=URL, got '{item}'")
+        target_proxies[name] = url
 
+    dns_cache = None if args.no_dns_cache else DnsCache(resolver=args.dns_resolver)
+    tls_prober = TlsProber() if args.tls else None
+    if args.backend == BACKEND_H2 and h2 is None:
+        parser.error("--backend h2 requires the 'h2' package (pip install h2)")
+    h2_prober = Http2Prober() if args.backend == BACKEND_H2 else None
+    # Authenticated API probes get a far larger rate-limit budget
+    api_token = next((os.environ[var] for var in TOKEN_ENV_VARS if os.environ.get(var)), None)
+    baseline = LatencyBaseline(args.baseline).load() if args.baseline else None
+    tcp_precheck = TcpProber() if args.tcp_precheck else None
+    ssh_prober = SshProber() if args.ssh else None
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+    if args.warmup and not args.full_test:
+        parser.error("--warmup requires -f/--full-test")
+    limits = (args.max_in_flight, args.per_host, args.max_probes_per_sec, args.max_bytes_per_sec)
+    if any(limit < 0 for limit in limits):
+        parser.error("resource limits must not be negative")
+    limiter = ResourceLimiter(*limits) if any(limits) else None
+    try:
+        policy = JudgePolicy.load(args.policy) if args.policy else None
+    except (OSError, ValueError) as e:
+        print(f"\n[ERROR] Cannot load policy {args.policy}: {e}")
+        return 5
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.record or args.replay:
+        # Only the HTTP exchange goes through the transport, these probe the network directly
+        live = [flag for flag, used in (("--tls", args.tls), ("--backend h2", args.backend == BACKEND_H2),
+                                        ("--ssh", args.ssh), ("--tcp-precheck", args.tcp_precheck),
+                                        ("--tcp", args.tcp is not None), ("--batch", args.batch),
+                                        ("--compare-proxies", args.compare_proxies),
+                                        ("--dns-benchmark", args.dns_benchmark)) if used]
+        if live:
+            parser.error(f"{'--replay' if args.replay else '--record'} cannot be combined with "
+                         f"{', '.join(live)}, which probe outside the recorded HTTP exchanges")
     try:
-        chk = Checker()  # Create checker instance
-        if args.full_test:
-            r = chk.test(timeout=DEFAULT_TIMEOUT)  # Execute full test
-            is_full_test = True
+        if args.replay:
+            transport = ReplayTransport.load(args.replay, speed=args.replay_speed)
         else:
-            r = chk.check(timeout=DEFAULT_TIMEOUT)  # Execute normal check
-            is_full_test = False
-
-        # Stop animation thread if running
-        if not args.full_test and spinner_thread is not None:
-            show_spinner.done = True
-            spinner_thread.join(timeout=SPINNER_JOIN_TIMEOUT)
-            print("\r" + " " * SPINNER_PADDING + "\r", end="")
-
-        # Format output based on JSON flag and theme
-        if args.json:
-            # Output results in JSON format
-            json_output = {
-                "version": "v1.1.0",
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "status": r["status"],
-                "message": r["msg"],
-                "is_full_test": is_full_test
-            }
+            transport = RecordingTransport(args.record) if args.record else None
+    except (OSError, ValueError) as e:
+        print(f"\n[ERROR] Cannot open {'replay' if args.replay else 'recording'} file: {e}")
+        return 5
+    try:
+        exporter = SeriesWriter(args.export) if args.export else None
+    except (OSError, ValueError) as e:
+        print(f"\n[ERROR] Cannot open sample file {args.export}: {e}")
+        return 5
 
-            if is_full_test:
-                json_output.update({
-                    "iterations": r["iterations"],
-                    "successful_checks": r["successful_checks"],
-                    "avg_total_time_ms": round(r["avg_total_time"], 2),
-                    "target_stats": {
-                        name: {
-                            "avg_response_ms": round(stats["avg_response"], 2),
-                            "success_rate": round(stats["success_rate"], 2)
-                        }
-                        for name, stats in r["target_stats"].items()
-                    }
-                })
-            else:
-                json_output["results"] = [
-                    {
-                        "target": name,
-                        "status": "OK" if result.get("ok") else "FAIL",
-                        "response_time_ms": round(result.get("ms", 0), 2) if result.get("ok") else None,
-                        "error": result.get("error") if not result.get("ok") else None
-                    }
-                    for name, result in r["results"]
-                ]
+    sinks = [WebhookSink(url) for url in args.notify_webhook]
+    try:
+        sinks += [CommandSink(command) for command in args.notify_command]
+    except ValueError as e:
+        parser.error(f"--notify-command: {e}")
+    notifier = Notifier(sinks, batch_window=args.notify_batch) if sinks else None
 
-            # Generate suggestion based on status
-            if r["status"] == "good":
-                json_output["suggestion"] = "Network is stable, you can push code normally."
-            elif r["status"] == "warn":
-                failed_targets = [name for name, result in r.get("results", [])
-                                  if not result.get("ok")]
-                if failed_targets:
-                    msg = f"Network is unstable for {', '.join(failed_targets)}. "
-                    json_output["suggestion"] = msg + "Try again later."
-                else:
-                    json_output["suggestion"] = "Network is slow but accessible."
-            else:
-                json_output["suggestion"] = "Network connection failed."
+    def save_state() -> None:
+        if baseline is not None:
+            try:
+                baseline.save()
+            except OSError as e:
+                print(f"[WARN] Cannot save latency baseline to {args.baseline}: {e}", file=sys.stderr)
+        if exporter is not None:
+            exporter.close()
+        if notifier is not None:
+            notifier.close()
+        if isinstance(transport, RecordingTransport):
+            transport.close()
+
+    # Server mode: background checks served over a local endpoint
+    if args.command == 'serve':
+        chk = Checker(breaker_threshold=args.breaker_threshold,
+                      breaker_cooldown=args.breaker_cooldown,
+                      proxy=args.proxy, target_proxies=target_proxies,
+                      dns_cache=dns_cache, tls_prober=tls_prober, h2_prober=h2_prober,
+                      api_token=api_token, baseline=baseline, tcp_precheck=tcp_precheck,
+                      ssh_prober=ssh_prober, tracer=tracer, fast_verdict=args.fast, hedge=args.hedge,
+                      policy=policy, transport=transport, limiter=limiter)
+        if exporter is not None:
+            chk.add_listener(exporter)
+        try:
+            server = StatusServer(chk, address=args.listen, interval=args.interval, notifier=notifier,
+                                  allow_remote=args.allow_remote)
+        except (OSError, ValueError) as e:
+            print(f"\n[ERROR] Cannot listen on {args.listen}: {e}")
+            return 5
+        server.start()
+        if not quiet:
+            print(f"Serving GitHub status on {server.address} every {args.interval:g}s (Ctrl+C to stop)...")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            if not quiet:
+                print("\nStatus server stopped by user.")
+        finally:
+            server.stop()
+            save_state()
+        return 0
+
+    # Batch mode: many target sets over one shared worker pool
+    if args.batch:
+        try:
+            target_sets = load_target_sets(args.batch)
+        except (OSError, ValueError) as e:
+            print(f"\n[ERROR] Cannot load batch file: {e}")
+            return 5
+        report = run_batch(target_sets, full_test=args.full_test, workers=args.workers,
+                           timeout=DEFAULT_TIMEOUT, dns_cache=dns_cache, processes=args.processes,
+                           limiter=limiter, warmup=args.warmup, tracer=tracer, policy=policy)
+        print_batch_report(report, ndjson=renderer.name == "ndjson")
+        return status_exit_code(report["status"])
 
-            print(json.dumps(json_output, indent=2, ensure_ascii=False))
+    # Resolver benchmark mode: time target host resolution per resolver
+    if args.dns_benchmark:
+        hosts = sorted({urlsplit(url).hostname for _, url in Checker.TARGETS})
+        if not quiet:
+            print(f"Benchmarking {len(args.dns_benchmark)} resolvers...")
+        bench = benchmark_resolvers(hosts, args.dns_benchmark, limiter=limiter)
+        print_resolver_benchmark(bench, json_output=quiet)
+        return 0 if any(e["avg_ms"] is not None for e in bench["resolvers"]) else 2
+
+    # Proxy comparison mode: rank direct and proxied routes
+    if args.compare_proxies:
+        if not quiet:
+            print(f"Comparing {len(args.compare_proxies) + 1} routes...")
+        ranked = compare_routes(args.compare_proxies, timeout=DEFAULT_TIMEOUT, limiter=limiter)
+        print_route_comparison(ranked, json_output=quiet)
+        return status_exit_code(ranked[0]["status"] if ranked else "bad")
+
+    # TCP mode: connect-only handshakes, no HTTP requests
+    if args.tcp is not None:
+        r = Checker(tracer=tracer, limiter=limiter).check_tcp(prober=TcpProber(args.tcp))
+        renderer.write(r, False)
+        return status_exit_code(r["status"])
+
+    # Watch mode: repeated checks sharing per-target circuit breakers
+    if args.watch is not None:
+        if not quiet:
+            print(f"Watching GitHub accessibility every {args.watch:g}s (Ctrl+C to stop)...")
+        chk = Checker(breaker_threshold=args.breaker_threshold,
+                      breaker_cooldown=args.breaker_cooldown,
+                      proxy=args.proxy, target_proxies=target_proxies,
+                      dns_cache=dns_cache, tls_prober=tls_prober, h2_prober=h2_prober,
+                      api_token=api_token, baseline=baseline, tcp_precheck=tcp_precheck,
+                      ssh_prober=ssh_prober, tracer=tracer, fast_verdict=args.fast, hedge=args.hedge,
+                      policy=policy, transport=transport, limiter=limiter)
+        if exporter is not None:
+            chk.add_listener(exporter)
+        # A stream of reports: JSON becomes one line per round, the default
+        # theme a compact status line per round
+        if renderer.machine_readable:
+            watch_renderer = NdjsonRenderer()
+        elif isinstance(renderer, DefaultRenderer):
+            watch_renderer = None
         else:
-            # Output results in human-readable format based on theme
-            if args.theme == "minimal":
-                # Minimal theme: just essential info
-                for name, result in r["results"]:
-                    if result.get("ok"):
-                        status = "OK"
-                        ms = result.get("ms", 0)
-                        print(f"{name}: {status} ({ms:.0f}ms)")
-                    else:
-                        print(f"{name}: FAIL")
+            watch_renderer = renderer
+        try:
+            return watch(chk, interval=args.watch, renderer=watch_renderer, notifier=notifier)
+        finally:
+            save_state()
 
-                # Add status line
-                if r["status"] == "good":
-                    print(f"STATUS: OK ({r['msg']})")
-                elif r["status"] == "warn":
-                    print(f"STATUS: WARN ({r['msg']})")
-                else:
-                    print(f"STATUS: FAIL ({r['msg']})")
-
-            elif args.theme == "fun":
-                # Fun theme: with fun descriptions
-                print("\n" + "=" * 50)
-                print("DETECTION RESULTS")
-                print("-" * 20)
-
-                for name, result in r["results"]:
-                    if result.get("ok"):
-                        status = "OK"
-                        ms = result.get("ms", 0)
-                        print(f"  {name:10}: {status:4} ({ms:.0f}ms)")
-                    else:
-                        status = "FAIL"
-                        print(f"  {name:10}: {status:4}")
-
-                print("\n" + "=" * 50)
-
-                # Fun status messages
-                avg_ms = r.get("avg_total_time", 0) if is_full_test else None
-                fun_status = format_fun_status(r["status"], avg_ms)
-                print(f"STATUS: {fun_status}")
-
-                print("\n" + "=" * 50)
-                print("SUGGESTION")
-
-                if r["status"] == "good":
-                    print("  You can push code now! Go for it!")
-                    print("  Everything is working great!")
-                elif r["status"] == "warn":
-                    failed_targets = [name for name, result in r.get("results", [])
-                                      if not result.get("ok")]
-                    if failed_targets:
-                        print("  GitHub is having some trouble...")
-                        failed_list = ', '.join(failed_targets)
-                        print(f"  Slow spot: {failed_list}")
-                        print("  Maybe wait a bit and try again?")
-                    else:
-                        print("  Things are a bit slow today...")
-                        print("  But you can still get work done!")
-                else:
-                    print("  GitHub seems to be taking a break...")
-                    print("  Check your network connection first.")
+    # Progress is drawn from probe events, only for human output on a terminal
+    progress = ProgressDisplay(sys.stdout) if ProgressDisplay.enabled_for(sys.stdout, renderer) else None
 
-                print("\n" + "=" * 50)
-                print("SHARE THIS RESULT")
-                print(f"GitHub Checker v1.1.0 | {r['msg']} | {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    # Full-test iterations share connections, so later samples are warm; a warm-up pre-opens them
+    session = tracked_session() if args.full_test else None
 
+    try:
+        # Create checker instance
+        chk = Checker(proxy=args.proxy, target_proxies=target_proxies, dns_cache=dns_cache,
+                      tls_prober=tls_prober, h2_prober=h2_prober, api_token=api_token,
+                      baseline=baseline, tcp_precheck=tcp_precheck, session=session,
+                      ssh_prober=ssh_prober, tracer=tracer, fast_verdict=args.fast,
+                      hedge=args.hedge, policy=policy, transport=transport, limiter=limiter)
+        if exporter is not None:
+            chk.add_listener(exporter)
+        is_full_test = args.full_test
+        if progress is not None:
+            probes = len(chk.TARGETS) + (len(chk.SSH_TARGETS) if ssh_prober is not None else 0)
+            if is_full_test:
+                progress.start(f"Running full test ({FULL_TEST_ITERATIONS} iterations)...",
+                               probes * (args.warmup + FULL_TEST_ITERATIONS))
             else:
-                # Default theme: the current rich format
-                print("\nResults:")  # Print results title
-                print("-" * 40)  # Print separator
-
-                if is_full_test:
-                    # Display full test results
-                    print(f"Full test completed ({r['iterations']} iterations)")
-                    print(f"Successful checks: {r['successful_checks']}/{r['iterations']}")
-                    print(f"Average total time: {r['avg_total_time']:.0f}ms")
-                    print("\nTarget statistics:")
-                    for name, stats in r['target_stats'].items():
-                        print(f"  {name:10}: Avg {stats['avg_response']:.0f}ms, "
-                              f"Success rate: {stats['success_rate']:.1f}%")
-
-                    print("\n" + "=" * 50)
-                    # Display status with color formatting
-                    print(f"STATUS: {format_status(r['status'], r['msg'])}")  # Print status message
-
-                    # Provide operation suggestions based on status
-                    print("\n" + "=" * 50)
-
-                    # Print SUGGESTION section for full test
-                    print("SUGGESTION")
-
-                    # Suggestion logic for full test
-                    if r["status"] == "good":
-                        print(f"  {colorize('Network is stable.', Colors.GREEN)}")
-                        print(f"  {colorize('You can push code normally.', Colors.GREEN)}")
-                    elif r["status"] == "warn":
-                        failed_targets = [name for name, result in r.get("results", [])
-                                          if not result.get("ok")]
-                        if failed_targets:
-                            print(f"  {colorize('Network is unstable.', Colors.YELLOW)}")
-                            failed_list = ', '.join(failed_targets)
-                            print(f"  {colorize(f'Issues with: {failed_list}', Colors.YELLOW)}")
-                            print(f"  {colorize('Try again later.', Colors.YELLOW)}")
-                        else:
-                            print(f"  {colorize('Network is slow but accessible.', Colors.YELLOW)}")
-                            print(f"  {colorize('Consider waiting for better connectivity.', Colors.YELLOW)}")
-                    else:
-                        print(f"  {colorize('Network connection failed.', Colors.RED)}")
-                        print(f"  {colorize('Check your network settings.', Colors.RED)}")
+                progress.start("Checking GitHub accessibility...", probes)
+            chk.add_listener(progress)
 
-                    # Add share-friendly message
-                    print("\n" + "=" * 50)
-                    print("SHARE THIS RESULT")
-                    print(f"GitHub Checker v1.1.0 | {r['msg']} | {time.strftime('%Y-%m-%d %H:%M:%S')}")
-                else:
-                    # Display results in a screenshot-friendly format
-                    print("\n" + "=" * 50)
-                    print("DETECTION RESULTS")
-                    print("-" * 20)
-
-                    for name, result in r["results"]:
-                        if result.get("ok"):
-                            status = "OK"
-                            ms = result.get("ms", 0)
-                            print(f"  {name:10}: {status:4} ({ms:.0f}ms)")
-                        else:
-                            status = "FAIL"
-                            error_msg = result.get("error", "Unknown error")
-                            print(f"  {name:10}: {status:4} ({error_msg})")
-
-                    print("\n" + "=" * 50)
-                    # Display status with color formatting
-                    print(f"STATUS: {format_status(r['status'], r['msg'])}")  # Print status message
-
-                    # Provide operation suggestions based on status
-                    print("\n" + "=" * 50)
-
-                    # Print SUGGESTION section for normal test
-                    print("SUGGESTION")
-
-                    # Suggestion logic for normal test
-                    if r["status"] == "good":
-                        print(f"  {colorize('Network is stable.', Colors.GREEN)}")
-                        print(f"  {colorize('You can push code normally.', Colors.GREEN)}")
-                    elif r["status"] == "warn":
-                        failed_targets = [name for name, result in r.get("results", [])
-                                          if not result.get("ok")]
-                        if failed_targets:
-                            print(f"  {colorize('Network is unstable.', Colors.YELLOW)}")
-                            failed_list = ', '.join(failed_targets)
-                            print(f"  {colorize(f'Issues with: {failed_list}', Colors.YELLOW)}")
-                            print(f"  {colorize('Try again later.', Colors.YELLOW)}")
-                        else:
-                            print(f"  {colorize('Network is slow but accessible.', Colors.YELLOW)}")
-                            print(f"  {colorize('Consider waiting for better connectivity.', Colors.YELLOW)}")
-                    else:
-                        print(f"  {colorize('Network connection failed.', Colors.RED)}")
-                        print(f"  {colorize('Check your network settings.', Colors.RED)}")
+        check_start = time.perf_counter()
+        try:
+            if is_full_test:
+                r = chk.test(timeout=DEFAULT_TIMEOUT, warmup=args.warmup)  # Execute full test
+            else:
+                r = chk.check(timeout=DEFAULT_TIMEOUT)  # Execute normal check
+        finally:
+            if progress is not None:
+                progress.finish()
+            if session is not None:
+                session.close()
+        if tracer is not None:
+            tracer.record("full test" if is_full_test else "check", check_start, time.perf_counter())
 
-                    # Add share-friendly message
-                    print("\n" + "=" * 50)
-                    print("SHARE THIS RESULT")
-                    print(f"GitHub Checker v1.1.0 | {r['msg']} | {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        # Render the whole report into one buffer and write it once
+        render_start = time.perf_counter()
+        renderer.write(r, is_full_test)
+        if tracer is not None:
+            tracer.record("render", render_start, time.perf_counter())
+        save_state()
 
-        if r["status"] == "good":
-            return 0
-        elif r["status"] == "warn":
-            return 1
-        else:
-            return 2
+        return status_exit_code(r["status"])
 
     except KeyboardInterrupt:
-        if not args.full_test and spinner_thread is not None:
-            show_spinner.done = True
-            spinner_thread.join(timeout=SPINNER_JOIN_TIMEOUT)
         print("\n\nInterrupted by user.")
         return 1
     except requests.exceptions.ConnectionError as e:
-        if not args.full_test and spinner_thread is not None:
-            show_spinner.done = True
-            spinner_thread.join(timeout=SPINNER_JOIN_TIMEOUT)
         print("\n\n[ERROR] Network connection failed.")
         print(f"Details: {str(e)}")
         print("\nSuggestion: Please check your network connection and try again.")
         return 2
     except requests.exceptions.Timeout as e:
-        if not args.full_test and spinner_thread is not None:
-            show_spinner.done = True
-            spinner_thread.join(timeout=SPINNER_JOIN_TIMEOUT)
         print("\n\n[ERROR] Request timeout.")
         print(f"Details: {str(e)}")
         print("\nSuggestion: Network is slow or GitHub is not responding. Try again later.")
         return 3
     except requests.exceptions.RequestException as e:
-        if not args.full_test and spinner_thread is not None:
-            show_spinner.done = True
-            spinner_thread.join(timeout=SPINNER_JOIN_TIMEOUT)
         print("\n\n[ERROR] Request failed.")
         print(f"Details: {str(e)}")
         print("\nSuggestion: Check your network settings and try again.")
         return 4
     except Exception as e:
-        if not args.full_test and spinner_thread is not None:
-            show_spinner.done = True
-            spinner_thread.join(timeout=SPINNER_JOIN_TIMEOUT)
         print("\n[ERROR] Unexpected error occurred.")
         print(f"Details: {type(e).__name__}: {str(e)}")
         print("\nSuggestion: Please report this issue with the error message above.")